@@ -1,15 +1,18 @@
 import bpy
 import json
 import os
-import sys  # Para listar os módulos carregados
+import threading
+import time
 from bpy.types import Panel, Operator, UIList
 from bpy.props import StringProperty, BoolProperty, EnumProperty
+from bpy.app.handlers import persistent
 from bpy_extras.io_utils import ExportHelper, ImportHelper
 
 # Importar módulos do addon (caminhos atualizados)
-from .utils import passes_data
+from .utils import passes_data, render_estimator, compositor_analysis, layer_kinds, crypto_policy, output_nodes, hierarchy, duplicates, render_telemetry, render_jobs, geometry_footprint, aov_index, linked_assets, visibility_plan, bulk_rna, light_groups, render_budgets, renderable, linter, layer_stats, indirect_only, pass_indices, generated_layers, layer_manifest, scene_snapshot, background_tasks, collection_refs
+from .utils.layer_kinds import is_gp_collection, is_lgt_collection
 from .properties import CollectionItem, PassItem, ViewLayerGeneratorProps, register as register_properties, unregister as unregister_properties
-from .preferences import initialize_default_passes, register_preferences, unregister_preferences
+from .preferences import register_preferences, unregister_preferences, find_addon_preferences, ensure_default_preferences, startup_stats
 
 bl_info = {
     "name": "ViewLayer-Generator",
@@ -31,30 +34,80 @@ def toggle_selection(items, select_all=True):
 
 
 def detect_material_aovs():
-    """Detectar AOVs configurados nos shaders do projeto."""
+    """Detectar AOVs configurados nos shaders do projeto.
+    
+    Materiais de bibliotecas linkadas usam o índice persistente de AOVs e só
+    têm a node tree percorrida quando o arquivo da biblioteca muda.
+    """
+    index = aov_index.AovIndex()
+    material_aovs = {material.name_full: index.get_material_aovs(material) for material in bpy.data.materials}
+    index.save()
+    return collect_aov_info(material_aovs)
+
+def collect_aov_info(material_aovs):
+    """Unir os AOVs de {material: {nome: tipo}} na ordem dos materiais, sem repetir nomes."""
     aov_info = []
-    for material in bpy.data.materials:
-        if material.use_nodes:
-            for node in material.node_tree.nodes:
-                if node.type == "OUTPUT_AOV":
-                    # Usar o valor do campo name ao invés do nome do nó
-                    # O campo name do nó OUTPUT_AOV contém o nome real do AOV
-                    aov_name = node.name
-                    if hasattr(node, "inputs") and len(node.inputs) > 0:
-                        aov_type = "VALUE" if node.inputs[0].links and node.inputs[0].links[0].from_socket.type == "VALUE" else "COLOR"
-                        
-                        # Verificar se este AOV já foi detectado antes
-                        if not any(info["name"] == aov_name for info in aov_info):
-                            aov_info.append({"name": aov_name, "type": aov_type})
+    seen = set()
+    for aovs in material_aovs.values():
+        for aov_name, aov_type in aovs.items():
+            # Verificar se este AOV já foi detectado antes
+            if aov_name not in seen:
+                seen.add(aov_name)
+                aov_info.append({"name": aov_name, "type": aov_type})
     return aov_info
 
-def is_gp_collection(collection_name):
-    """Verificar se uma collection é para Grease Pencil."""
-    return collection_name.endswith(".GP") or collection_name.endswith(".GP.vl")
-
-def is_lgt_collection(collection_name):
-    """Verificar se uma collection é do tipo lgt."""
-    return collection_name.startswith("lgt.")
+def store_detected_aovs(scene, aov_info):
+    """Substituir a lista de AOVs detectados da cena (todos vêm marcados)."""
+    scene.detected_aovs.clear()
+    for info in aov_info:
+        item = scene.detected_aovs.add()
+        item.name = info["name"]
+        item.type = info["type"]
+        item.selected = True  # Por padrão, todos vêm marcados
+
+def start_background_aov_detection(scene):
+    """Detectar AOVs em segundo plano.
+    
+    Na thread principal, materiais linkados já indexados são resolvidos e os
+    demais grafos são copiados; a thread de trabalho percorre os node groups e
+    o resultado é gravado no índice e na cena por um timer.
+    """
+    index = aov_index.AovIndex()
+    cached = {}
+    misses = {}  # {material: (entrada da biblioteca no índice, nome local)}
+    
+    def skip(material):
+        if material.library is None:
+            return False
+        aovs, entry = index.lookup(material)
+        if aovs is None:
+            misses[material.name_full] = (entry, material.name)
+            return False
+        cached[material.name_full] = aovs
+        return True
+    
+    material_names = [material.name_full for material in bpy.data.materials]
+    graphs = scene_snapshot.snapshot_material_graphs(bpy.data.materials, skip)
+    scene_name = scene.name
+    
+    def on_done(resolved, error):
+        if error is not None:
+            print(f"Erro na detecção de AOVs em segundo plano: {str(error)}")
+            return
+        for material_name, (entry, name) in misses.items():
+            index.store(entry, name, resolved.get(material_name, {}))
+        index.save()
+        resolved.update(cached)
+        scene = bpy.data.scenes.get(scene_name)
+        if scene is None:
+            return
+        aov_info = collect_aov_info({name: resolved[name] for name in material_names if name in resolved})
+        store_detected_aovs(scene, aov_info)
+        print(f"{len(aov_info)} AOVs detectados em segundo plano ({scene_name})")
+        tag_sidebar_redraw(bpy.context)
+    
+    background_tasks.submit(f"detect_aovs:{scene_name}", scene_snapshot.resolve_material_aovs, graphs,
+                            on_done=on_done)
 
 def apply_aovs_to_viewlayer(viewlayer, aov_info):
     """Apply AOVs to a view layer."""
@@ -69,6 +122,217 @@ def apply_aovs_to_viewlayer(viewlayer, aov_info):
             new_aov.name = aov_data["name"]
             new_aov.type = aov_data["type"]
 
+def store_layer_estimates(scene):
+    """Estimar saída/memória dos view layers e guardar o resultado na cena."""
+    estimates, totals = render_estimator.estimate_scene(scene)
+    
+    props = scene.viewlayer_generator_props
+    props.layer_estimates.clear()
+    for est in estimates + [totals]:
+        item = props.layer_estimates.add()
+        item.name = est["name"]
+        item.channels = est["channels"]
+        item.frame_size = render_estimator.format_bytes(est["bytes_per_frame"])
+        item.sequence_size = render_estimator.format_bytes(est["sequence_bytes"])
+        item.buffer_size = render_estimator.format_bytes(est["buffer_bytes"])
+    return estimates, totals
+
+def report_budget_warnings(operator, context):
+    """Reportar avisos quando a estimativa de saída excede o orçamento configurado."""
+    estimates, totals = store_layer_estimates(context.scene)
+    preferences = find_addon_preferences(context)
+    if not preferences or not hasattr(preferences, "get_budgets"):
+        return []
+    
+    warnings = render_estimator.check_budgets(estimates, totals, preferences.get_budgets())
+    for warning in warnings:
+        operator.report({"WARNING"}, f"Orçamento: {warning}")
+    return warnings
+
+def get_bool_pass_attributes(viewlayer):
+    """Listar as propriedades booleanas use_pass_* de um view layer."""
+    return [attr for attr in dir(viewlayer)
+            if attr.startswith("use_pass_") and isinstance(getattr(viewlayer, attr), bool)]
+
+def get_crypto_policies(context):
+    """Obter as políticas de Cryptomatte das preferências como {tipo: política}."""
+    preferences = find_addon_preferences(context)
+    policy_items = getattr(preferences, "crypto_policies", ()) if preferences else ()
+    return crypto_policy.get_policy_map(policy_items)
+
+def apply_crypto_policies(context, viewlayers=None):
+    """Aplicar as políticas de Cryptomatte por tipo a todos os view layers.
+
+    Retorna um dicionário {tipo: quantidade de view layers}.
+    """
+    policies = get_crypto_policies(context)
+    viewlayers = list(viewlayers if viewlayers is not None else context.scene.view_layers)
+    kinds = [layer_kinds.get_layer_kind(viewlayer) for viewlayer in viewlayers]
+    
+    # Passes de Cryptomatte têm callback de update: leitura em lote e setattr só no que mudou
+    columns = crypto_policy.plan_policy_columns(viewlayers, [policies[kind] for kind in kinds])
+    bulk_rna.write_columns_diffed(viewlayers, columns)
+    
+    kind_counts = {}
+    for kind in kinds:
+        kind_counts[kind] = kind_counts.get(kind, 0) + 1
+    layer_stats.mark_layers_dirty(context.scene.name)
+    return kind_counts
+
+def tag_sidebar_redraw(context):
+    """Redesenhar as áreas do Viewport 3D (onde fica a barra lateral do addon)."""
+    for window in context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == "VIEW_3D":
+                area.tag_redraw()
+
+def get_indirect_policies(context):
+    """Retornar as políticas das collections .ind por tipo ({tipo: modo})."""
+    preferences = find_addon_preferences(context)
+    policy_items = getattr(preferences, "indirect_policies", ()) if preferences else ()
+    return indirect_only.get_policy_map(policy_items)
+
+def get_item_collection(item):
+    """Resolver a collection de um item da seleção pelo uid (None se ela foi removida)."""
+    return collection_refs.find_collection(bpy.data.collections, item.uid)
+
+def get_selected_collection_names(scene):
+    """Nomes atuais das collections selecionadas, resolvidos pelos ponteiros."""
+    names = []
+    for item in scene.collection_selection:
+        if not item.selected:
+            continue
+        collection = get_item_collection(item)
+        if collection is not None:
+            names.append(collection.name)
+    return names
+
+def migrate_collection_selection(scene):
+    """Preencher o uid de itens antigos e atualizar nomes renomeados.
+    
+    Itens sem uid (arquivos com só o nome, ou com o antigo ponteiro
+    "collection", que contava como usuário e é descartado) são resolvidos
+    uma única vez pelo ponteiro ou pelo nome. Depois disso, um uid sem
+    collection significa que ela foi removida. Retorna a quantidade de itens
+    alterados.
+    """
+    changed = 0
+    for item in scene.collection_selection:
+        if not item.uid:
+            legacy = item.get("collection")
+            collection = legacy if isinstance(legacy, bpy.types.Collection) else bpy.data.collections.get(item.name)
+            if "collection" in item:
+                del item["collection"]
+            if collection is None:
+                continue
+            item.uid = collection_refs.get_collection_uid(collection)
+            changed += 1
+        collection = get_item_collection(item)
+        if collection is None:
+            continue
+        if item.name != collection.name:
+            item.name = collection.name
+            changed += 1
+    return changed
+
+def get_generation_sources(scene):
+    """Collections que a geração atual transforma em view layers (seleção sem rigs no modo light groups)."""
+    use_light_groups = scene.viewlayer_generator_props.use_light_groups
+    return [name for name in get_selected_collection_names(scene)
+            if not (use_light_groups and is_lgt_collection(name))]
+
+def find_orphaned_layers(scene):
+    """View layers gerados cuja collection de origem sumiu ou não está mais selecionada."""
+    return generated_layers.find_orphaned_layers(scene, bpy.data.collections, get_generation_sources(scene))
+
+def get_generated_layer_names(scene):
+    """Retornar os nomes dos view layers gerados a partir das collections selecionadas."""
+    return [name for name in get_selected_collection_names(scene) if name in scene.view_layers]
+
+def get_all_generated_layer_names(scene):
+    """Nomes dos view layers gerados da seleção atual e dos marcados por gerações anteriores."""
+    layer_names = get_generated_layer_names(scene)
+    known = set(layer_names)
+    return layer_names + [name for name in generated_layers.get_tagged_layer_names(scene) if name not in known]
+
+def apply_render_budgets(context, viewlayers):
+    """Aplicar os orçamentos de amostras/denoising por tipo aos view layers.
+    
+    Retorna um dicionário {tipo: quantidade de view layers}.
+    """
+    preferences = find_addon_preferences(context)
+    budget_items = getattr(preferences, "render_budgets", ()) if preferences else ()
+    budgets = render_budgets.get_budget_map(budget_items)
+    scene_samples = render_budgets.get_scene_samples(context.scene)
+    
+    kind_counts = {}
+    for viewlayer in viewlayers:
+        kind = layer_kinds.get_layer_kind(viewlayer)
+        render_budgets.apply_render_budget(viewlayer, budgets[kind], scene_samples)
+        kind_counts[kind] = kind_counts.get(kind, 0) + 1
+    return kind_counts
+
+def disable_empty_viewlayers(scene):
+    """Desativar 'use' dos view layers sem conteúdo renderizável e retornar seus nomes."""
+    empty = renderable.find_empty_viewlayers(scene, bpy.data.collections)
+    for name in empty:
+        scene.view_layers[name].use = False
+    return empty
+
+def get_lint_layer_names(scene):
+    """Nomes dos view layers existentes e dos que seriam gerados pela seleção atual."""
+    names = {viewlayer.name for viewlayer in scene.view_layers}
+    names.update(get_generation_sources(scene))
+    return names
+
+def run_scene_lint(scene):
+    """Verificar as convenções da cena e guardar os problemas nas propriedades.
+    
+    Retorna a lista de problemas (dicionários de linter.lint_scene).
+    """
+    issues = linter.lint_scene(scene, bpy.data.collections, get_lint_layer_names(scene))
+    store_lint_issues(scene, issues)
+    return issues
+
+def store_lint_issues(scene, issues):
+    """Guardar os problemas da verificação nas propriedades da cena."""
+    props = scene.viewlayer_generator_props
+    props.lint_issues.clear()
+    for issue in issues:
+        item = props.lint_issues.add()
+        item.name = issue["collection"]
+        item.code = issue["code"]
+        item.severity = issue["severity"]
+        item.message = issue["message"]
+
+def start_background_lint(scene):
+    """Verificar as convenções em segundo plano: snapshot aqui, análise na thread de trabalho."""
+    tree = scene_snapshot.snapshot_collection_tree(scene, bpy.data.collections)
+    layer_names = get_lint_layer_names(scene)
+    scene_name = scene.name
+    
+    def on_done(issues, error):
+        if error is not None:
+            print(f"Erro na verificação em segundo plano: {str(error)}")
+            return
+        scene = bpy.data.scenes.get(scene_name)
+        if scene is None:
+            return
+        store_lint_issues(scene, issues)
+        for issue in issues:
+            print(f"[{issue['severity']}] {issue['code']}: {issue['message']}")
+        print(f"Verificação de '{scene_name}': {len(issues)} problemas ({linter.count_errors(issues)} erros)")
+        tag_sidebar_redraw(bpy.context)
+    
+    background_tasks.submit(f"lint:{scene_name}", linter.lint_tree, tree, layer_names, on_done=on_done)
+
+def remove_unused_aovs(viewlayer, keep_names):
+    """Remover do view layer os AOVs que não estão em keep_names."""
+    if not hasattr(viewlayer, "aovs"):
+        return
+    for aov in [aov for aov in viewlayer.aovs if aov.name not in keep_names]:
+        viewlayer.aovs.remove(aov)
+
 # ==========================
 # UIList para Collections
 # ==========================
@@ -78,7 +342,19 @@ class VIEWLAYER_UL_collections(UIList):
         if self.layout_type in {'DEFAULT', 'COMPACT'}:
             row = layout.row(align=True)
             row.prop(item, "selected", text="")
-            row.label(text=item.name, icon="OUTLINER_COLLECTION")
+            # Nome atual pelo uid (renomeações aparecem antes do próximo refresh)
+            collection = get_item_collection(item)
+            name = collection.name if collection is not None else item.name
+            row.label(text=name, icon="OUTLINER_COLLECTION")
+            
+            # Estatísticas pré-calculadas (o draw apenas lê o cache)
+            stats = layer_stats.get_collection_stats(context.scene, collection) if collection is not None else None
+            if stats is not None:
+                text = f"{stats['objects']} obj · {stats['layers']} VL"
+                layer = layer_stats.get_layer_stats(context.scene, name)
+                if layer is not None:
+                    text += f" · {layer['passes']} passes"
+                row.label(text=text)
         elif self.layout_type in {'GRID'}:
             layout.alignment = 'CENTER'
             layout.label(text="", icon="OUTLINER_COLLECTION")
@@ -151,22 +427,23 @@ class VIEWLAYER_OT_detect_aovs(Operator):
     bl_label = "Detectar AOVs"
     bl_options = {"REGISTER", "UNDO"}
 
+    def invoke(self, context, event):
+        # Pelo painel: varrer os grafos em uma thread, se habilitado
+        if context.scene.viewlayer_generator_props.use_background_analysis:
+            start_background_aov_detection(context.scene)
+            self.report({"INFO"}, "Detecção de AOVs iniciada em segundo plano")
+            return {"FINISHED"}
+        return self.execute(context)
+
     def execute(self, context):
         scene = context.scene
-        scene.detected_aovs.clear()
         aov_info = detect_material_aovs()
+        store_detected_aovs(scene, aov_info)
         
         if len(aov_info) == 0:
             self.report({"INFO"}, "Nenhum AOV encontrado nos materiais do projeto.")
             return {"FINISHED"}
             
-        # Adicionar AOVs encontrados à lista
-        for info in aov_info:
-            item = scene.detected_aovs.add()
-            item.name = info["name"]
-            item.type = info["type"]
-            item.selected = True  # Por padrão, todos vêm marcados
-            
         # Essa linha estava causando o erro - removemos porque a propriedade agora está registrada corretamente
         # scene.active_aov_index = bpy.props.IntProperty(default=0)
             
@@ -313,15 +590,28 @@ class VIEWLAYER_OT_refresh_collections(Operator):
 
     def execute(self, context):
         scene = context.scene
-        existing_selection = {item.name for item in scene.collection_selection if item.selected}
+        # Cópias de collections (Shift+D) herdam o uid da original: renumerar antes de resolver
+        collection_refs.ensure_unique_uids(bpy.data.collections)
+        collection_refs.invalidate()
+        # Seleção existente pelo uid da collection: sobrevive a renomeações
+        selected_names = {collection.name for collection in
+                          (get_item_collection(item) for item in scene.collection_selection if item.selected)
+                          if collection is not None}
         scene.collection_selection.clear()  # Limpar a lista existente
+        
+        # Collections internas de assets linkados são controladas pela raiz do asset
+        opaque_roots = linked_assets.build_opaque_asset_roots(bpy.data.collections, selected_names)
+        hidden = linked_assets.get_hidden_asset_members(opaque_roots)
 
         # Preencher com as collections do projeto
         for collection in bpy.data.collections:
+            if collection.name in hidden:
+                continue
             item = scene.collection_selection.add()
             # Manter seleção existente ou pré-selecionar collections com sufixo .vl
             item.name = collection.name
-            item.selected = collection.name in existing_selection or collection.name.endswith(".vl")
+            item.uid = collection_refs.get_collection_uid(collection)
+            item.selected = collection.name in selected_names or collection.name.endswith(".vl")
 
         self.report({"INFO"}, f"{len(scene.collection_selection)} collections carregadas.")
         return {"FINISHED"}
@@ -338,7 +628,8 @@ class VIEWLAYER_OT_activate_lighting(Operator):
     def execute(self, context):
         scene = context.scene
         for item in scene.collection_selection:
-            if item.name.startswith("lgt.") and item.name == self.collection_name:
+            collection = get_item_collection(item)
+            if collection is not None and collection.name.startswith("lgt.") and collection.name == self.collection_name:
                 item.selected = True
         self.report({"INFO"}, f"Lighting ativado para {self.collection_name}.")
         return {"FINISHED"}
@@ -355,7 +646,8 @@ class VIEWLAYER_OT_activate_holdout(Operator):
     def execute(self, context):
         scene = context.scene
         for item in scene.collection_selection:
-            if item.name.endswith(".hdt") and item.name == self.collection_name:
+            collection = get_item_collection(item)
+            if collection is not None and collection.name.endswith(".hdt") and collection.name == self.collection_name:
                 item.selected = True
         self.report({"INFO"}, f"Holdout ativado para {self.collection_name}.")
         return {"FINISHED"}
@@ -425,6 +717,61 @@ class VIEWLAYER_OT_load_passes_prefs(Operator):
         return {"FINISHED"}
 
 
+def check_lint_gate(operator, context):
+    """Etapa 0 opcional: verificar as convenções e reportar. Retorna False se houver erros."""
+    if not context.scene.viewlayer_generator_props.lint_before_generate:
+        return True
+    issues = run_scene_lint(context.scene)
+    errors = linter.count_errors(issues)
+    if not errors:
+        return True
+    for issue in issues:
+        print(f"[{issue['severity']}] {issue['code']}: {issue['message']}")
+    operator.report({"ERROR"}, f"Verificação da cena encontrou {errors} erros; geração cancelada")
+    return False
+
+def run_post_generation_stages(operator, context):
+    """Etapas após gerar os view layers (light groups, passes, AOVs, índices e saídas).
+    
+    Retorna os avisos de orçamento de saída.
+    """
+    props = context.scene.viewlayer_generator_props
+    
+    # Etapa 1b: Light groups no lugar dos view layers lgt. (opcional)
+    if props.use_light_groups:
+        bpy.ops.viewlayer.setup_light_groups()
+    
+    # Etapa 2: Aplicar Passes
+    engine = context.scene.render.engine.lower().replace('blender_', '')
+    bpy.ops.viewlayer.load_passes_prefs(engine=engine)
+    bpy.ops.viewlayer.apply_passes(check_budgets=False)  # Orçamento verificado uma vez no final
+    
+    # Etapa 3: Aplicar AOVs
+    bpy.ops.viewlayer.apply_aovs()
+    
+    # Etapa 3b: Pass indices para ID mattes (opcional)
+    if props.use_pass_indices:
+        bpy.ops.viewlayer.assign_pass_indices()
+    
+    # Etapa 4: Sincronizar nós de saída do compositor (opcional)
+    if props.use_output_nodes:
+        bpy.ops.viewlayer.sync_output_nodes()
+    
+    # Etapa 5: Desativar view layers gerados órfãos (opcional, nunca remove)
+    if props.prune_orphaned_layers:
+        orphans = find_orphaned_layers(context.scene)
+        _, disabled = generated_layers.prune_layers(context.scene, [orphan["name"] for orphan in orphans])
+        if disabled:
+            operator.report({"WARNING"}, f"{len(disabled)} ViewLayers órfãos desativados: {', '.join(disabled)}")
+    
+    # Etapa 6: Manifesto dos view layers para a composição (opcional)
+    if props.write_layer_manifest:
+        bpy.ops.viewlayer.write_layer_manifest()
+    
+    # Verificar orçamento de saída com passes e AOVs aplicados
+    return report_budget_warnings(operator, context)
+
+
 # Operador para executar todas as etapas
 class VIEWLAYER_OT_generate_all(Operator):
     """Gerar ViewLayers completos (todas as etapas)"""
@@ -433,29 +780,27 @@ class VIEWLAYER_OT_generate_all(Operator):
     bl_options = {"REGISTER", "UNDO"}
     
     def execute(self, context):
+        ensure_initialized(context)
+        
+        # Etapa 0: Verificar convenções da cena (opcional, cancela com erros)
+        if not check_lint_gate(self, context):
+            return {"CANCELLED"}
+        
         # Etapa 1: Gerar ViewLayers
         bpy.ops.viewlayer.refresh_collections()
         bpy.ops.viewlayer.generate_layers()
         
-        # Etapa 2: Aplicar Passes
-        engine = context.scene.render.engine.lower().replace('blender_', '')
-        bpy.ops.viewlayer.load_passes_prefs(engine=engine)
-        bpy.ops.viewlayer.apply_passes()
-        
-        # Etapa 3: Aplicar AOVs
-        bpy.ops.viewlayer.apply_aovs()
+        if run_post_generation_stages(self, context):
+            self.report({"WARNING"}, "Processo finalizado com avisos de orçamento")
+            return {"FINISHED"}
         
         self.report({"INFO"}, "Processo completo finalizado com sucesso")
         return {"FINISHED"}
 
 
-# Operador para Etapa 1: Gerar apenas as ViewLayers
-class VIEWLAYER_OT_generate_layers(Operator):
-
-    """Gerar apenas as ViewLayers a partir das collections selecionadas"""
-    bl_idname = "viewlayer.generate_layers"
-    bl_label = "Gerar ViewLayers"
-    bl_options = {"REGISTER", "UNDO"}
+# Etapas compartilhadas pelos operadores de geração (bloqueante e em etapas)
+class LayerGenerationMixin:
+    """Preparação e geração de um view layer por collection selecionada."""
     
     def get_parent_collection(self, collection_name):
         """Obter a collection pai de uma collection."""
@@ -465,13 +810,28 @@ class VIEWLAYER_OT_generate_layers(Operator):
                     return parent.name
         return None
 
-    def process_layer_collection(self, layer_collection, collection_name, lighting_collections, always_active_collections, holdout_collections, holdout_parents, parent_active=False):
-        """Processar recursivamente uma layer collection e suas filhas."""
+    def process_layer_collection(self, layer_collection, collection_name, lighting_collections, always_active_collections, holdout_collections, holdout_parents, parent_active=False, visibility=None, opaque_roots=None, indirect_policies=None, parent_included=None, record=None):
+        """Processar recursivamente uma layer collection e suas filhas.
+        
+        Se ``visibility`` for informado (dicionário com os conjuntos "included" e
+        "holdout"), as collections efetivamente incluídas (nenhum ancestral
+        excluído) e em holdout são registradas nele. ``parent_included`` é None
+        na raiz do view layer.
+        Com ``record`` (uma lista), nada é escrito: cada nó visitado acrescenta
+        ``(exclude, holdout, indirect)`` na codificação dos planos de
+        ``visibility_plan``, na mesma pré-ordem de ``flatten_layer_tree``.
+        Raízes de assets linkados em ``opaque_roots`` são tratadas como uma
+        unidade: o Blender propaga o exclude da raiz para as filhas, então a
+        subárvore não é percorrida. Collections .ind seguem ``indirect_policies``
+        ({tipo: modo}) conforme o tipo do view layer.
+        """
         should_activate = False
         is_holdout = False
+        is_indirect = None  # None = não alterar indirect_only
         
         # Verificar se é uma viewlayer GP usando a função is_gp_collection
         is_gp_viewlayer = is_gp_collection(collection_name)
+        indirect_mode = indirect_only.get_indirect_mode(collection_name, indirect_policies)
         
         # Verificações para determinar se a collection deve ser ativada
         if parent_active:
@@ -499,18 +859,55 @@ class VIEWLAYER_OT_generate_layers(Operator):
             if parent_name == collection_name:
                 should_activate = True
                 is_holdout = True
+        elif indirect_only.is_indirect_collection(layer_collection.name):
+            # Ambientes que só contribuem com luz indireta e sombras
+            should_activate = indirect_mode != indirect_only.INDIRECT_MODE_EXCLUDE
                 
         if layer_collection.name.endswith(".hdt"):
             is_holdout = True
+        if indirect_only.is_indirect_collection(layer_collection.name):
+            is_indirect = indirect_mode != indirect_only.INDIRECT_MODE_INCLUDE
         
-        # Aplicar as configurações
-        if should_activate:
-            layer_collection.exclude = False
-            if is_holdout:
+        if record is not None:
+            # Execução simulada: registrar as decisões no lugar de escrevê-las
+            holdout_state = indirect_state = visibility_plan.FLAG_OFF
+            if should_activate:
+                holdout_state = visibility_plan.FLAG_ON if is_holdout else visibility_plan.FLAG_KEEP
+                if is_indirect is None:
+                    indirect_state = visibility_plan.FLAG_KEEP
+                elif is_indirect:
+                    indirect_state = visibility_plan.FLAG_ON
+            record.append((not should_activate, holdout_state, indirect_state))
+        # Aplicar as configurações (apenas quando o valor muda, para evitar escritas RNA)
+        elif should_activate:
+            if layer_collection.exclude:
+                layer_collection.exclude = False
+            if is_holdout and not layer_collection.holdout:
                 layer_collection.holdout = True
+            if is_indirect is not None and layer_collection.indirect_only != is_indirect:
+                layer_collection.indirect_only = is_indirect
         else:
-            layer_collection.exclude = True
-            layer_collection.holdout = False
+            if not layer_collection.exclude:
+                layer_collection.exclude = True
+            if layer_collection.holdout:
+                layer_collection.holdout = False
+            if layer_collection.indirect_only:
+                layer_collection.indirect_only = False
+        
+        # Registrar a visibilidade efetiva para as análises pós-geração
+        # (uma collection ativada sob um pai excluído não é renderizada)
+        is_root = parent_included is None
+        included = is_root or (parent_included and should_activate)
+        if visibility is not None and included and not is_root:
+            visibility["included"].add(layer_collection.name)
+            if layer_collection.holdout:
+                visibility["holdout"].add(layer_collection.name)
+        
+        # Asset linkado opaco: a raiz controla toda a subárvore
+        if opaque_roots and layer_collection.name in opaque_roots:
+            if visibility is not None and included and not is_root:
+                visibility["included"].update(opaque_roots[layer_collection.name])
+            return
             
         # Processar collections filhas recursivamente
         for child in layer_collection.children:
@@ -521,16 +918,28 @@ class VIEWLAYER_OT_generate_layers(Operator):
                 always_active_collections, 
                 holdout_collections, 
                 holdout_parents, 
-                parent_active=should_activate
+                parent_active=should_activate,
+                visibility=visibility,
+                opaque_roots=opaque_roots,
+                indirect_policies=indirect_policies,
+                parent_included=included,
+                record=record
             )
 
-    def execute(self, context):
-        scene = context.scene
-        selected_collections = [item.name for item in scene.collection_selection if item.selected]
+    def prepare_generation(self, context, defer_plan=False):
+        """Reunir os dados compartilhados por todos os view layers da geração.
         
+        Retorna um dicionário com as collections selecionadas, as listas por
+        convenção e, no backend NumPy, o plano de visibilidade já calculado.
+        Com ``defer_plan``, guarda apenas os argumentos do plano em ``plan_args``
+        (estruturas simples) para calculá-lo em uma thread de trabalho.
+        Retorna None se nenhuma collection estiver selecionada.
+        """
+        scene = context.scene
+        # No modo light groups, os rigs lgt.* não geram view layers próprios
+        selected_collections = get_generation_sources(scene)
         if not selected_collections:
-            self.report({"ERROR"}, "Nenhuma collection selecionada!")
-            return {"CANCELLED"}
+            return None
 
         # Identificar collections lgt. e collections com sufixos .all e .hdt
         lighting_collections = [col.name for col in bpy.data.collections if col.name.startswith("lgt.")]
@@ -544,27 +953,327 @@ class VIEWLAYER_OT_generate_layers(Operator):
             if parent_name:
                 holdout_parents[hdt_name] = parent_name
         
-        # Criar viewlayers
-        for collection_name in selected_collections:
-            # Cria a view layer com o nome da collection
-            viewlayer_name = collection_name
-            viewlayer = scene.view_layers.get(viewlayer_name) or scene.view_layers.new(viewlayer_name)
-
+        generation = {
+            "selected": selected_collections,
+            "lighting": lighting_collections,
+            "always_active": always_active_collections,
+            "holdout": holdout_collections,
+            "holdout_parents": holdout_parents,
+            # Raízes de assets linkados sem regras de nomenclatura internas
+            "opaque_roots": linked_assets.build_opaque_asset_roots(bpy.data.collections, set(selected_collections)),
+            # Política das collections .ind por tipo de view layer
+            "indirect_policies": get_indirect_policies(context),
+            "plan": None,
+            # Identificador desta execução, gravado em cada view layer gerado
+            "run_id": generated_layers.new_run_id(),
+            # View layers já gerados, pela collection de origem (seguem renomeações)
+            "layers_by_source": generated_layers.map_layers_by_source(scene),
+        }
+        
+        # Backend vetorizado: calcular a matriz view layers × collections de uma vez
+        props = scene.viewlayer_generator_props
+        if props.planning_backend == "NUMPY" and visibility_plan.has_numpy():
+            # Todos os view layers compartilham a mesma árvore de collections
+            root = scene.view_layers[0].layer_collection
+            _, names, parents, depths = visibility_plan.flatten_layer_tree(root, generation["opaque_roots"])
+            # Árvore usada no plano: conferida antes de aplicar cada linha
+            generation["plan_names"] = names
+            plan_args = (names, parents, depths, selected_collections, holdout_parents,
+                         generation["indirect_policies"])
+            if defer_plan:
+                generation["plan_args"] = plan_args
+            else:
+                generation["plan"] = visibility_plan.build_plan_numpy(*plan_args)
+        return generation
+    
+    def find_layer(self, scene, generation, row):
+        """View layer existente da linha ``row``: o marcado com a collection de origem ou o de mesmo nome."""
+        collection_name = generation["selected"][row]
+        collection = bpy.data.collections.get(collection_name)
+        layer_name = None
+        if collection is not None:
+            layer_name = generation["layers_by_source"].get(collection_refs.get_collection_uid(collection))
+        return scene.view_layers.get(layer_name or collection_name)
+    
+    def generate_layer(self, scene, generation, row):
+        """Criar (se preciso) e configurar o view layer da linha ``row`` da geração.
+        
+        Retorna None se a collection não existe mais (removida entre as etapas
+        da geração modal).
+        """
+        # Cria a view layer com o nome da collection
+        collection_name = generation["selected"][row]
+        if bpy.data.collections.get(collection_name) is None:
+            return None
+        viewlayer = self.find_layer(scene, generation, row)
+        if viewlayer is None:
+            viewlayer = scene.view_layers.new(collection_name)
+        elif viewlayer.name != collection_name and collection_name not in scene.view_layers:
+            # A collection foi renomeada: o view layer acompanha o novo nome
+            viewlayer.name = collection_name
+        generated_layers.tag_viewlayer(viewlayer, bpy.data.collections[collection_name], generation["run_id"])
+        opaque_roots = generation["opaque_roots"]
+        
+        visibility = {"included": set(), "holdout": set()}
+        refs = names = parents = None
+        if generation["plan"] is not None:
+            refs, names, parents, _ = visibility_plan.flatten_layer_tree(viewlayer.layer_collection, opaque_roots)
+        if names is not None and names == generation["plan_names"]:
+            exclude_plan, holdout_plan, indirect_plan = generation["plan"]
+            visibility_plan.apply_plan_row(refs, parents, exclude_plan[row], holdout_plan[row], visibility,
+                                           opaque_roots, indirect_plan[row])
+        else:
+            # Sem plano, ou a árvore mudou desde o planejamento (ex.: edição entre as
+            # etapas da geração modal): as linhas do plano não correspondem mais aos nós
+            if names is not None:
+                generation["plan_fallbacks"] = generation.get("plan_fallbacks", 0) + 1
             # Configurar visibilidade das collections recursivamente
             self.process_layer_collection(
                 viewlayer.layer_collection, 
                 collection_name, 
-                lighting_collections, 
-                always_active_collections, 
-                holdout_collections,
-                holdout_parents,
-                parent_active=False
+                generation["lighting"], 
+                generation["always_active"], 
+                generation["holdout"],
+                generation["holdout_parents"],
+                parent_active=False,
+                visibility=visibility,
+                opaque_roots=opaque_roots,
+                indirect_policies=generation["indirect_policies"]
             )
+        hierarchy.store_layer_visibility(scene, viewlayer.name, visibility["included"], visibility["holdout"])
+        layer_stats.mark_layers_dirty(scene.name, {viewlayer.name})
+        return viewlayer
+
+    def disable_empty_layers(self, context):
+        """Etapa pós-geração: desativar view layers vazios (se ativado nas propriedades)."""
+        if not context.scene.viewlayer_generator_props.skip_empty_layers:
+            return
+        empty = disable_empty_viewlayers(context.scene)
+        if empty:
+            self.report({"WARNING"}, f"{len(empty)} ViewLayers sem conteúdo renderizável desativados: {', '.join(empty)}")
+
+    def apply_budgets(self, context, layer_names):
+        """Etapa pós-geração: aplicar orçamentos de renderização por tipo (se ativado)."""
+        props = context.scene.viewlayer_generator_props
+        if not props.use_render_budgets:
+            return
+        view_layers = context.scene.view_layers
+        kind_counts = apply_render_budgets(context, [view_layers[name] for name in layer_names])
+        summary = ", ".join(f"{count} {kind.lower()}" for kind, count in sorted(kind_counts.items()))
+        self.report({"INFO"}, f"Orçamentos de renderização aplicados: {summary}")
+
+
+# Operador para Etapa 1: Gerar apenas as ViewLayers
+class VIEWLAYER_OT_generate_layers(LayerGenerationMixin, Operator):
 
-        self.report({"INFO"}, f"{len(selected_collections)} ViewLayers gerados com sucesso!")
+    """Gerar apenas as ViewLayers a partir das collections selecionadas"""
+    bl_idname = "viewlayer.generate_layers"
+    bl_label = "Gerar ViewLayers"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    def execute(self, context):
+        generation = self.prepare_generation(context)
+        if generation is None:
+            self.report({"ERROR"}, "Nenhuma collection selecionada!")
+            return {"CANCELLED"}
+        
+        # Criar viewlayers
+        selected_collections = generation["selected"]
+        for row in range(len(selected_collections)):
+            self.generate_layer(context.scene, generation, row)
+
+        self.disable_empty_layers(context)
+        self.apply_budgets(context, selected_collections)
+        backend = " (NumPy)" if generation["plan"] is not None else ""
+        self.report({"INFO"}, f"{len(selected_collections)} ViewLayers gerados com sucesso{backend}!")
         return {"FINISHED"}
 
 
+# Progresso da geração em etapas (exibido no painel principal)
+_generation_status = {"running": False, "done": 0, "total": 0}
+
+# Operador para executar todas as etapas sem travar a interface
+class VIEWLAYER_OT_generate_all_modal(LayerGenerationMixin, Operator):
+    """Gerar ViewLayers completos em fatias de tempo, com progresso (Esc cancela)"""
+    bl_idname = "viewlayer.generate_all_modal"
+    bl_label = "Gerar ViewLayers em Etapas"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    # Duração máxima de cada fatia de processamento e intervalo entre fatias (segundos)
+    TIME_SLICE = 0.05
+    TIMER_INTERVAL = 0.01
+    
+    def invoke(self, context, event):
+        ensure_initialized(context)
+        if _generation_status["running"]:
+            self.report({"WARNING"}, "Uma geração já está em andamento")
+            return {"CANCELLED"}
+        
+        if not check_lint_gate(self, context):
+            return {"CANCELLED"}
+        bpy.ops.viewlayer.refresh_collections()
+        
+        scene = context.scene
+        self._scene_name = scene.name
+        self._existing = {viewlayer.name for viewlayer in scene.view_layers}
+        self._snapshots = []
+        self._renamed = []  # [(novo nome, nome anterior)] dos view layers que seguiram a collection
+        self._row = 0
+        background = scene.viewlayer_generator_props.use_background_analysis
+        self._generation = self.prepare_generation(context, defer_plan=background)
+        if self._generation is None:
+            self.report({"ERROR"}, "Nenhuma collection selecionada!")
+            return {"CANCELLED"}
+        
+        # Plano NumPy em segundo plano: as fatias começam quando ele ficar pronto
+        self._plan_future = None
+        plan_args = self._generation.pop("plan_args", None)
+        if plan_args is not None:
+            self._plan_future = background_tasks.submit(f"plan:{scene.name}", visibility_plan.build_plan_numpy,
+                                                        *plan_args)
+        
+        total = len(self._generation["selected"])
+        _generation_status.update(running=True, done=0, total=total)
+        context.window_manager.progress_begin(0, total)
+        self._timer = context.window_manager.event_timer_add(self.TIMER_INTERVAL, window=context.window)
+        context.window_manager.modal_handler_add(self)
+        return {"RUNNING_MODAL"}
+    
+    def execute(self, context):
+        # Sem evento (scripts, linha de comando): executar a versão bloqueante
+        return bpy.ops.viewlayer.generate_all()
+    
+    def modal(self, context, event):
+        if event.type == "ESC":
+            return self.cancel_generation(context)
+        if event.type != "TIMER":
+            return {"PASS_THROUGH"}
+        
+        if self._plan_future is not None:
+            if not self._plan_future.done():
+                return {"RUNNING_MODAL"}
+            try:
+                self._generation["plan"] = self._plan_future.result()
+            except Exception as e:
+                # Sem plano, generate_layer usa o caminho recursivo
+                print(f"Erro no plano de visibilidade em segundo plano: {str(e)}")
+            self._plan_future = None
+        
+        # A cena fica livre para edição entre as fatias: resolver tudo de novo a cada uma
+        scene = bpy.data.scenes.get(self._scene_name)
+        if scene is None:
+            return self.cancel_generation(context)
+        
+        # Processar view layers até esgotar a fatia de tempo
+        names = self._generation["selected"]
+        deadline = time.perf_counter() + self.TIME_SLICE
+        while self._row < len(names) and time.perf_counter() < deadline:
+            existing = self.find_layer(scene, self._generation, self._row)
+            previous_name = existing.name if existing is not None else None
+            self.snapshot_layer(existing)
+            viewlayer = self.generate_layer(scene, self._generation, self._row)
+            if viewlayer is not None and previous_name is not None and viewlayer.name != previous_name:
+                self._renamed.append((viewlayer.name, previous_name))
+            self._row += 1
+        
+        _generation_status["done"] = self._row
+        context.window_manager.progress_update(self._row)
+        tag_sidebar_redraw(context)
+        if self._row < len(names):
+            return {"RUNNING_MODAL"}
+        
+        # Etapas finais rodam de uma vez: Esc só é aceito entre os blocos de view layers
+        self.stop(context)
+        fallbacks = self._generation.get("plan_fallbacks", 0)
+        if fallbacks:
+            self.report({"WARNING"}, f"A hierarquia mudou durante a geração: {fallbacks} ViewLayers "
+                                     f"gerados pelo caminho recursivo em vez do plano")
+        self.disable_empty_layers(context)
+        self.apply_budgets(context, [name for name in names if name in scene.view_layers])
+        if run_post_generation_stages(self, context):
+            self.report({"WARNING"}, "Processo finalizado com avisos de orçamento")
+        else:
+            self.report({"INFO"}, f"{len(names)} ViewLayers gerados em etapas com sucesso")
+        return {"FINISHED"}
+    
+    def snapshot_layer(self, viewlayer):
+        """Guardar o estado das layer collections de um view layer existente (para rollback).
+        
+        O estado fica por nome (view layer e collection com sua ocorrência), sem
+        referências RNA: a cena pode ser editada entre as fatias e collections
+        removidas invalidariam as referências.
+        """
+        if viewlayer is None or viewlayer.name not in self._existing:
+            return
+        refs, names, _, _ = visibility_plan.flatten_layer_tree(viewlayer.layer_collection)
+        states = [(key, ref.exclude, ref.holdout, ref.indirect_only)
+                  for key, ref in zip(visibility_plan.get_occurrence_keys(names), refs)]
+        self._snapshots.append((viewlayer.name, viewlayer.use, states))
+    
+    def cancel_generation(self, context):
+        """Cancelar conforme a política: desfazer tudo ou manter os view layers concluídos."""
+        self.stop(context)
+        scene = bpy.data.scenes.get(self._scene_name)
+        done = self._row
+        if scene is None:
+            self.report({"WARNING"}, "Geração cancelada: a cena foi removida")
+            return {"CANCELLED"}
+        
+        if scene.viewlayer_generator_props.generation_cancel_policy == "KEEP":
+            self.report({"WARNING"}, f"Geração cancelada: {done}/{len(self._generation['selected'])} ViewLayers "
+                                     f"mantidos, passes e AOVs não aplicados")
+            return {"CANCELLED"}
+        
+        # Rollback: desfazer as renomeações e restaurar em pré-ordem (o exclude do pai propaga para as filhas)
+        for new_name, previous_name in reversed(self._renamed):
+            viewlayer = scene.view_layers.get(new_name)
+            if viewlayer is not None:
+                viewlayer.name = previous_name
+        for layer_name, use, states in self._snapshots:
+            viewlayer = scene.view_layers.get(layer_name)
+            if viewlayer is None:
+                continue
+            refs, names, _, _ = visibility_plan.flatten_layer_tree(viewlayer.layer_collection)
+            current = dict(zip(visibility_plan.get_occurrence_keys(names), refs))
+            for key, exclude, holdout, indirect in states:
+                ref = current.get(key)
+                if ref is None:
+                    continue  # Collection removida durante a geração
+                if ref.exclude != exclude:
+                    ref.exclude = exclude
+                if ref.holdout != holdout:
+                    ref.holdout = holdout
+                if ref.indirect_only != indirect:
+                    ref.indirect_only = indirect
+            if viewlayer.use != use:
+                viewlayer.use = use
+        
+        created = [viewlayer for viewlayer in scene.view_layers if viewlayer.name not in self._existing]
+        for viewlayer in created:
+            scene.view_layers.remove(viewlayer)
+        hierarchy.clear_layer_visibility(scene)
+        layer_stats.mark_layers_dirty(scene.name)
+        
+        self.report({"WARNING"}, f"Geração cancelada: {len(created)} ViewLayers novos removidos, "
+                                 f"{len(self._snapshots)} restaurados")
+        return {"CANCELLED"}
+    
+    def stop(self, context):
+        """Encerrar o timer, a barra de progresso e o plano em segundo plano pendente."""
+        if self._plan_future is not None:
+            self._plan_future.cancel()
+            self._plan_future = None
+        context.window_manager.event_timer_remove(self._timer)
+        context.window_manager.progress_end()
+        _generation_status["running"] = False
+        tag_sidebar_redraw(context)
+    
+    def cancel(self, context):
+        # Chamado pelo Blender ao interromper o modal (ex.: abrir outro arquivo)
+        if _generation_status["running"]:
+            self.stop(context)
+
+
 # Operador para Etapa 2: Aplicar apenas os Passes
 class VIEWLAYER_OT_apply_passes(Operator):
     """Aplicar passes selecionados às ViewLayers existentes"""
@@ -572,7 +1281,15 @@ class VIEWLAYER_OT_apply_passes(Operator):
     bl_label = "Aplicar Passes"
     bl_options = {"REGISTER", "UNDO"}
     
+    check_budgets: BoolProperty(
+        name="Verificar Orçamento",
+        default=True,
+        description="Reportar avisos de orçamento de saída com os passes aplicados",
+        options={"SKIP_SAVE"}
+    )
+    
     def execute(self, context):
+        ensure_initialized(context)
         scene = context.scene
         props = scene.viewlayer_generator_props
         
@@ -583,45 +1300,87 @@ class VIEWLAYER_OT_apply_passes(Operator):
             self.report({"WARNING"}, "Nenhum passe selecionado!")
             return {"CANCELLED"}
         
+        # Saídas consumidas no compositor (modo "apenas passes consumidos")
+        consumed = compositor_analysis.collect_consumed_outputs(scene) if props.only_consumed_passes else {}
+        allow_list = compositor_analysis.parse_allow_list(props.consumed_allow_list)
+        
+        # Políticas de Cryptomatte entram antes do filtro de passes consumidos,
+        # para que o filtro e a allow-list também valham para elas
+        policies = get_crypto_policies(context) if props.use_crypto_policy else None
+        layer_policies = []
+        
         # Aplicar passes a todas as view layers
         count = 0
         gp_count = 0
+        pruned_count = 0
         
-        for viewlayer in scene.view_layers:
-            
-            # Desativar todos os passes primeiro
-            for attr in dir(viewlayer):
-                if attr.startswith("use_pass_") and isinstance(getattr(viewlayer, attr), bool):
-                    setattr(viewlayer, attr, False)
-
+        # Matriz de passes (uma coluna por propriedade, um valor por view layer),
+        # todos desativados primeiro e escritos em lote no final
+        viewlayers = list(scene.view_layers)
+        columns = {attr: [False] * len(viewlayers) for attr in get_bool_pass_attributes(viewlayers[0])}
+        
+        for index, viewlayer in enumerate(viewlayers):
+            enabled = []
+            filter_consumed = False
 
             # Verificar se é uma viewlayer GP (pelo nome)
             if is_gp_collection(viewlayer.name):
                 # Para ViewLayers GP, aplicar apenas o passe combined
                 gp_count += 1
                 # Ativar apenas o passe combined
-                if hasattr(viewlayer, "use_pass_combined"):
-                    setattr(viewlayer, "use_pass_combined", True)
-                    setattr(viewlayer, "use_pass_z", True)
+                enabled = ["use_pass_combined", "use_pass_z"]
 
             elif is_lgt_collection(viewlayer.name):
                 # Para viewlayers do tipo lgt, ativar apenas o passe combined
-                if hasattr(viewlayer, "use_pass_combined"):
-                    setattr(viewlayer, "use_pass_combined", True)
+                enabled = ["use_pass_combined"]
                                  
             else:
                 # Para outras ViewLayers, aplicar os passes selecionados normalmente
-                for pass_name in passes:
-                    if hasattr(viewlayer, pass_name):
-                        setattr(viewlayer, pass_name, True)
+                enabled = passes
+                filter_consumed = viewlayer.name in consumed
+            
+            policy = policies[layer_kinds.get_layer_kind(viewlayer)] if policies is not None else None
+            layer_policies.append(policy)
+            if policy is not None:
+                enabled = crypto_policy.merge_policy_passes(enabled, policy)
+            
+            if filter_consumed:
+                # Manter apenas os passes ligados no compositor ou na allow-list
+                consumed_passes, _ = compositor_analysis.split_consumed_outputs(consumed[viewlayer.name])
+                layer_passes = [
+                    pass_name for pass_name in enabled
+                    if pass_name in consumed_passes or compositor_analysis.is_allowed(
+                        pass_name, allow_list, passes_data.get_friendly_name(pass_name))
+                ]
+                pruned_count += len(enabled) - len(layer_passes)
+                enabled = layer_passes
+            
+            for pass_name in enabled:
+                if pass_name in columns:
+                    columns[pass_name][index] = True
             
             count += 1
         
+        if policies is not None and hasattr(viewlayers[0], "pass_cryptomatte_depth"):
+            columns["pass_cryptomatte_depth"] = crypto_policy.plan_depth_column(viewlayers, layer_policies, columns)
+        
+        # Passes têm callback de update (sockets do Render Layers e depsgraph): sem foreach_set
+        bulk_rna.write_columns_diffed(scene.view_layers, columns)
+        layer_stats.mark_layers_dirty(scene.name)
+        
         # Mensagem de feedback
         if gp_count > 0:
             self.report({"INFO"}, f"Passes aplicados a {count} ViewLayers ({gp_count} ViewLayers GP receberam apenas o passe combined)")
         else:
             self.report({"INFO"}, f"Passes aplicados com sucesso a {count} ViewLayers: {', '.join(passes)}")
+        
+        if props.only_consumed_passes:
+            self.report({"INFO"}, f"{pruned_count} passes não consumidos pelo compositor foram desativados "
+                                  f"({len(consumed)} ViewLayers com nós Render Layers)")
+        
+        # Verificar orçamento de saída com os passes recém-aplicados
+        if self.check_budgets:
+            report_budget_warnings(self, context)
             
         return {"FINISHED"}
 
@@ -646,6 +1405,11 @@ class VIEWLAYER_OT_apply_aovs(Operator):
             self.report({"WARNING"}, "Nenhum AOV selecionado!")
             return {"CANCELLED"}
         
+        # Saídas consumidas no compositor (modo "apenas passes consumidos")
+        props = scene.viewlayer_generator_props
+        consumed = compositor_analysis.collect_consumed_outputs(scene) if props.only_consumed_passes else {}
+        allow_list = compositor_analysis.parse_allow_list(props.consumed_allow_list)
+        
         # Aplicar AOVs a todas as view layers
         count = 0
         for viewlayer in scene.view_layers:
@@ -653,14 +1417,594 @@ class VIEWLAYER_OT_apply_aovs(Operator):
             if is_gp_collection(viewlayer.name) or is_lgt_collection(viewlayer.name):
                 continue  # Pular view layers do tipo GP
             
-            apply_aovs_to_viewlayer(viewlayer, selected_aovs)
+            layer_aovs = selected_aovs
+            if viewlayer.name in consumed:
+                # Manter apenas os AOVs ligados no compositor ou na allow-list
+                _, consumed_aovs = compositor_analysis.split_consumed_outputs(consumed[viewlayer.name])
+                layer_aovs = [aov for aov in selected_aovs
+                              if aov["name"] in consumed_aovs or compositor_analysis.is_allowed(aov["name"], allow_list)]
+                remove_unused_aovs(viewlayer, {aov["name"] for aov in layer_aovs})
+            
+            apply_aovs_to_viewlayer(viewlayer, layer_aovs)
             count += 1
+        layer_stats.mark_layers_dirty(scene.name)
         
         aov_names = ", ".join(aov["name"] for aov in selected_aovs)
         self.report({"INFO"}, f"AOVs aplicados com sucesso a {count} ViewLayers: {aov_names}")
         return {"FINISHED"}
 
 
+# Operador para aplicar as políticas de Cryptomatte em lote
+class VIEWLAYER_OT_apply_crypto_policy(Operator):
+    """Aplicar níveis e tipos de Cryptomatte conforme o tipo de cada ViewLayer"""
+    bl_idname = "viewlayer.apply_crypto_policy"
+    bl_label = "Aplicar Políticas de Cryptomatte"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    def execute(self, context):
+        kind_counts = apply_crypto_policies(context)
+        summary = ", ".join(f"{count} {kind.lower()}" for kind, count in sorted(kind_counts.items()))
+        self.report({"INFO"}, f"Políticas de Cryptomatte aplicadas: {summary or 'nenhum ViewLayer'}")
+        return {"FINISHED"}
+
+
+# Operador para sincronizar os nós Render Layers → File Output
+class VIEWLAYER_OT_sync_output_nodes(Operator):
+    """Criar e sincronizar nós Render Layers e File Output EXR para cada ViewLayer gerado"""
+    bl_idname = "viewlayer.sync_output_nodes"
+    bl_label = "Sincronizar Nós de Saída"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    def execute(self, context):
+        scene = context.scene
+        props = scene.viewlayer_generator_props
+        # Também os view layers gerados cuja collection foi desmarcada: seus nós continuam em uso
+        layer_names = get_all_generated_layer_names(scene)
+        
+        if not layer_names:
+            self.report({"WARNING"}, "Nenhum ViewLayer gerado encontrado!")
+            return {"CANCELLED"}
+        
+        preferences = find_addon_preferences(context)
+        rule_items = getattr(preferences, "output_codec_rules", ()) if preferences else ()
+        rules = output_nodes.get_codec_rules(rule_items)
+        
+        stats = output_nodes.sync_output_nodes(scene, layer_names, props.output_base_path, rules)
+        self.report({"INFO"}, f"Nós de saída sincronizados para {len(layer_names)} ViewLayers: "
+                              f"{stats['created']} criados, {stats['updated']} atualizados, {stats['removed']} removidos")
+        return {"FINISHED"}
+
+
+# Operador para detectar view layers duplicados
+class VIEWLAYER_OT_find_duplicates(Operator):
+    """Detectar ViewLayers com collections, holdouts, passes e AOVs idênticos"""
+    bl_idname = "viewlayer.find_duplicates"
+    bl_label = "Detectar ViewLayers Duplicados"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    disable_duplicates: BoolProperty(
+        name="Desativar Duplicados",
+        default=False,
+        description="Desativar 'use' em todos os ViewLayers de cada grupo, exceto o primeiro",
+        options={"SKIP_SAVE"}
+    )
+    
+    def execute(self, context):
+        scene = context.scene
+        groups = duplicates.find_duplicate_groups(scene)
+        
+        if not groups:
+            self.report({"INFO"}, "Nenhum ViewLayer duplicado encontrado.")
+            return {"FINISHED"}
+        
+        for names in groups:
+            self.report({"WARNING"}, f"ViewLayers idênticos: {', '.join(names)}")
+        
+        if self.disable_duplicates:
+            disabled = duplicates.disable_duplicates(scene, groups)
+            self.report({"INFO"}, f"{len(disabled)} ViewLayers duplicados desativados.")
+        else:
+            self.report({"INFO"}, f"{len(groups)} grupos de ViewLayers duplicados encontrados.")
+        return {"FINISHED"}
+
+
+# Operador para limpar view layers gerados órfãos
+class VIEWLAYER_OT_prune_layers(Operator):
+    """Desativar ou remover ViewLayers gerados cuja collection de origem sumiu ou foi desmarcada"""
+    bl_idname = "viewlayer.prune_layers"
+    bl_label = "Limpar ViewLayers Órfãos"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    remove: BoolProperty(
+        name="Remover",
+        default=False,
+        description="Remover os ViewLayers órfãos em vez de apenas desativá-los"
+    )
+    dry_run: BoolProperty(
+        name="Apenas Relatório",
+        default=False,
+        description="Listar os ViewLayers órfãos sem alterar a cena",
+        options={"SKIP_SAVE"}
+    )
+    
+    def invoke(self, context, event):
+        # Relatório antes de alterar: a confirmação lista o que será limpo
+        self._orphans = find_orphaned_layers(context.scene)
+        if not self._orphans or self.dry_run:
+            return self.execute(context)
+        return context.window_manager.invoke_props_dialog(self, width=400)
+    
+    def draw(self, context):
+        layout = self.layout
+        layout.label(text=f"{len(self._orphans)} ViewLayers órfãos:", icon="ERROR")
+        for orphan in self._orphans:
+            reason = "origem removida" if orphan["reason"] == generated_layers.ORPHAN_MISSING else "não selecionada"
+            layout.label(text=f"{orphan['name']} ({orphan['source']}: {reason})")
+        layout.prop(self, "remove")
+    
+    def execute(self, context):
+        scene = context.scene
+        orphans = find_orphaned_layers(scene)
+        
+        if not orphans:
+            self.report({"INFO"}, "Nenhum ViewLayer órfão encontrado.")
+            return {"FINISHED"}
+        
+        for orphan in orphans:
+            print(f"ViewLayer órfão: {orphan['name']} (origem: {orphan['source']}, "
+                  f"{orphan['reason']}, execução {orphan['run_id']})")
+        
+        if self.dry_run:
+            self.report({"WARNING"}, f"{len(orphans)} ViewLayers órfãos: {', '.join(o['name'] for o in orphans)}")
+            return {"FINISHED"}
+        
+        removed, disabled = generated_layers.prune_layers(scene, [orphan["name"] for orphan in orphans], self.remove)
+        hierarchy.clear_layer_visibility(scene)
+        self.report({"INFO"}, f"ViewLayers órfãos: {len(removed)} removidos, {len(disabled)} desativados")
+        return {"FINISHED"}
+
+
+# Operador para carregar a telemetria de renderização
+class VIEWLAYER_OT_load_render_telemetry(Operator):
+    """Carregar o log de telemetria de renderização e ranquear os ViewLayers"""
+    bl_idname = "viewlayer.load_render_telemetry"
+    bl_label = "Carregar Telemetria"
+    bl_options = {"REGISTER"}
+    
+    def execute(self, context):
+        props = context.scene.viewlayer_generator_props
+        log_path = render_telemetry.get_log_path()
+        summary = render_telemetry.summarize_log(log_path)
+        
+        props.telemetry_items.clear()
+        if not summary:
+            self.report({"WARNING"}, f"Nenhuma telemetria encontrada em {log_path}")
+            return {"CANCELLED"}
+        
+        for name, entry in summary.items():
+            item = props.telemetry_items.add()
+            item.name = name
+            item.frames = entry["frames"]
+            item.avg_seconds = entry["total"] / entry["frames"]
+            item.max_seconds = entry["max"]
+            item.peak_mem_mb = entry["peak"]
+        
+        self.report({"INFO"}, f"Telemetria de {len(summary)} ViewLayers carregada de {log_path}")
+        return {"FINISHED"}
+
+
+def build_scene_render_jobs(context):
+    """Montar os jobs de renderização dos view layers gerados e ativos da cena."""
+    scene = context.scene
+    props = scene.viewlayer_generator_props
+    layer_names = [name for name in get_generated_layer_names(scene) if scene.view_layers[name].use]
+    
+    return render_jobs.build_jobs(
+        bpy.app.binary_path,
+        bpy.data.filepath,
+        scene.name,
+        layer_names,
+        props.render_jobs_output,
+        scene.frame_start,
+        scene.frame_end,
+        layers_per_job=props.render_jobs_layers_per_job,
+        chunk_size=props.render_jobs_chunk_size,
+    )
+
+
+# Operador para exportar os comandos de renderização por view layer
+class VIEWLAYER_OT_export_render_jobs(Operator):
+    """Exportar um comando 'blender -b' por ViewLayer (ou grupo) e bloco de frames"""
+    bl_idname = "viewlayer.export_render_jobs"
+    bl_label = "Exportar Jobs de Renderização"
+    bl_options = {"REGISTER"}
+    
+    def execute(self, context):
+        if not bpy.data.filepath:
+            self.report({"ERROR"}, "Salve o arquivo .blend antes de exportar os jobs!")
+            return {"CANCELLED"}
+        
+        jobs = build_scene_render_jobs(context)
+        if not jobs:
+            self.report({"WARNING"}, "Nenhum ViewLayer gerado e ativo para renderizar!")
+            return {"CANCELLED"}
+        
+        jobs_path = os.path.splitext(bpy.data.filepath)[0] + "_render_jobs.json"
+        with open(jobs_path, "w", encoding="utf-8") as jobs_file:
+            json.dump(jobs, jobs_file, indent=2)
+        
+        self.report({"INFO"}, f"{len(jobs)} jobs exportados para {jobs_path}")
+        return {"FINISHED"}
+
+
+# Estado da execução local dos jobs (thread em segundo plano)
+_render_jobs_state = {"thread": None, "results": [], "total": 0}
+
+def _poll_render_jobs():
+    """Timer que reporta o fim da execução local dos jobs."""
+    thread = _render_jobs_state["thread"]
+    if thread is not None and thread.is_alive():
+        return 1.0
+    
+    results = _render_jobs_state["results"]
+    failed = [result["name"] for result in results if result["returncode"] != 0]
+    total_seconds = sum(result["seconds"] for result in results)
+    print(f"Jobs de renderização finalizados: {len(results)} executados, {len(failed)} com erro, "
+          f"{total_seconds:.1f}s somados")
+    for name in failed:
+        print(f"  - Falhou: {name}")
+    _render_jobs_state["thread"] = None
+    return None
+
+
+# Operador para executar os jobs localmente com limite de concorrência
+class VIEWLAYER_OT_run_render_jobs(Operator):
+    """Renderizar os ViewLayers em processos paralelos do Blender nesta máquina"""
+    bl_idname = "viewlayer.run_render_jobs"
+    bl_label = "Renderizar Jobs em Paralelo"
+    bl_options = {"REGISTER"}
+    
+    def execute(self, context):
+        if _render_jobs_state["thread"] is not None:
+            self.report({"WARNING"}, "Já existem jobs de renderização em execução!")
+            return {"CANCELLED"}
+        
+        if not bpy.data.filepath or bpy.data.is_dirty:
+            self.report({"ERROR"}, "Salve o arquivo .blend antes de renderizar os jobs!")
+            return {"CANCELLED"}
+        
+        jobs = build_scene_render_jobs(context)
+        if not jobs:
+            self.report({"WARNING"}, "Nenhum ViewLayer gerado e ativo para renderizar!")
+            return {"CANCELLED"}
+        
+        props = context.scene.viewlayer_generator_props
+        log_dir = os.path.splitext(bpy.data.filepath)[0] + "_render_jobs_logs"
+        results = []
+        _render_jobs_state["results"] = results
+        _render_jobs_state["total"] = len(jobs)
+        
+        thread = threading.Thread(
+            target=render_jobs.run_jobs,
+            args=(jobs, props.render_jobs_concurrency, log_dir, results.append),
+            daemon=True,
+        )
+        _render_jobs_state["thread"] = thread
+        thread.start()
+        bpy.app.timers.register(_poll_render_jobs, first_interval=1.0)
+        
+        self.report({"INFO"}, f"{len(jobs)} jobs iniciados com até {props.render_jobs_concurrency} processos simultâneos")
+        return {"FINISHED"}
+
+
+# Operador para estimar a geometria de cada view layer
+class VIEWLAYER_OT_estimate_footprint(Operator):
+    """Estimar objetos, vértices, faces e instâncias incluídos em cada ViewLayer"""
+    bl_idname = "viewlayer.estimate_footprint"
+    bl_label = "Estimar Geometria"
+    bl_options = {"REGISTER"}
+    
+    def execute(self, context):
+        props = context.scene.viewlayer_generator_props
+        results = geometry_footprint.estimate_scene_footprint(
+            context.scene, bpy.data.collections, context.evaluated_depsgraph_get())
+        
+        props.footprint_items.clear()
+        for result in sorted(results, key=lambda r: r["faces"], reverse=True):
+            item = props.footprint_items.add()
+            item.name = result["name"]
+            item.objects = result["objects"]
+            item.verts = str(result["verts"])
+            item.faces = str(result["faces"])
+            item.instances = result["instances"]
+            item.heavy = result["heavy"]
+            item.dominant = ", ".join(f"{name} ({share:.0%})" for name, share in result["dominant"])
+            
+            if item.heavy:
+                self.report({"WARNING"}, f"{item.name}: {result['faces']:,} faces"
+                                         f"{' - dominado por ' + item.dominant if item.dominant else ''}")
+        
+        heavy_count = sum(1 for result in results if result["heavy"])
+        self.report({"INFO"}, f"Geometria estimada para {len(results)} ViewLayers ({heavy_count} pesados)")
+        return {"FINISHED"}
+
+
+# Operador para conferir o plano vetorizado contra a referência em Python
+class VIEWLAYER_OT_verify_visibility_plan(LayerGenerationMixin, Operator):
+    """Comparar o plano de visibilidade NumPy com uma execução simulada do caminho recursivo"""
+    bl_idname = "viewlayer.verify_visibility_plan"
+    bl_label = "Verificar Plano de Visibilidade"
+    bl_options = {"REGISTER"}
+    
+    def execute(self, context):
+        if not visibility_plan.has_numpy():
+            self.report({"ERROR"}, "NumPy não está disponível nesta instalação do Blender!")
+            return {"CANCELLED"}
+        
+        scene = context.scene
+        generation = self.prepare_generation(context, defer_plan=True)
+        if generation is None:
+            self.report({"ERROR"}, "Nenhuma collection selecionada!")
+            return {"CANCELLED"}
+        selected_collections = generation["selected"]
+        root = scene.view_layers[0].layer_collection
+        _, names, parents, depths = visibility_plan.flatten_layer_tree(root, generation["opaque_roots"])
+        
+        # Referência: a própria recursão da geração, registrando as decisões sem escrevê-las
+        start = time.perf_counter()
+        recursive_plan = ([], [], [])  # (exclude, holdout, indirect), uma linha por view layer
+        for collection_name in selected_collections:
+            record = []
+            self.process_layer_collection(
+                root,
+                collection_name,
+                generation["lighting"],
+                generation["always_active"],
+                generation["holdout"],
+                generation["holdout_parents"],
+                opaque_roots=generation["opaque_roots"],
+                indirect_policies=generation["indirect_policies"],
+                record=record
+            )
+            for plan, column in zip(recursive_plan, zip(*record)):
+                plan.append(list(column))
+        recursive_ms = (time.perf_counter() - start) * 1000.0
+        
+        start = time.perf_counter()
+        numpy_plan = visibility_plan.build_plan_numpy(names, parents, depths, selected_collections,
+                                                      generation["holdout_parents"], generation["indirect_policies"])
+        numpy_ms = (time.perf_counter() - start) * 1000.0
+        
+        size = f"{len(selected_collections)} × {len(names)}"
+        if not visibility_plan.plans_match(recursive_plan, numpy_plan):
+            self.report({"ERROR"}, f"Planos divergem ({size})!")
+            return {"CANCELLED"}
+        
+        self.report({"INFO"}, f"Planos idênticos ({size}): recursivo {recursive_ms:.1f} ms, NumPy {numpy_ms:.1f} ms")
+        return {"FINISHED"}
+
+
+# Operador de benchmark das escritas de passes
+class VIEWLAYER_OT_benchmark_pass_writes(Operator):
+    """Medir escrita de passes item a item (setattr) contra a escrita diferencial usada em Aplicar Passes"""
+    bl_idname = "viewlayer.benchmark_pass_writes"
+    bl_label = "Benchmark de Escrita de Passes"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    repeats: bpy.props.IntProperty(name="Repetições", default=20, min=1)
+    
+    def execute(self, context):
+        view_layers = context.scene.view_layers
+        attrs = get_bool_pass_attributes(view_layers[0])
+        count = len(view_layers)
+        
+        # Guardar o estado atual para restaurar no final
+        original = {attr: [getattr(viewlayer, attr) for viewlayer in view_layers] for attr in attrs}
+        # Alternar os valores a cada repetição para forçar escritas reais
+        patterns = [{attr: [(i + r) % 2 == 0 for i in range(count)] for attr in attrs} for r in range(2)]
+        
+        # Ambos os caminhos escrevem com setattr e disparam o update dos passes
+        start = time.perf_counter()
+        for r in range(self.repeats):
+            bulk_rna.write_columns_setattr(view_layers, patterns[r % 2])
+        setattr_ms = (time.perf_counter() - start) * 1000.0 / self.repeats
+        
+        # Tudo muda a cada repetição: custo da leitura em lote somado às mesmas escritas
+        start = time.perf_counter()
+        for r in range(self.repeats):
+            bulk_rna.write_columns_diffed(view_layers, patterns[r % 2])
+        changed_ms = (time.perf_counter() - start) * 1000.0 / self.repeats
+        
+        # Reaplicar o mesmo estado (caso comum de Aplicar Passes): só a leitura em lote
+        start = time.perf_counter()
+        for r in range(self.repeats):
+            bulk_rna.write_columns_diffed(view_layers, patterns[(self.repeats - 1) % 2])
+        unchanged_ms = (time.perf_counter() - start) * 1000.0 / self.repeats
+        
+        bulk_rna.write_columns_diffed(view_layers, original)
+        
+        message = (f"{count} ViewLayers × {len(attrs)} passes: setattr {setattr_ms:.2f} ms, "
+                   f"diferencial {changed_ms:.2f} ms com tudo mudando, {unchanged_ms:.2f} ms sem mudanças")
+        print(message)
+        self.report({"INFO"}, message)
+        return {"FINISHED"}
+
+
+# Operador para criar light groups a partir das collections lgt.*
+class VIEWLAYER_OT_setup_light_groups(Operator):
+    """Criar um light group por collection lgt.* nos ViewLayers beauty, substituindo os ViewLayers lgt."""
+    bl_idname = "viewlayer.setup_light_groups"
+    bl_label = "Configurar Light Groups"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    def execute(self, context):
+        scene = context.scene
+        if scene.render.engine != "CYCLES":
+            self.report({"WARNING"}, "Light groups são suportados apenas no Cycles!")
+            return {"CANCELLED"}
+        
+        lightgroups = light_groups.collect_lightgroups(bpy.data.collections)
+        if not lightgroups:
+            self.report({"WARNING"}, "Nenhuma collection lgt.* com luzes ou objetos emissivos encontrada!")
+            return {"CANCELLED"}
+        
+        assigned = light_groups.assign_lightgroups(lightgroups)
+        rig_names = {col.name for col in bpy.data.collections
+                     if col.name.startswith("lgt.") and col.name not in light_groups.SHARED_LGT_COLLECTIONS}
+        
+        beauty_count = 0
+        disabled = 0
+        for viewlayer in scene.view_layers:
+            if is_lgt_collection(viewlayer.name):
+                # Os view layers por rig são substituídos pelos light groups
+                if viewlayer.use:
+                    viewlayer.use = False
+                    disabled += 1
+                continue
+            if is_gp_collection(viewlayer.name):
+                continue
+            
+            # Apenas os rigs lgt.<prefixo> do view layer (mesma regra da geração)
+            # precisam estar incluídos para contribuir com seus light groups
+            layer_rigs = light_groups.get_layer_rigs(rig_names, viewlayer.name)
+            light_groups.include_rig_collections(viewlayer, layer_rigs)
+            layer_groups = {light_groups.get_lightgroup_name(rig_name) for rig_name in layer_rigs}
+            light_groups.ensure_viewlayer_lightgroups(viewlayer, layer_groups & set(lightgroups), lightgroups)
+            beauty_count += 1
+        
+        # A visibilidade registrada na geração não inclui os rigs
+        hierarchy.clear_layer_visibility(scene)
+        layer_stats.mark_layers_dirty(scene.name)
+        
+        self.report({"INFO"}, f"{len(lightgroups)} light groups em {beauty_count} ViewLayers "
+                              f"({assigned} objetos atribuídos, {disabled} ViewLayers lgt. desativados)")
+        return {"FINISHED"}
+
+
+# Operador para desativar view layers vazios
+class VIEWLAYER_OT_disable_empty_layers(Operator):
+    """Desativar ViewLayers sem objetos renderizáveis visíveis para a câmera"""
+    bl_idname = "viewlayer.disable_empty_layers"
+    bl_label = "Desativar ViewLayers Vazios"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    def execute(self, context):
+        empty = disable_empty_viewlayers(context.scene)
+        
+        if not empty:
+            self.report({"INFO"}, "Nenhum ViewLayer vazio encontrado.")
+            return {"FINISHED"}
+        
+        for name in empty:
+            print(f"ViewLayer sem conteúdo renderizável desativado: {name}")
+        self.report({"WARNING"}, f"{len(empty)} ViewLayers vazios desativados: {', '.join(empty)}")
+        return {"FINISHED"}
+
+
+# Operador para atribuir pass indices de objetos e materiais
+class VIEWLAYER_OT_assign_pass_indices(Operator):
+    """Atribuir pass_index estáveis a objetos (por collection) e materiais (por família)"""
+    bl_idname = "viewlayer.assign_pass_indices"
+    bl_label = "Atribuir Pass Indices"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    def execute(self, context):
+        scene = context.scene
+        mode = scene.viewlayer_generator_props.pass_index_mode
+        collection_names = get_selected_collection_names(scene)
+        tables = pass_indices.load_tables(scene)
+        manifest = pass_indices.assign_pass_indices(bpy.data, collection_names, mode, tables)
+        pass_indices.store_tables(scene, tables)
+        
+        summary = f"{len(manifest['objects'])} índices de objeto, {len(manifest['materials'])} de material"
+        if not bpy.data.filepath:
+            self.report({"WARNING"}, f"{summary}; salve o .blend para gravar o manifesto")
+            return {"FINISHED"}
+        
+        manifest_path = pass_indices.get_manifest_path(bpy.data.filepath)
+        pass_indices.write_manifest(manifest_path, manifest)
+        self.report({"INFO"}, f"{summary}; manifesto em {manifest_path}")
+        return {"FINISHED"}
+
+
+# Operador para gravar o manifesto dos view layers
+class VIEWLAYER_OT_write_layer_manifest(Operator):
+    """Gravar um JSON com passes, AOVs, Cryptomatte, saídas e origens de cada ViewLayer gerado"""
+    bl_idname = "viewlayer.write_layer_manifest"
+    bl_label = "Gravar Manifesto de ViewLayers"
+    bl_options = {"REGISTER"}
+    
+    def execute(self, context):
+        if not bpy.data.filepath:
+            self.report({"ERROR"}, "Salve o arquivo .blend antes de gravar o manifesto!")
+            return {"CANCELLED"}
+        
+        scene = context.scene
+        layer_names = get_all_generated_layer_names(scene)
+        if not layer_names:
+            self.report({"WARNING"}, "Nenhum ViewLayer gerado para descrever!")
+            return {"CANCELLED"}
+        
+        # Mesmos jobs do exportador de comandos: o manifesto descreve os arquivos que eles gravam
+        manifest = layer_manifest.build_manifest(scene, layer_names, build_scene_render_jobs(context))
+        manifest_path = layer_manifest.get_manifest_path(bpy.data.filepath)
+        layer_manifest.write_manifest(manifest_path, manifest)
+        
+        self.report({"INFO"}, f"Manifesto de {len(layer_names)} ViewLayers gravado em {manifest_path}")
+        return {"FINISHED"}
+
+
+# Operador para verificar as convenções da cena
+class VIEWLAYER_OT_lint_scene(Operator):
+    """Verificar convenções de nomenclatura da cena antes de gerar ou renderizar"""
+    bl_idname = "viewlayer.lint_scene"
+    bl_label = "Verificar Cena"
+    bl_options = {"REGISTER"}
+    
+    def invoke(self, context, event):
+        # Pelo painel: analisar em uma thread, se habilitado (a verificação antes de gerar é sempre síncrona)
+        if context.scene.viewlayer_generator_props.use_background_analysis:
+            start_background_lint(context.scene)
+            self.report({"INFO"}, "Verificação iniciada em segundo plano")
+            return {"FINISHED"}
+        return self.execute(context)
+    
+    def execute(self, context):
+        issues = run_scene_lint(context.scene)
+        
+        if not issues:
+            self.report({"INFO"}, "Nenhum problema de convenção encontrado.")
+            return {"FINISHED"}
+        
+        for issue in issues:
+            print(f"[{issue['severity']}] {issue['code']}: {issue['message']}")
+        errors = linter.count_errors(issues)
+        self.report({"ERROR"} if errors else {"WARNING"},
+                    f"{len(issues)} problemas encontrados ({errors} erros); veja o painel Verificação da Cena")
+        return {"FINISHED"}
+
+
+# Operador para estimar saída e memória por view layer
+class VIEWLAYER_OT_estimate_output(Operator):
+    """Estimar tamanho de saída e memória de renderização por ViewLayer"""
+    bl_idname = "viewlayer.estimate_output"
+    bl_label = "Estimar Saída"
+    bl_options = {"REGISTER"}
+    
+    def execute(self, context):
+        # Os valores por ViewLayer ficam no painel (layer_estimates)
+        estimates, totals = store_layer_estimates(context.scene)
+        
+        preferences = find_addon_preferences(context)
+        if preferences and hasattr(preferences, "get_budgets"):
+            for warning in render_estimator.check_budgets(estimates, totals, preferences.get_budgets()):
+                self.report({"WARNING"}, f"Orçamento: {warning}")
+        
+        self.report({"INFO"}, f"{len(estimates)} ViewLayers estimados: "
+                              f"{render_estimator.format_bytes(totals['sequence_bytes'])} na sequência")
+        return {"FINISHED"}
+
+
 # ==========================
 # Painéis
 # ==========================
@@ -676,6 +2020,9 @@ class VIEWLAYER_PT_panel(Panel):
     def draw(self, context):
         layout = self.layout
         
+        # Primeiro desenho: inicializar passes e preferências fora do draw
+        schedule_initialization(context)
+        
         # Título principal
         layout.label(text="Gerador de ViewLayers", icon="RENDERLAYERS")
         
@@ -691,6 +2038,21 @@ class VIEWLAYER_PT_panel(Panel):
             text="Gerar ViewLayers com Passes e AOVs", 
             icon="CHECKMARK"
         )
+        
+        # Geração em etapas (não bloqueia a interface)
+        if _generation_status["running"]:
+            box.label(text=f"Gerando: {_generation_status['done']}/{_generation_status['total']} ViewLayers "
+                           f"(Esc cancela)", icon="SORTTIME")
+        else:
+            row = box.row(align=True)
+            row.operator("viewlayer.generate_all_modal", text="Gerar em Etapas", icon="TIME")
+            row.prop(context.scene.viewlayer_generator_props, "generation_cancel_policy", text="")
+        
+        # Verificação de convenções antes de gerar
+        row = box.row(align=True)
+        row.prop(context.scene.viewlayer_generator_props, "lint_before_generate")
+        row.operator("viewlayer.lint_scene", text="", icon="VIEWZOOM")
+        box.prop(context.scene.viewlayer_generator_props, "use_background_analysis")
 
 # Subpainel de Collections (Etapa 1)
 class VIEWLAYER_PT_collections_panel(Panel):
@@ -711,12 +2073,42 @@ class VIEWLAYER_PT_collections_panel(Panel):
         row.operator("viewlayer.generate_layers", text="Gerar ViewLayers", icon="OUTLINER_OB_GROUP_INSTANCE")
         row.operator("viewlayer.refresh_collections", text="", icon="FILE_REFRESH")
         
-        # Lista de collections
+        # Orçamentos de amostras/denoising por tipo de view layer
+        layout.prop(scene.viewlayer_generator_props, "use_render_budgets")
+        
+        # View layers sem conteúdo renderizável
+        row = layout.row(align=True)
+        row.prop(scene.viewlayer_generator_props, "skip_empty_layers")
+        row.operator("viewlayer.disable_empty_layers", text="", icon="HIDE_ON")
+        
+        # Modo light groups (substitui os view layers lgt.)
+        row = layout.row(align=True)
+        row.prop(scene.viewlayer_generator_props, "use_light_groups")
+        row.operator("viewlayer.setup_light_groups", text="", icon="LIGHT")
+        
+        # Backend de planejamento da visibilidade
+        row = layout.row(align=True)
+        row.prop(scene.viewlayer_generator_props, "planning_backend", text="")
+        row.operator("viewlayer.verify_visibility_plan", text="", icon="CHECKMARK")
+        
+        # Lista de collections (estatísticas recalculadas fora do draw)
+        schedule_stats_refresh(context)
         layout.template_list(
             "VIEWLAYER_UL_collections", "", 
             scene, "collection_selection",
             scene, "active_collection_index", rows=5
         )
+        
+        # Detecção de view layers duplicados
+        row = layout.row(align=True)
+        row.operator("viewlayer.find_duplicates", text="Detectar Duplicados", icon="DUPLICATE")
+        row.operator("viewlayer.find_duplicates", text="", icon="HIDE_ON").disable_duplicates = True
+        
+        # View layers gerados órfãos
+        row = layout.row(align=True)
+        row.operator("viewlayer.prune_layers", text="Limpar Órfãos", icon="TRASH")
+        row.operator("viewlayer.prune_layers", text="", icon="VIEWZOOM").dry_run = True
+        row.prop(scene.viewlayer_generator_props, "prune_orphaned_layers", text="", icon="AUTO")
 
 
 # Subpainel de Passes (Etapa 2)
@@ -737,6 +2129,17 @@ class VIEWLAYER_PT_passes_panel(Panel):
         # Botão de execução desta etapa
         box = layout.box()
         box.operator("viewlayer.apply_passes", text="Aplicar Passes Selecionados", icon="RENDERLAYERS")
+        box.prop(props, "only_consumed_passes")
+        if props.only_consumed_passes:
+            box.prop(props, "consumed_allow_list")
+        row = box.row(align=True)
+        row.prop(props, "use_crypto_policy")
+        row.operator("viewlayer.apply_crypto_policy", text="", icon="MATERIAL")
+        row = box.row(align=True)
+        row.prop(props, "use_pass_indices")
+        row.prop(props, "pass_index_mode", text="")
+        row.operator("viewlayer.assign_pass_indices", text="", icon="LINENUMBERS_ON")
+        box.operator("viewlayer.benchmark_pass_writes", text="Benchmark de Escrita", icon="TIME")
         
         # Categorias
         row = layout.row()
@@ -788,6 +2191,8 @@ class VIEWLAYER_PT_aovs_panel(Panel):
         row = layout.row()
         row.operator("viewlayer.detect_aovs", text="Detectar AOVs", icon="VIEWZOOM")
         row.operator("viewlayer.apply_aovs", text="Aplicar AOVs", icon="MATERIAL")
+        if background_tasks.is_running(f"detect_aovs:{scene.name}"):
+            layout.label(text="Detectando AOVs em segundo plano...", icon="SORTTIME")
         
         # Removi a seção de presets que estava aqui, pois já existe na seção de passes
         
@@ -806,6 +2211,197 @@ class VIEWLAYER_PT_aovs_panel(Panel):
             layout.label(text="Nenhum AOV detectado. Clique em 'Detectar AOVs' para buscar")
 
 
+# Subpainel de Nós de Saída do Compositor
+class VIEWLAYER_PT_output_nodes_panel(Panel):
+    bl_label = "Nós de Saída"
+    bl_idname = "VIEWLAYER_PT_output_nodes_panel"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "View Layer Generator"
+    bl_parent_id = "VIEWLAYER_PT_panel"
+    bl_options = {"DEFAULT_CLOSED"}
+    
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.viewlayer_generator_props
+        
+        layout.prop(props, "use_output_nodes")
+        layout.prop(props, "output_base_path")
+        layout.operator("viewlayer.sync_output_nodes", text="Sincronizar Nós de Saída", icon="NODE_COMPOSITING")
+        
+        # Manifesto para as ferramentas de composição
+        row = layout.row(align=True)
+        row.prop(props, "write_layer_manifest")
+        row.operator("viewlayer.write_layer_manifest", text="", icon="TEXT")
+
+
+# Subpainel de Jobs de Renderização
+class VIEWLAYER_PT_render_jobs_panel(Panel):
+    bl_label = "Jobs de Renderização"
+    bl_idname = "VIEWLAYER_PT_render_jobs_panel"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "View Layer Generator"
+    bl_parent_id = "VIEWLAYER_PT_panel"
+    bl_options = {"DEFAULT_CLOSED"}
+    
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.viewlayer_generator_props
+        
+        col = layout.column(align=True)
+        col.prop(props, "render_jobs_layers_per_job")
+        col.prop(props, "render_jobs_chunk_size")
+        col.prop(props, "render_jobs_concurrency")
+        layout.prop(props, "render_jobs_output")
+        
+        row = layout.row(align=True)
+        row.operator("viewlayer.export_render_jobs", text="Exportar Jobs", icon="EXPORT")
+        row.operator("viewlayer.run_render_jobs", text="Renderizar", icon="RENDER_ANIMATION")
+        
+        thread = _render_jobs_state["thread"]
+        if thread is not None and thread.is_alive():
+            layout.label(text=f"Executando: {len(_render_jobs_state['results'])}/{_render_jobs_state['total']} jobs",
+                         icon="SORTTIME")
+
+
+# Subpainel de Verificação da Cena
+class VIEWLAYER_PT_lint_panel(Panel):
+    bl_label = "Verificação da Cena"
+    bl_idname = "VIEWLAYER_PT_lint_panel"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "View Layer Generator"
+    bl_parent_id = "VIEWLAYER_PT_panel"
+    bl_options = {"DEFAULT_CLOSED"}
+    
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.viewlayer_generator_props
+        
+        layout.operator("viewlayer.lint_scene", text="Verificar Convenções", icon="VIEWZOOM")
+        if background_tasks.is_running(f"lint:{context.scene.name}"):
+            layout.label(text="Verificando em segundo plano...", icon="SORTTIME")
+        
+        if len(props.lint_issues) == 0:
+            layout.label(text="Nenhum problema encontrado")
+            return
+        
+        box = layout.box()
+        for item in props.lint_issues:
+            row = box.row()
+            row.label(text=item.name, icon="ERROR" if item.severity == "ERROR" else "INFO")
+            row.label(text=item.code)
+            box.label(text=f"    {item.message}")
+
+
+# Subpainel de Geometria por ViewLayer
+class VIEWLAYER_PT_footprint_panel(Panel):
+    bl_label = "Geometria por ViewLayer"
+    bl_idname = "VIEWLAYER_PT_footprint_panel"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "View Layer Generator"
+    bl_parent_id = "VIEWLAYER_PT_panel"
+    bl_options = {"DEFAULT_CLOSED"}
+    
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.viewlayer_generator_props
+        
+        layout.operator("viewlayer.estimate_footprint", text="Estimar Geometria", icon="MESH_DATA")
+        
+        if len(props.footprint_items) == 0:
+            layout.label(text="Nenhuma estimativa calculada")
+            return
+        
+        box = layout.box()
+        for item in props.footprint_items:
+            row = box.row()
+            row.label(text=item.name, icon="ERROR" if item.heavy else "RENDERLAYERS")
+            row.label(text=f"{item.objects} obj")
+            row.label(text=f"{int(item.faces):,} faces")
+            row.label(text=f"{item.instances} inst")
+            if item.heavy and item.dominant:
+                box.label(text=f"    Dominado por: {item.dominant}")
+
+
+# Subpainel de Telemetria de Renderização
+class VIEWLAYER_PT_telemetry_panel(Panel):
+    bl_label = "Telemetria de Renderização"
+    bl_idname = "VIEWLAYER_PT_telemetry_panel"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "View Layer Generator"
+    bl_parent_id = "VIEWLAYER_PT_panel"
+    bl_options = {"DEFAULT_CLOSED"}
+    
+    # Quantidade de ViewLayers exibidos em cada ranking
+    max_rows = 5
+    
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.viewlayer_generator_props
+        
+        layout.operator("viewlayer.load_render_telemetry", text="Carregar Telemetria", icon="TIME")
+        
+        if len(props.telemetry_items) == 0:
+            layout.label(text="Nenhuma telemetria carregada")
+            return
+        
+        # Ranking dos ViewLayers mais lentos
+        box = layout.box()
+        box.label(text="Mais lentos (média por frame):", icon="SORTTIME")
+        for item in sorted(props.telemetry_items, key=lambda i: i.avg_seconds, reverse=True)[:self.max_rows]:
+            row = box.row()
+            row.label(text=item.name)
+            row.label(text=f"{item.avg_seconds:.1f}s (máx. {item.max_seconds:.1f}s)")
+        
+        # Ranking dos ViewLayers com mais memória
+        box = layout.box()
+        box.label(text="Maior pico de memória:", icon="MEMORY")
+        for item in sorted(props.telemetry_items, key=lambda i: i.peak_mem_mb, reverse=True)[:self.max_rows]:
+            row = box.row()
+            row.label(text=item.name)
+            row.label(text=f"{item.peak_mem_mb:.0f} MB")
+
+
+# Subpainel de Estimativa de Saída
+class VIEWLAYER_PT_estimate_panel(Panel):
+    bl_label = "Estimativa de Saída"
+    bl_idname = "VIEWLAYER_PT_estimate_panel"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "View Layer Generator"
+    bl_parent_id = "VIEWLAYER_PT_panel"
+    bl_options = {"DEFAULT_CLOSED"}
+    
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.viewlayer_generator_props
+        
+        layout.operator("viewlayer.estimate_output", text="Estimar Saída", icon="DISK_DRIVE")
+        
+        if len(props.layer_estimates) == 0:
+            layout.label(text="Nenhuma estimativa calculada")
+            return
+        
+        box = layout.box()
+        row = box.row()
+        row.label(text="ViewLayer")
+        row.label(text="Canais")
+        row.label(text="Frame")
+        row.label(text="Sequência")
+        row.label(text="Memória")
+        for item in props.layer_estimates:
+            row = box.row()
+            row.label(text=item.name)
+            row.label(text=str(item.channels))
+            row.label(text=item.frame_size)
+            row.label(text=item.sequence_size)
+            row.label(text=item.buffer_size)
+
+
 # ==========================
 # Registro
 # ==========================
@@ -819,6 +2415,7 @@ classes = (
     
     # Operadores principais
     VIEWLAYER_OT_generate_all,
+    VIEWLAYER_OT_generate_all_modal,
     VIEWLAYER_OT_generate_layers,
     VIEWLAYER_OT_apply_passes,
     VIEWLAYER_OT_apply_aovs,
@@ -829,6 +2426,22 @@ classes = (
     VIEWLAYER_OT_detect_aovs,
     VIEWLAYER_OT_activate_lighting,
     VIEWLAYER_OT_activate_holdout,
+    VIEWLAYER_OT_estimate_output,
+    VIEWLAYER_OT_apply_crypto_policy,
+    VIEWLAYER_OT_sync_output_nodes,
+    VIEWLAYER_OT_find_duplicates,
+    VIEWLAYER_OT_prune_layers,
+    VIEWLAYER_OT_load_render_telemetry,
+    VIEWLAYER_OT_export_render_jobs,
+    VIEWLAYER_OT_run_render_jobs,
+    VIEWLAYER_OT_estimate_footprint,
+    VIEWLAYER_OT_verify_visibility_plan,
+    VIEWLAYER_OT_benchmark_pass_writes,
+    VIEWLAYER_OT_setup_light_groups,
+    VIEWLAYER_OT_disable_empty_layers,
+    VIEWLAYER_OT_lint_scene,
+    VIEWLAYER_OT_assign_pass_indices,
+    VIEWLAYER_OT_write_layer_manifest,
     
     # Adicionar os operadores de preferências aqui
     VIEWLAYER_OT_load_passes_prefs,
@@ -838,12 +2451,16 @@ classes = (
     VIEWLAYER_PT_collections_panel,
     VIEWLAYER_PT_passes_panel,
     VIEWLAYER_PT_aovs_panel,
+    VIEWLAYER_PT_output_nodes_panel,
+    VIEWLAYER_PT_estimate_panel,
+    VIEWLAYER_PT_lint_panel,
+    VIEWLAYER_PT_footprint_panel,
+    VIEWLAYER_PT_render_jobs_panel,
+    VIEWLAYER_PT_telemetry_panel,
 )
 
 def register():
-    # Imprimir informações de diagnóstico
-    print(f"Registrando addon: {__name__}")
-    print(f"Módulos carregados: {list(sys.modules.keys())}")
+    start = time.perf_counter()
     
     # Registrar propriedades primeiro
     register_properties()
@@ -858,55 +2475,158 @@ def register():
     # Registrar preferências por último
     register_preferences(__name__)
     
-    # Inicializar preferências com tratamento de erro
-    try:
-        # Listar todos os addons disponíveis para diagnóstico
-        print("Addons disponíveis:")
-        for addon_name in bpy.context.preferences.addons.keys():
-            print(f"  - {addon_name}")
-            
-        # Inicializar preferências usando o método alternativo
-        for addon_name in bpy.context.preferences.addons.keys():
-            preferences = bpy.context.preferences.addons[addon_name].preferences
-            if hasattr(preferences, "cycles_passes"):
-                print(f"Inicializando preferências para addon: {addon_name}")
-                
-                # Inicializar passes predefinidos
-                if len(preferences.cycles_passes) == 0:
-                    initialize_default_passes(preferences.cycles_passes, "CYCLES")
-                
-                if len(preferences.eevee_passes) == 0:
-                    initialize_default_passes(preferences.eevee_passes, "BLENDER_EEVEE")
-                    
-                break
-    except Exception as e:
-        print(f"Erro ao inicializar preferências: {str(e)}")
-        import traceback
-        traceback.print_exc()
-    
-    # Registrar manipulador de eventos
+    # Telemetria precisa estar ativa também em renderizações em background,
+    # então apenas lê a preferência (consulta direta, sem varrer os addons)
+    preferences = find_addon_preferences(bpy.context)
+    if preferences is not None and getattr(preferences, "use_render_telemetry", False):
+        render_telemetry.enable_telemetry()
+    
+    # Registrar manipuladores de eventos (nenhum deles varre ou altera a cena na inicialização)
     bpy.app.handlers.depsgraph_update_post.append(update_passes_on_render_change)
+    bpy.app.handlers.depsgraph_update_post.append(update_layer_stats)
+    bpy.app.handlers.load_post.append(on_load_post)
+    bpy.app.handlers.undo_post.append(on_undo_redo)
+    bpy.app.handlers.redo_post.append(on_undo_redo)
+    
+    startup_stats["register_ms"] = (time.perf_counter() - start) * 1000.0
+    if bpy.app.debug:
+        print(f"{__name__}: registrado em {startup_stats['register_ms']:.2f} ms")
+
+
+# ==========================
+# Inicialização sob Demanda
+# ==========================
+# Cenas já inicializadas nesta sessão (passes e preset carregados)
+_initialized_scenes = set()
+_init_scheduled = False
+
+def get_scene_key(scene):
+    """Retornar um identificador estável da cena na sessão."""
+    return getattr(scene, "session_uid", scene.name)
+
+def is_initialized(scene):
+    """Verificar se a cena já passou pela inicialização sob demanda."""
+    return get_scene_key(scene) in _initialized_scenes
+
+def ensure_initialized(context):
+    """Inicializar preferências e a lista de passes da cena na primeira utilização.
+    
+    Chamado pelos operadores principais e, via timer, no primeiro desenho do
+    painel. Não faz nada se a cena já foi inicializada.
+    """
+    global last_render_engine
+    scene = context.scene
+    if scene is None or is_initialized(scene):
+        return
+    
+    start = time.perf_counter()
+    _initialized_scenes.add(get_scene_key(scene))
+    
+    preferences = find_addon_preferences(context)
+    if preferences is not None:
+        ensure_default_preferences(preferences)
+    
+    # Arquivos salvos antes do vlg_uid guardam apenas o nome (ou o ponteiro anterior)
+    migrate_collection_selection(scene)
+    # View layers gerados antes do vlg_uid guardam um ponteiro para a collection de origem
+    generated_layers.migrate_viewlayer_sources(scene)
     
-    # Aplicar automaticamente o preset de passes
-    def apply_preset_callback():
+    # Preencher a lista de passes e aplicar o preset do motor atual
+    if len(scene.viewlayer_generator_props.selected_passes) == 0:
         try:
-            # Executar apenas uma vez após o carregamento completo da UI
             bpy.ops.viewlayer.refresh_passes()
-            engine = bpy.context.scene.render.engine.lower().replace('blender_', '')
+            engine = scene.render.engine.lower().replace('blender_', '')
             bpy.ops.viewlayer.load_passes_prefs(engine=engine)
-            print("Preset de passes aplicado automaticamente")
         except Exception as e:
             print(f"Erro ao aplicar preset automático: {str(e)}")
-        return None  # Não repetir o timer
+    last_render_engine = scene.render.engine
+    
+    startup_stats["init_ms"] = (time.perf_counter() - start) * 1000.0
+
+def _deferred_initialize():
+    """Timer disparado pelo primeiro desenho do painel (draw não pode alterar dados)."""
+    global _init_scheduled
+    _init_scheduled = False
+    ensure_initialized(bpy.context)
+    return None  # Não repetir o timer
+
+def schedule_initialization(context):
+    """Agendar a inicialização sob demanda a partir de um draw()."""
+    global _init_scheduled
+    if _init_scheduled or context.scene is None or is_initialized(context.scene):
+        return
+    _init_scheduled = True
+    bpy.app.timers.register(_deferred_initialize, first_interval=0.0)
+
+@persistent
+def on_load_post(*args):
+    """Ao abrir um arquivo, apenas descartar o estado da sessão anterior."""
+    global last_render_engine
+    _initialized_scenes.clear()
+    hierarchy.clear_layer_visibility()
+    layer_stats.mark_all_dirty()
+    collection_refs.invalidate()
+    last_render_engine = None
+
+@persistent
+def on_undo_redo(*args):
+    """Após undo/redo, descartar os caches que guardam nomes de collections e view layers.
     
-    # Registrar o timer para executar em 0.5 segundos
-    bpy.app.timers.register(apply_preset_callback, first_interval=0.5)
+    O undo pode restaurar collections removidas ou desfazer renomeações sem
+    passar pelos operadores do addon.
+    """
+    collection_refs.invalidate()
+    hierarchy.clear_layer_visibility()
+    # Estatísticas por ponteiro: o undo recria os dados e os ponteiros mudam
+    layer_stats.mark_all_dirty()
+
+
+# ==========================
+# Estatísticas dos Painéis
+# ==========================
+# Intervalo do timer que agrupa várias atualizações do depsgraph em um único recálculo
+STATS_REFRESH_DELAY = 0.25
+_stats_refresh_scheduled = False
+
+def _refresh_layer_stats():
+    """Timer: recalcular as estatísticas sujas e redesenhar a barra lateral."""
+    global _stats_refresh_scheduled
+    _stats_refresh_scheduled = False
+    scene = bpy.context.scene
+    if scene is not None and layer_stats.refresh(scene, bpy.data.collections):
+        tag_sidebar_redraw(bpy.context)
+    return None  # Não repetir o timer
+
+def schedule_stats_refresh(context):
+    """Agendar o recálculo das estatísticas (chamado pelo draw e pelo depsgraph)."""
+    global _stats_refresh_scheduled
+    if _stats_refresh_scheduled or context.scene is None or not layer_stats.is_dirty(context.scene):
+        return
+    _stats_refresh_scheduled = True
+    bpy.app.timers.register(_refresh_layer_stats, first_interval=STATS_REFRESH_DELAY)
+
+@persistent
+def update_layer_stats(scene, depsgraph=None):
+    """Invalidar a visibilidade e as estatísticas das collections e cenas atualizadas."""
+    if depsgraph is None:
+        return
+    # Edições manuais no outliner mudam a visibilidade registrada na geração
+    hierarchy.invalidate_from_depsgraph(depsgraph)
+    renderable.invalidate_from_depsgraph(depsgraph)
+    if not is_initialized(scene):
+        return
+    if layer_stats.invalidate_from_depsgraph(depsgraph):
+        schedule_stats_refresh(bpy.context)
 
 
 # Manipulador de eventos para atualizar passes quando o motor de renderização muda
 last_render_engine = None
+@persistent
 def update_passes_on_render_change(scene):
     global last_render_engine
+    # Cenas ainda não inicializadas ficam intocadas até o primeiro uso
+    if not is_initialized(scene):
+        return
     if scene.render.engine != last_render_engine:
         last_render_engine = scene.render.engine
         # Atualizar passes disponíveis baseados no novo motor
@@ -927,6 +2647,22 @@ def unregister():
         bpy.app.handlers.depsgraph_update_post.remove(update_passes_on_render_change)
     except ValueError:
         print("Manipulador de eventos não encontrado ou já removido")
+    if update_layer_stats in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(update_layer_stats)
+    if bpy.app.timers.is_registered(_refresh_layer_stats):
+        bpy.app.timers.unregister(_refresh_layer_stats)
+    if on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(on_load_post)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if on_undo_redo in handlers:
+            handlers.remove(on_undo_redo)
+    if bpy.app.timers.is_registered(_deferred_initialize):
+        bpy.app.timers.unregister(_deferred_initialize)
+    _initialized_scenes.clear()
+    background_tasks.shutdown()
+    
+    # Remover handlers de telemetria
+    render_telemetry.disable_telemetry()
     
     # Limpar propriedades da cena
     try:
@@ -0,0 +1,73 @@
+# ==========================
+# Interface de Linha de Comando (blender -b)
+# ==========================
+#
+# Uso (o nome do módulo é o nome da pasta do addon instalado):
+#
+#   blender -b shot.blend --python-expr "import viewlayer_generator.cli as c; c.main()" -- lint
+#   blender -b shot.blend -S Shot --python-expr "import viewlayer_generator.cli as c; c.main()" -- generate --lint --save
+#   blender -b shot.blend --python-expr "import viewlayer_generator.cli as c; c.main()" -- prune --dry-run
+#
+# A cena é escolhida com o -S do próprio Blender (padrão: cena ativa do arquivo).
+# O código de saída é 1 quando a verificação encontra erros (útil como gate no farm).
+
+import argparse
+import sys
+
+import bpy
+
+from .utils import linter
+
+
+def get_cli_args(argv=None):
+    """Ler os argumentos após ``--`` na linha de comando do Blender."""
+    argv = sys.argv if argv is None else argv
+    argv = argv[argv.index("--") + 1:] if "--" in argv else []
+
+    parser = argparse.ArgumentParser(prog="viewlayer-generator")
+    parser.add_argument("command", choices=("lint", "generate", "prune"), help="Etapa a executar")
+    parser.add_argument("--lint", action="store_true", help="Verificar convenções antes de gerar")
+    parser.add_argument("--save", action="store_true", help="Salvar o .blend após gerar ou limpar")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas listar os view layers órfãos")
+    parser.add_argument("--remove", action="store_true", help="Remover os view layers órfãos em vez de desativar")
+    return parser.parse_args(argv)
+
+
+def run_lint(scene):
+    """Executar a verificação de convenções e imprimir os problemas. Retorna o total de erros."""
+    from . import run_scene_lint
+
+    bpy.ops.viewlayer.refresh_collections()
+    issues = run_scene_lint(scene)
+    for issue in issues:
+        print(f"[{issue['severity']}] {issue['code']}: {issue['message']}")
+    errors = linter.count_errors(issues)
+    print(f"Verificação da cena '{scene.name}': {len(issues)} problemas, {errors} erros")
+    return errors
+
+
+def main(argv=None):
+    """Ponto de entrada da linha de comando."""
+    args = get_cli_args(argv)
+    scene = bpy.context.scene
+
+    if args.command == "lint":
+        sys.exit(1 if run_lint(scene) else 0)
+
+    if args.command == "generate":
+        if args.lint and run_lint(scene):
+            print("Geração cancelada pela verificação da cena")
+            sys.exit(1)
+        result = bpy.ops.viewlayer.generate_all()
+        if "FINISHED" not in result:
+            print("Geração cancelada")
+            sys.exit(1)
+        if args.save:
+            bpy.ops.wm.save_mainfile()
+        print(f"ViewLayers gerados na cena '{scene.name}'")
+
+    if args.command == "prune":
+        bpy.ops.viewlayer.refresh_collections()
+        bpy.ops.viewlayer.prune_layers(dry_run=args.dry_run, remove=args.remove)
+        if args.save and not args.dry_run:
+            bpy.ops.wm.save_mainfile()
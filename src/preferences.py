@@ -1,13 +1,26 @@
 import bpy
 import os
 from bpy.types import AddonPreferences, Operator
-from bpy.props import StringProperty, CollectionProperty, BoolProperty
+from bpy.props import StringProperty, CollectionProperty, BoolProperty, IntProperty, FloatProperty
 
 # Importação das propriedades
-from .properties import PassItem
+from .properties import PassItem, CryptoPolicyItem, OutputRuleItem, RenderBudgetItem, IndirectPolicyItem
 from .utils import passes_data
 
 
+# Medições de inicialização do addon (preenchidas no register)
+startup_stats = {"register_ms": 0.0, "init_ms": 0.0}
+
+
+def update_render_telemetry(self, context):
+    """Registrar ou remover os handlers de telemetria conforme a preferência."""
+    from .utils import render_telemetry
+    if self.use_render_telemetry:
+        render_telemetry.enable_telemetry()
+    else:
+        render_telemetry.disable_telemetry()
+
+
 class ViewLayerGeneratorPreferences(AddonPreferences):
     bl_idname = __package__  # Use package name directly
     
@@ -30,6 +43,64 @@ class ViewLayerGeneratorPreferences(AddonPreferences):
         description="Expandir seção de configurações do Eevee"
     )
     
+    # Políticas de Cryptomatte por tipo de view layer
+    crypto_policies: CollectionProperty(type=CryptoPolicyItem)
+    
+    # Orçamentos de renderização por tipo de view layer
+    render_budgets: CollectionProperty(type=RenderBudgetItem)
+    
+    # Tratamento das collections .ind por tipo de view layer
+    indirect_policies: CollectionProperty(type=IndirectPolicyItem)
+    
+    # Regras de codec EXR por categoria de passe
+    output_codec_rules: CollectionProperty(type=OutputRuleItem)
+    
+    # Telemetria de renderização
+    use_render_telemetry: BoolProperty(
+        name="Telemetria de Renderização",
+        default=False,
+        description="Registrar tempo e memória de pico por view layer e frame em um log JSON-lines ao lado do .blend",
+        update=update_render_telemetry
+    )
+    
+    # Limites de orçamento de saída (0 desativa o limite)
+    budget_channels: IntProperty(
+        name="Canais por ViewLayer",
+        default=0,
+        min=0,
+        description="Máximo de canais gravados por view layer (0 = sem limite)"
+    )
+    
+    budget_frame_mb: FloatProperty(
+        name="MB por Frame",
+        default=0.0,
+        min=0.0,
+        description="Tamanho máximo estimado por frame de cada view layer em MB (0 = sem limite)"
+    )
+    
+    budget_sequence_gb: FloatProperty(
+        name="GB por Sequência",
+        default=0.0,
+        min=0.0,
+        description="Tamanho máximo estimado da sequência completa em GB (0 = sem limite)"
+    )
+    
+    budget_memory_mb: FloatProperty(
+        name="MB de Memória",
+        default=0.0,
+        min=0.0,
+        description="Memória máxima do buffer de renderização por view layer em MB (0 = sem limite)"
+    )
+    
+    def get_budgets(self):
+        """Retornar os limites de orçamento como dicionário."""
+        return {
+            "channels": self.budget_channels,
+            "frame_mb": self.budget_frame_mb,
+            "sequence_gb": self.budget_sequence_gb,
+            "memory_mb": self.budget_memory_mb,
+        }
+    
     def draw(self, context):
         layout = self.layout
         
@@ -124,6 +195,71 @@ class ViewLayerGeneratorPreferences(AddonPreferences):
             for pass_item in self.eevee_passes:
                 if pass_item.category == "Crypto Matte":
                     col.prop(pass_item, "selected", text=passes_data.get_friendly_name(pass_item.name))
+        
+        layout.separator()
+        
+        # Seção de políticas de Cryptomatte
+        crypto_policy_box = layout.box()
+        crypto_policy_box.label(text="Políticas de Cryptomatte por Tipo de ViewLayer", icon="MATERIAL")
+        for policy in self.crypto_policies:
+            row = crypto_policy_box.row(align=True)
+            row.label(text=policy.kind.title())
+            row.prop(policy, "use_object", toggle=True)
+            row.prop(policy, "use_material", toggle=True)
+            row.prop(policy, "use_asset", toggle=True)
+            row.prop(policy, "levels")
+        
+        layout.separator()
+        
+        # Seção de orçamentos de renderização
+        budgets_box = layout.box()
+        budgets_box.label(text="Orçamentos de Renderização por Tipo de ViewLayer", icon="RENDER_STILL")
+        for budget in self.render_budgets:
+            row = budgets_box.row(align=True)
+            row.label(text=budget.kind.title())
+            row.prop(budget, "sample_fraction")
+            row.prop(budget, "denoise", toggle=True)
+            row.prop(budget, "denoising_data", toggle=True)
+        
+        layout.separator()
+        
+        # Seção de collections indirect only (.ind)
+        indirect_box = layout.box()
+        indirect_box.label(text="Collections .ind por Tipo de ViewLayer", icon="LIGHT_SUN")
+        for policy in self.indirect_policies:
+            row = indirect_box.row(align=True)
+            row.label(text=policy.kind.title())
+            row.prop(policy, "mode", expand=True)
+        
+        layout.separator()
+        
+        # Seção de regras de codec dos nós File Output
+        codec_box = layout.box()
+        codec_box.label(text="Codecs EXR dos Nós File Output", icon="NODE_COMPOSITING")
+        for rule in self.output_codec_rules:
+            row = codec_box.row(align=True)
+            row.label(text=rule.category)
+            row.prop(rule, "codec", text="")
+            row.prop(rule, "color_depth", text="")
+        
+        layout.separator()
+        
+        # Seção de telemetria
+        telemetry_box = layout.box()
+        telemetry_box.prop(self, "use_render_telemetry", icon="TIME")
+        telemetry_box.label(text=f"Registro do addon: {startup_stats['register_ms']:.2f} ms, "
+                                 f"inicialização sob demanda: {startup_stats['init_ms']:.2f} ms")
+        
+        layout.separator()
+        
+        # Seção de orçamento de saída
+        budget_box = layout.box()
+        budget_box.label(text="Orçamento de Saída (0 = sem limite)", icon="DISK_DRIVE")
+        col = budget_box.column(align=True)
+        col.prop(self, "budget_channels")
+        col.prop(self, "budget_frame_mb")
+        col.prop(self, "budget_sequence_gb")
+        col.prop(self, "budget_memory_mb")
 
 
 # Novo operador para resetar as preferências
@@ -210,6 +346,7 @@ class VIEWLAYER_OT_load_passes_prefs(Operator):
                 self.report({"ERROR"}, "Não foi possível encontrar as preferências do addon")
                 return {"CANCELLED"}
             
+            ensure_default_preferences(preferences)
             props = context.scene.viewlayer_generator_props
             
             # Obter coleção de preferências
@@ -259,7 +396,6 @@ def register_preferences(bl_id):
     
     # Extrair o nome base do addon, sem subpacotes
     _addon_name = bl_id.split('.')[0]
-    print(f"Registrando preferências com nome de addon: {_addon_name}")
     
     # Atualizar o bl_idname dinamicamente
     ViewLayerGeneratorPreferences.bl_idname = _addon_name
@@ -297,6 +433,41 @@ def initialize_default_passes(collection, engine_name):
         print(f"Erro ao inicializar passes padrão: {str(e)}")
 
 
+def find_addon_preferences(context):
+    """Obter as preferências do addon pelo nome registrado ou procurando entre os addons."""
+    if _addon_name and _addon_name in context.preferences.addons:
+        return context.preferences.addons[_addon_name].preferences
+    
+    for addon_name in context.preferences.addons.keys():
+        preferences = context.preferences.addons[addon_name].preferences
+        if hasattr(preferences, "cycles_passes"):
+            return preferences
+    return None
+
+
+def ensure_default_preferences(preferences):
+    """Preencher as coleções das preferências com os valores padrão se estiverem vazias."""
+    from .utils import crypto_policy, output_nodes, render_budgets, indirect_only
+    
+    if len(preferences.cycles_passes) == 0:
+        initialize_default_passes(preferences.cycles_passes, "CYCLES")
+    
+    if len(preferences.eevee_passes) == 0:
+        initialize_default_passes(preferences.eevee_passes, "BLENDER_EEVEE")
+    
+    if len(preferences.crypto_policies) == 0:
+        crypto_policy.initialize_default_crypto_policies(preferences.crypto_policies)
+    
+    if len(preferences.output_codec_rules) == 0:
+        output_nodes.initialize_default_codec_rules(preferences.output_codec_rules)
+    
+    if len(preferences.render_budgets) == 0:
+        render_budgets.initialize_default_render_budgets(preferences.render_budgets)
+    
+    if len(preferences.indirect_policies) == 0:
+        indirect_only.initialize_default_indirect_policies(preferences.indirect_policies)
+
+
 # Simple helper function
 def get_preferences():
     return bpy.context.preferences.addons[__package__].preferences
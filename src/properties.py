@@ -1,12 +1,18 @@
 import bpy
 from bpy.types import PropertyGroup
-from bpy.props import StringProperty, BoolProperty, IntProperty, CollectionProperty
+from bpy.props import StringProperty, BoolProperty, IntProperty, FloatProperty, EnumProperty, CollectionProperty
+
+from .utils.layer_kinds import LAYER_KIND_ITEMS
+from .utils.output_nodes import OUTPUT_CATEGORY_ITEMS, EXR_CODEC_ITEMS, EXR_DEPTH_ITEMS
+from .utils.indirect_only import INDIRECT_MODE_ITEMS
+from .utils.pass_indices import PASS_INDEX_MODE_ITEMS
 
 
 class CollectionItem(PropertyGroup):
     """Item representando uma collection na lista."""
-    name: StringProperty()  # Nome da collection
+    name: StringProperty()  # Nome da collection (exibição; a referência é o uid)
     selected: BoolProperty(default=False)  # Se está selecionada
+    uid: StringProperty()  # Identificador da collection (vlg_uid): segue renomeações sem contar como usuário
 
 
 class PassItem(PropertyGroup):
@@ -17,21 +23,217 @@ class PassItem(PropertyGroup):
     type: StringProperty(default="COLOR")  # Tipo de dado: "COLOR" ou "VALUE" (para AOVs)
 
 
+class CryptoPolicyItem(PropertyGroup):
+    """Política de Cryptomatte para um tipo de view layer."""
+    name: StringProperty()  # Identificador do tipo (igual a kind)
+    kind: EnumProperty(items=LAYER_KIND_ITEMS, name="Tipo")  # Tipo de view layer
+    use_object: BoolProperty(default=False, name="Object")  # Ativar Cryptomatte Object
+    use_material: BoolProperty(default=False, name="Material")  # Ativar Cryptomatte Material
+    use_asset: BoolProperty(default=False, name="Asset")  # Ativar Cryptomatte Asset
+    levels: IntProperty(default=6, min=2, max=16, name="Níveis")  # pass_cryptomatte_depth
+
+
+class RenderBudgetItem(PropertyGroup):
+    """Orçamento de amostras e denoising para um tipo de view layer."""
+    name: StringProperty()  # Identificador do tipo (igual a kind)
+    kind: EnumProperty(items=LAYER_KIND_ITEMS, name="Tipo")  # Tipo de view layer
+    sample_fraction: FloatProperty(default=1.0, min=0.0, max=1.0, name="Amostras", subtype="FACTOR")  # Fração das amostras da cena
+    denoise: BoolProperty(default=True, name="Denoise")  # Denoise do view layer (Cycles)
+    denoising_data: BoolProperty(default=False, name="Dados de Denoising")  # Gravar passes de denoising
+
+
+class IndirectPolicyItem(PropertyGroup):
+    """Tratamento das collections .ind em um tipo de view layer."""
+    name: StringProperty()  # Identificador do tipo (igual a kind)
+    kind: EnumProperty(items=LAYER_KIND_ITEMS, name="Tipo")  # Tipo de view layer
+    mode: EnumProperty(items=INDIRECT_MODE_ITEMS, name="Modo", default="INDIRECT")  # Indireta, visível ou excluída
+
+
+class OutputRuleItem(PropertyGroup):
+    """Regra de codec EXR para uma categoria de passe nos nós File Output."""
+    name: StringProperty()  # Identificador da categoria (igual a category)
+    category: EnumProperty(items=OUTPUT_CATEGORY_ITEMS, name="Categoria")  # Categoria de passe
+    codec: EnumProperty(items=EXR_CODEC_ITEMS, name="Codec", default="ZIP")  # Codec EXR
+    color_depth: EnumProperty(items=EXR_DEPTH_ITEMS, name="Float", default="16")  # Half ou full float
+
+
+class LayerEstimateItem(PropertyGroup):
+    """Estimativa de saída e memória de um view layer."""
+    name: StringProperty()  # Nome do view layer (ou "Total")
+    channels: IntProperty(default=0)  # Canais gravados por frame
+    frame_size: StringProperty()  # Tamanho estimado por frame
+    sequence_size: StringProperty()  # Tamanho estimado da sequência
+    buffer_size: StringProperty()  # Memória estimada do buffer de renderização
+
+
+class TelemetryItem(PropertyGroup):
+    """Resumo da telemetria de renderização de um view layer."""
+    name: StringProperty()  # Nome do view layer
+    frames: IntProperty(default=0)  # Frames registrados
+    avg_seconds: FloatProperty(default=0.0)  # Tempo médio por frame
+    max_seconds: FloatProperty(default=0.0)  # Tempo máximo por frame
+    peak_mem_mb: FloatProperty(default=0.0)  # Maior pico de memória reportado
+
+
+class FootprintItem(PropertyGroup):
+    """Estimativa de geometria de um view layer."""
+    name: StringProperty()  # Nome do view layer
+    objects: IntProperty(default=0)  # Objetos únicos incluídos
+    verts: StringProperty(default="0")  # Vértices avaliados (texto: instâncias passam do limite de IntProperty/FloatProperty)
+    faces: StringProperty(default="0")  # Faces avaliadas (texto: instâncias passam do limite de IntProperty/FloatProperty)
+    instances: IntProperty(default=0)  # Objetos instanciados por collections
+    heavy: BoolProperty(default=False)  # Acima do fator em relação à mediana
+    dominant: StringProperty()  # Collections .all/lgt. que dominam o view layer
+
+
+class LintIssueItem(PropertyGroup):
+    """Problema encontrado pela verificação de convenções da cena."""
+    name: StringProperty()  # Nome da collection com problema
+    code: StringProperty()  # Identificador da verificação (ex.: HDT_ORPHAN)
+    severity: StringProperty(default="WARNING")  # "ERROR" ou "WARNING"
+    message: StringProperty()  # Descrição do problema
+
+
 class ViewLayerGeneratorProps(PropertyGroup):
     """Propriedades para o gerador de view layers."""
     selected_passes: CollectionProperty(type=PassItem)  # Passes selecionados
     active_pass_index: IntProperty(default=0)  # Índice do passe ativo na UI
+    layer_estimates: CollectionProperty(type=LayerEstimateItem)  # Última estimativa de saída
+    telemetry_items: CollectionProperty(type=TelemetryItem)  # Resumo da telemetria de renderização
+    footprint_items: CollectionProperty(type=FootprintItem)  # Última estimativa de geometria
+    lint_issues: CollectionProperty(type=LintIssueItem)  # Última verificação de convenções
     
     # Filtro de categoria
     show_data_passes: BoolProperty(default=True, name="Data") 
     show_light_passes: BoolProperty(default=True, name="Light")
     show_crypto_passes: BoolProperty(default=True, name="Crypto Matte")
+    
+    # Aplicar apenas passes consumidos pelo compositor
+    only_consumed_passes: BoolProperty(
+        default=False,
+        name="Apenas Passes Consumidos",
+        description="Desativar passes e AOVs que não estão ligados a nenhuma saída do compositor em cada view layer"
+    )
+    use_crypto_policy: BoolProperty(
+        default=False,
+        name="Usar Políticas de Cryptomatte",
+        description="Aplicar as políticas de Cryptomatte por tipo de view layer ao aplicar passes"
+    )
+    use_output_nodes: BoolProperty(
+        default=False,
+        name="Sincronizar Nós de Saída",
+        description="Criar e sincronizar nós Render Layers e File Output (EXR multilayer) ao gerar os view layers"
+    )
+    output_base_path: StringProperty(
+        default="//render/",
+        name="Pasta de Saída",
+        subtype="DIR_PATH",
+        description="Pasta base dos arquivos EXR gravados pelos nós File Output"
+    )
+    render_jobs_layers_per_job: IntProperty(
+        default=1,
+        min=1,
+        name="ViewLayers por Job",
+        description="Quantidade de view layers renderizados em cada processo"
+    )
+    render_jobs_chunk_size: IntProperty(
+        default=0,
+        min=0,
+        name="Frames por Job",
+        description="Tamanho do bloco de frames de cada job (0 = intervalo inteiro)"
+    )
+    render_jobs_concurrency: IntProperty(
+        default=2,
+        min=1,
+        name="Processos Simultâneos",
+        description="Número máximo de processos do Blender renderizando ao mesmo tempo"
+    )
+    render_jobs_output: StringProperty(
+        default="//render/{layer}/{layer}_####",
+        name="Saída dos Jobs",
+        description="Caminho de saída de cada job; {layer} é substituído pelo nome do view layer"
+    )
+    skip_empty_layers: BoolProperty(
+        default=False,
+        name="Desativar ViewLayers Vazios",
+        description="Após gerar, desativar view layers sem objetos renderizáveis visíveis para a câmera"
+    )
+    use_render_budgets: BoolProperty(
+        default=False,
+        name="Orçamentos por Tipo",
+        description="Aplicar amostras e denoising por tipo de view layer (regular, holdout, lgt., GP) ao gerar"
+    )
+    use_light_groups: BoolProperty(
+        default=False,
+        name="Modo Light Groups",
+        description="Criar um light group do Cycles por collection lgt.* nos view layers beauty em vez de view layers lgt. separados"
+    )
+    planning_backend: EnumProperty(
+        name="Backend de Planejamento",
+        items=[
+            ("RECURSIVE", "Python (Recursivo)", "Percorrer a árvore de collections recursivamente para cada view layer"),
+            ("NUMPY", "NumPy (Vetorizado)", "Calcular a matriz view layers × collections com NumPy (usa Python se indisponível)"),
+        ],
+        default="RECURSIVE"
+    )
+    use_pass_indices: BoolProperty(
+        default=False,
+        name="Atribuir Pass Indices",
+        description="Ao gerar, atribuir pass_index estáveis a objetos e materiais e gravar o manifesto índice → nome"
+    )
+    pass_index_mode: EnumProperty(
+        name="Pass Index",
+        items=PASS_INDEX_MODE_ITEMS,
+        default="BOTH"
+    )
+    generation_cancel_policy: EnumProperty(
+        name="Ao Cancelar",
+        items=[
+            ("ROLLBACK", "Desfazer Tudo", "Remover os view layers criados e restaurar os existentes"),
+            ("KEEP", "Manter Concluídos", "Manter os view layers já processados, sem aplicar passes e AOVs"),
+        ],
+        default="ROLLBACK"
+    )
+    write_layer_manifest: BoolProperty(
+        default=False,
+        name="Gravar Manifesto",
+        description="Ao gerar, gravar um JSON ao lado do .blend com passes, AOVs, Cryptomatte, saídas e origens de cada view layer"
+    )
+    prune_orphaned_layers: BoolProperty(
+        default=False,
+        name="Desativar Órfãos ao Gerar",
+        description="Ao gerar, desativar os view layers gerados cuja collection de origem sumiu ou não está mais selecionada"
+    )
+    lint_before_generate: BoolProperty(
+        default=False,
+        name="Verificar Antes de Gerar",
+        description="Executar a verificação de convenções antes de gerar e cancelar se houver erros"
+    )
+    use_background_analysis: BoolProperty(
+        default=False,
+        name="Analisar em Segundo Plano",
+        description="Pelos botões do painel, copiar a cena para estruturas simples e rodar a verificação, "
+                    "a detecção de AOVs e o planejamento NumPy em uma thread, sem travar a interface"
+    )
+    consumed_allow_list: StringProperty(
+        default="",
+        name="Allow-list",
+        description="Passes e AOVs sempre mantidos, separados por vírgula (ex.: z, normal, Cryptomatte Object)"
+    )
 
 
 # Classes para registro
 classes = (
     CollectionItem,
     PassItem,
+    CryptoPolicyItem,
+    RenderBudgetItem,
+    IndirectPolicyItem,
+    OutputRuleItem,
+    LayerEstimateItem,
+    TelemetryItem,
+    FootprintItem,
+    LintIssueItem,
     ViewLayerGeneratorProps,
 )
 
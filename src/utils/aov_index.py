@@ -0,0 +1,154 @@
+# ==========================
+# Índice Persistente de AOVs das Bibliotecas
+# ==========================
+
+import json
+import os
+
+import bpy
+
+# Nome do arquivo de índice na pasta de configuração do usuário
+AOV_INDEX_FILENAME = "viewlayer_generator_aov_index.json"
+
+# Versão do formato do índice (incrementar quando a estrutura mudar)
+AOV_INDEX_VERSION = 1
+
+
+def get_index_path():
+    """Retornar o caminho do índice de AOVs na pasta de configuração do usuário."""
+    config_dir = bpy.utils.user_resource("CONFIG")
+    return os.path.join(config_dir, AOV_INDEX_FILENAME)
+
+
+def load_index(index_path):
+    """Carregar o índice do disco (ou um índice vazio se não existir ou for inválido)."""
+    try:
+        with open(index_path, encoding="utf-8") as index_file:
+            data = json.load(index_file)
+    except (OSError, ValueError):
+        return {"version": AOV_INDEX_VERSION, "libraries": {}}
+    if data.get("version") != AOV_INDEX_VERSION:
+        return {"version": AOV_INDEX_VERSION, "libraries": {}}
+    return data
+
+
+def save_index(index_path, data):
+    """Gravar o índice no disco de forma atômica."""
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as index_file:
+        json.dump(data, index_file)
+    os.replace(tmp_path, index_path)
+
+
+def get_library_key(library):
+    """Retornar (caminho absoluto, tamanho, mtime) do arquivo de uma biblioteca."""
+    path = os.path.normpath(bpy.path.abspath(library.filepath, library=library.library))
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return path, None, None
+    return path, stat.st_size, stat.st_mtime
+
+
+def get_aov_type(node):
+    """Retornar o tipo (VALUE ou COLOR) de um nó Output AOV pelo que está ligado nele."""
+    if node.inputs[0].links and node.inputs[0].links[0].from_socket.type == "VALUE":
+        return "VALUE"
+    return "COLOR"
+
+
+def scan_node_tree_aovs(node_tree, group_cache):
+    """Listar os AOVs de uma node tree, incluindo node groups aninhados.
+
+    ``group_cache`` memoiza o resultado por node group (nome completo).
+    """
+    aovs = {}
+    for node in node_tree.nodes:
+        if node.type == "OUTPUT_AOV" and len(node.inputs) > 0:
+            # O nome do nó OUTPUT_AOV é usado como nome do AOV
+            aovs.setdefault(node.name, get_aov_type(node))
+        elif node.type == "GROUP" and node.node_tree is not None:
+            group = node.node_tree
+            if group.name_full not in group_cache:
+                group_cache[group.name_full] = {}
+                group_cache[group.name_full] = scan_node_tree_aovs(group, group_cache)
+            for name, aov_type in group_cache[group.name_full].items():
+                aovs.setdefault(name, aov_type)
+    return aovs
+
+
+class AovIndex:
+    """Índice de AOVs por biblioteca, invalidado por tamanho e mtime do arquivo."""
+
+    def __init__(self, index_path=None):
+        self.index_path = index_path or get_index_path()
+        self.data = load_index(self.index_path)
+        self.dirty = False
+        self.group_cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _get_library_entry(self, library):
+        """Obter a entrada da biblioteca, descartando-a se o arquivo mudou."""
+        path, size, mtime = get_library_key(library)
+        libraries = self.data["libraries"]
+        entry = libraries.get(path)
+        if entry is None or entry["size"] != size or entry["mtime"] != mtime:
+            entry = {"size": size, "mtime": mtime, "materials": {}, "node_groups": {}}
+            libraries[path] = entry
+            self.dirty = True
+        return entry
+
+    def get_material_aovs(self, material):
+        """Retornar {nome: tipo} dos AOVs de um material, usando o índice para bibliotecas."""
+        if not material.use_nodes or material.node_tree is None:
+            return {}
+        if material.library is None:
+            return scan_node_tree_aovs(material.node_tree, self.group_cache)
+
+        entry = self._get_library_entry(material.library)
+        cached = entry["materials"].get(material.name)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        aovs = scan_node_tree_aovs(material.node_tree, self.group_cache)
+        entry["materials"][material.name] = aovs
+        # Registrar também os node groups da mesma biblioteca visitados na varredura
+        for node in material.node_tree.nodes:
+            group = getattr(node, "node_tree", None) if node.type == "GROUP" else None
+            if group is not None and group.library == material.library:
+                entry["node_groups"][group.name] = self.group_cache.get(group.name_full, {})
+        self.dirty = True
+        return aovs
+
+    def lookup(self, material):
+        """Retornar os AOVs já indexados de um material linkado, sem varrer.
+
+        Retorna ``(aovs, entrada)``; ``aovs`` é None quando o material precisa ser
+        varrido, e a entrada da biblioteca recebe o resultado via ``store``.
+        """
+        entry = self._get_library_entry(material.library)
+        cached = entry["materials"].get(material.name)
+        if cached is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return cached, entry
+
+    def store(self, entry, material_name, aovs):
+        """Gravar no índice os AOVs de um material varrido fora de ``get_material_aovs``."""
+        entry["materials"][material_name] = aovs
+        self.dirty = True
+
+    def save(self):
+        """Gravar o índice se houve alterações."""
+        if not self.dirty:
+            return
+        try:
+            save_index(self.index_path, self.data)
+            self.dirty = False
+        except OSError as e:
+            print(f"Erro ao gravar índice de AOVs: {str(e)}")
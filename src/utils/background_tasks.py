@@ -0,0 +1,72 @@
+# ==========================
+# Análises em Segundo Plano
+# ==========================
+#
+# As análises recebem snapshots em estruturas Python simples (ver
+# scene_snapshot) e rodam em uma thread de trabalho. O resultado volta para a
+# thread principal por um timer do Blender, único lugar onde bpy pode ser
+# alterado com segurança.
+
+from concurrent.futures import ThreadPoolExecutor
+
+import bpy
+
+# Intervalo de verificação das tarefas concluídas (segundos)
+POLL_INTERVAL = 0.1
+
+_executor = None
+_pending = {}  # {chave: (future, on_done)}
+
+
+def submit(key, func, *args, on_done=None):
+    """Executar ``func(*args)`` em uma thread de trabalho.
+
+    ``on_done(resultado, erro)`` é chamado na thread principal ao terminar.
+    Uma nova tarefa com a mesma chave substitui a anterior, cujo resultado é
+    descartado. Retorna o Future da tarefa.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="vlg_analysis")
+    previous = _pending.pop(key, None)
+    if previous is not None:
+        previous[0].cancel()
+    future = _executor.submit(func, *args)
+    _pending[key] = (future, on_done)
+    if not bpy.app.timers.is_registered(_poll):
+        bpy.app.timers.register(_poll, first_interval=POLL_INTERVAL)
+    return future
+
+
+def is_running(key):
+    """Verificar se há uma tarefa pendente com a chave."""
+    return key in _pending
+
+
+def _poll():
+    """Timer que entrega os resultados das tarefas concluídas na thread principal."""
+    for key, (future, on_done) in list(_pending.items()):
+        if not future.done():
+            continue
+        del _pending[key]
+        if on_done is None or future.cancelled():
+            continue
+        error = future.exception()
+        try:
+            on_done(None if error else future.result(), error)
+        except Exception as e:
+            print(f"Erro ao aplicar o resultado de '{key}': {str(e)}")
+    return POLL_INTERVAL if _pending else None
+
+
+def shutdown():
+    """Descartar as tarefas pendentes e encerrar a thread de trabalho."""
+    global _executor
+    for future, _ in _pending.values():
+        future.cancel()
+    _pending.clear()
+    if bpy.app.timers.is_registered(_poll):
+        bpy.app.timers.unregister(_poll)
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
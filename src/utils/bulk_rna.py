@@ -0,0 +1,95 @@
+# ==========================
+# Leitura e Escrita em Lote via foreach_get/foreach_set
+# ==========================
+#
+# foreach_get/foreach_set atravessam a ponte Python/RNA uma única vez por
+# propriedade em vez de uma vez por item. Não chamam os callbacks de update
+# do RNA, então não devem ser usados em propriedades que dependem deles
+# (ex.: LayerCollection.exclude, que ressincroniza o view layer, os use_pass_*
+# do ViewLayer, que atualizam os sockets do nó Render Layers e o depsgraph, ou
+# o pass_index de objetos e materiais, que marca o depsgraph para reavaliação).
+# Para essas, ``write_columns_diffed`` lê em lote e escreve com setattr apenas
+# o que mudou.
+
+# Erros que indicam que a propriedade não suporta acesso em lote
+BULK_ERRORS = (AttributeError, TypeError, RuntimeError)
+
+
+def bulk_get(collection, attr, count, default=False):
+    """Ler uma propriedade de todos os itens com foreach_get (None se não suportado)."""
+    values = [default] * count
+    try:
+        collection.foreach_get(attr, values)
+    except BULK_ERRORS:
+        return None
+    return values
+
+
+def bulk_set(collection, attr, values):
+    """Escrever uma propriedade em todos os itens com foreach_set (False se não suportado)."""
+    try:
+        collection.foreach_set(attr, values)
+    except BULK_ERRORS:
+        return False
+    return True
+
+
+def write_columns(collection, columns):
+    """Escrever várias propriedades em todos os itens de uma coleção RNA.
+
+    ``columns`` é ``{propriedade: lista_de_valores}`` com um valor por item. Cada
+    propriedade é lida em lote e só é escrita se algum valor mudou. Propriedades
+    sem suporte a foreach usam setattr item a item como fallback.
+    Retorna um dicionário com as contagens ``bulk``, ``fallback`` e ``unchanged``.
+    """
+    items = None
+    stats = {"bulk": 0, "fallback": 0, "unchanged": 0}
+    count = len(collection)
+
+    for attr, values in columns.items():
+        current = bulk_get(collection, attr, count, type(values[0])() if values else False)
+        if current is not None:
+            if current == list(values):
+                stats["unchanged"] += 1
+                continue
+            if bulk_set(collection, attr, values):
+                stats["bulk"] += 1
+                continue
+
+        # Fallback: escrever item a item apenas o que mudou
+        if items is None:
+            items = list(collection)
+        for item, value in zip(items, values):
+            if hasattr(item, attr) and getattr(item, attr) != value:
+                setattr(item, attr, value)
+        stats["fallback"] += 1
+    return stats
+
+
+def write_columns_diffed(collection, columns):
+    """Escrever várias propriedades com setattr, apenas nos itens cujo valor mudou.
+
+    Para propriedades com callbacks de update: a leitura é em lote (foreach_get
+    não dispara updates) e cada escrita passa pelo RNA. Retorna o número de
+    valores escritos.
+    """
+    items = list(collection)
+    written = 0
+    for attr, values in columns.items():
+        current = bulk_get(collection, attr, len(items), type(values[0])() if values else False)
+        if current is None:
+            current = [getattr(item, attr, value) for item, value in zip(items, values)]
+        for item, old, value in zip(items, current, values):
+            if old != value and hasattr(item, attr):
+                setattr(item, attr, value)
+                written += 1
+    return written
+
+
+def write_columns_setattr(collection, columns):
+    """Escrever com setattr em todos os itens, sem comparar (referência para benchmark)."""
+    items = list(collection)
+    for attr, values in columns.items():
+        for item, value in zip(items, values):
+            if hasattr(item, attr):
+                setattr(item, attr, value)
@@ -0,0 +1,100 @@
+# ==========================
+# Referências Persistentes a Collections
+# ==========================
+#
+# Um PointerProperty para uma Collection conta como usuário dela: uma
+# collection tirada da cena continuaria no arquivo e nunca seria limpa.
+# Em vez do ponteiro, cada collection local recebe um identificador próprio
+# (propriedade customizada), que acompanha renomeações e desaparece junto
+# com a collection. Collections linkadas são somente leitura e usam o nome
+# completo, que a biblioteca mantém estável.
+
+import uuid
+
+# Propriedade customizada com o identificador da collection
+UID_PROP = "vlg_uid"
+
+# Cache {identificador: chave de bpy.data.collections}; conferido a cada
+# consulta e reconstruído quando uma collection foi renomeada ou removida.
+# Descartado ao abrir um arquivo e em undo/redo (ver on_load_post e on_undo_redo).
+_uid_keys = {}
+_stale = True
+
+
+def _read_uid(collection):
+    """Identificador já gravado na collection (ou o nome completo, se linkada)."""
+    if collection.library is not None:
+        return collection.name_full
+    return collection.get(UID_PROP) or None
+
+
+def _get_key(collection):
+    """Chave da collection em bpy.data.collections (nome, ou nome e biblioteca)."""
+    if collection.library is not None:
+        return collection.name, collection.library.filepath
+    return collection.name
+
+
+def get_collection_uid(collection):
+    """Retornar o identificador da collection, criando-o na primeira vez."""
+    uid = _read_uid(collection)
+    if uid is None:
+        uid = uuid.uuid4().hex
+        collection[UID_PROP] = uid
+        _uid_keys[uid] = _get_key(collection)
+    return uid
+
+
+def ensure_unique_uids(collections):
+    """Dar um novo identificador às cópias (Shift+D copia as propriedades customizadas).
+
+    A primeira collection com cada identificador o mantém. Retorna a
+    quantidade de collections renumeradas.
+    """
+    seen = set()
+    changed = 0
+    for collection in collections:
+        uid = _read_uid(collection)
+        if uid is not None and uid in seen and collection.library is None:
+            uid = uuid.uuid4().hex
+            collection[UID_PROP] = uid
+            changed += 1
+        if uid is not None:
+            seen.add(uid)
+    if changed:
+        invalidate()
+    return changed
+
+
+def invalidate():
+    """Marcar o cache de identificadores para reconstrução na próxima consulta."""
+    global _stale
+    _stale = True
+
+
+def _rebuild(collections):
+    """Reconstruir o cache a partir de todas as collections."""
+    global _stale
+    _uid_keys.clear()
+    for collection in collections:
+        uid = _read_uid(collection)
+        if uid is not None:
+            _uid_keys.setdefault(uid, _get_key(collection))
+    _stale = False
+
+
+def find_collection(collections, uid):
+    """Resolver a collection de um identificador (None se ela não existe mais)."""
+    if not uid:
+        return None
+    if _stale:
+        _rebuild(collections)
+    key = _uid_keys.get(uid)
+    collection = collections.get(key) if key is not None else None
+    if collection is None or _read_uid(collection) != uid:
+        # Renomeada, removida ou restaurada desde a última consulta: reconstruir
+        # uma vez antes de concluir que a collection não existe mais
+        _rebuild(collections)
+        key = _uid_keys.get(uid)
+        collection = collections.get(key) if key is not None else None
+    return collection
@@ -0,0 +1,151 @@
+# ==========================
+# Análise do Compositor (passes consumidos)
+# ==========================
+
+# Mapeamento das saídas do nó Render Layers para as propriedades de passe.
+# Inclui os nomes abreviados e os nomes longos usados nas versões mais novas.
+SOCKET_PASS_MAP = {
+    "Image": "use_pass_combined",
+    "Alpha": "use_pass_combined",
+    "Depth": "use_pass_z",
+    "Mist": "use_pass_mist",
+    "Normal": "use_pass_normal",
+    "Position": "use_pass_position",
+    "Vector": "use_pass_vector",
+    "UV": "use_pass_uv",
+    "IndexOB": "use_pass_object_index",
+    "Object Index": "use_pass_object_index",
+    "IndexMA": "use_pass_material_index",
+    "Material Index": "use_pass_material_index",
+    "DiffDir": "use_pass_diffuse_direct",
+    "Diffuse Direct": "use_pass_diffuse_direct",
+    "DiffInd": "use_pass_diffuse_indirect",
+    "Diffuse Indirect": "use_pass_diffuse_indirect",
+    "DiffCol": "use_pass_diffuse_color",
+    "Diffuse Color": "use_pass_diffuse_color",
+    "GlossDir": "use_pass_glossy_direct",
+    "Glossy Direct": "use_pass_glossy_direct",
+    "GlossInd": "use_pass_glossy_indirect",
+    "Glossy Indirect": "use_pass_glossy_indirect",
+    "GlossCol": "use_pass_glossy_color",
+    "Glossy Color": "use_pass_glossy_color",
+    "TransDir": "use_pass_transmission_direct",
+    "Transmission Direct": "use_pass_transmission_direct",
+    "TransInd": "use_pass_transmission_indirect",
+    "Transmission Indirect": "use_pass_transmission_indirect",
+    "TransCol": "use_pass_transmission_color",
+    "Transmission Color": "use_pass_transmission_color",
+    "VolumeDir": "use_pass_volume_direct",
+    "Volume Direct": "use_pass_volume_direct",
+    "Emit": "use_pass_emit",
+    "Emission": "use_pass_emit",
+    "Env": "use_pass_environment",
+    "Environment": "use_pass_environment",
+    "Shadow": "use_pass_shadow",
+    "AO": "use_pass_ambient_occlusion",
+    "Ambient Occlusion": "use_pass_ambient_occlusion",
+    "Transp": "use_pass_transparent",
+    "Transparent": "use_pass_transparent",
+    "Denoising Normal": "use_denoising_data",
+    "Denoising Albedo": "use_denoising_data",
+    "Denoising Depth": "use_denoising_data",
+}
+
+# Prefixos das saídas de Cryptomatte (CryptoObject00, CryptoObject01, ...)
+CRYPTO_SOCKET_PREFIXES = {
+    "CryptoObject": "use_pass_cryptomatte_object",
+    "CryptoMaterial": "use_pass_cryptomatte_material",
+    "CryptoAsset": "use_pass_cryptomatte_asset",
+}
+
+# Nós criados pela sincronização Render Layers → File Output (ver output_nodes):
+# marcados com uma propriedade customizada com o view layer e, nos nós antigos,
+# reconhecidos pelo prefixo do nome
+MANAGED_NODE_PROP = "vlg_layer"
+MANAGED_NODE_PREFIX = "VLG_"
+
+
+def get_compositor_tree(scene):
+    """Retornar a node tree do compositor da cena, se existir."""
+    tree = getattr(scene, "compositing_node_group", None)
+    if tree is None and getattr(scene, "use_nodes", False):
+        tree = getattr(scene, "node_tree", None)
+    return tree
+
+
+def socket_to_pass(socket_name):
+    """Converter o nome de uma saída do Render Layers para a propriedade de passe."""
+    if socket_name in SOCKET_PASS_MAP:
+        return SOCKET_PASS_MAP[socket_name]
+    for prefix, pass_name in CRYPTO_SOCKET_PREFIXES.items():
+        if socket_name.startswith(prefix):
+            return pass_name
+    return None
+
+
+def is_managed_node(node):
+    """Verificar se um nó foi criado pela sincronização de nós de saída do addon."""
+    return MANAGED_NODE_PROP in node or node.name.startswith(MANAGED_NODE_PREFIX)
+
+
+def collect_consumed_outputs(scene):
+    """Mapear cada view layer para as saídas ligadas dos seus nós Render Layers.
+
+    Links para os nós File Output do próprio addon não contam como consumo (eles
+    gravam todas as saídas ativas). Retorna um dicionário
+    ``{nome_do_view_layer: set(nomes_das_saidas)}``. View layers sem nenhum nó
+    Render Layers do usuário não aparecem no resultado.
+    """
+    tree = get_compositor_tree(scene)
+    consumed = {}
+    if tree is None:
+        return consumed
+
+    # Saídas ligadas a nós do usuário, por nó Render Layers (uma passada pelos links)
+    linked = {}
+    for link in tree.links:
+        if link.from_node.type == "R_LAYERS" and link.from_socket.enabled and not is_managed_node(link.to_node):
+            linked.setdefault(link.from_node.name, set()).add(link.from_socket.name)
+
+    for node in tree.nodes:
+        if node.type != "R_LAYERS" or node.mute:
+            continue
+        # Nós que apontam para outra cena não consomem passes desta
+        node_scene = getattr(node, "scene", None)
+        if node_scene is not None and node_scene != scene:
+            continue
+
+        outputs = linked.get(node.name, set())
+        # O Render Layers do addon só conta se o usuário ligou algo nele
+        if is_managed_node(node) and not outputs:
+            continue
+        consumed.setdefault(node.layer, set()).update(outputs)
+    return consumed
+
+
+def split_consumed_outputs(socket_names):
+    """Separar as saídas consumidas em (passes, nomes_de_aov)."""
+    passes = set()
+    aovs = set()
+    for socket_name in socket_names:
+        pass_name = socket_to_pass(socket_name)
+        if pass_name:
+            passes.add(pass_name)
+        else:
+            # Saídas não mapeadas são AOVs (ou light groups) com o nome do próprio passe
+            aovs.add(socket_name)
+    return passes, aovs
+
+
+def parse_allow_list(text):
+    """Converter a allow-list separada por vírgulas em um conjunto normalizado."""
+    return {entry.strip().lower() for entry in text.split(",") if entry.strip()}
+
+
+def is_allowed(name, allow_list, friendly_name=None):
+    """Verificar se um passe ou AOV está na allow-list (nome interno ou amigável)."""
+    if name.lower() in allow_list:
+        return True
+    if name.startswith("use_pass_") and name[9:].lower() in allow_list:
+        return True
+    return bool(friendly_name) and friendly_name.lower() in allow_list
@@ -0,0 +1,92 @@
+# ==========================
+# Políticas de Cryptomatte por Tipo de ViewLayer
+# ==========================
+
+from .layer_kinds import LAYER_KIND_REGULAR, LAYER_KIND_HOLDOUT, LAYER_KIND_LGT, LAYER_KIND_GP
+
+# Propriedade de passe para cada tipo de Cryptomatte
+CRYPTO_TYPE_PASSES = {
+    "object": "use_pass_cryptomatte_object",
+    "material": "use_pass_cryptomatte_material",
+    "asset": "use_pass_cryptomatte_asset",
+}
+
+# Limites de níveis aceitos pelo Blender (pass_cryptomatte_depth)
+MIN_CRYPTO_LEVELS = 2
+MAX_CRYPTO_LEVELS = 16
+
+# Políticas padrão: mais níveis nos layers regulares (personagens),
+# mínimo nos layers de holdout e nenhum Cryptomatte em lgt. e GP.
+# (O modo "accurate" foi removido da API do Blender e não faz mais parte da política.)
+DEFAULT_CRYPTO_POLICIES = {
+    LAYER_KIND_REGULAR: {"object": True, "material": True, "asset": True, "levels": 6},
+    LAYER_KIND_HOLDOUT: {"object": True, "material": False, "asset": False, "levels": 2},
+    LAYER_KIND_LGT: {"object": False, "material": False, "asset": False, "levels": 2},
+    LAYER_KIND_GP: {"object": False, "material": False, "asset": False, "levels": 2},
+}
+
+
+def initialize_default_crypto_policies(collection):
+    """Preencher uma CollectionProperty de CryptoPolicyItem com as políticas padrão."""
+    for kind, policy in DEFAULT_CRYPTO_POLICIES.items():
+        item = collection.add()
+        item.name = kind
+        item.kind = kind
+        item.use_object = policy["object"]
+        item.use_material = policy["material"]
+        item.use_asset = policy["asset"]
+        item.levels = policy["levels"]
+
+
+def get_policy_map(policy_items):
+    """Converter os itens de política das preferências em {tipo: política}."""
+    policies = dict(DEFAULT_CRYPTO_POLICIES)
+    for item in policy_items:
+        policies[item.kind] = {
+            "object": item.use_object,
+            "material": item.use_material,
+            "asset": item.use_asset,
+            "levels": item.levels,
+        }
+    return policies
+
+
+def get_policy_levels(policy):
+    """Retornar os níveis da política dentro dos limites aceitos pelo Blender."""
+    return min(max(policy["levels"], MIN_CRYPTO_LEVELS), MAX_CRYPTO_LEVELS)
+
+
+def merge_policy_passes(enabled, policy):
+    """Substituir os passes de Cryptomatte de uma lista de passes pelos que a política ativa."""
+    policy_passes = [pass_name for crypto_type, pass_name in CRYPTO_TYPE_PASSES.items() if policy[crypto_type]]
+    return [pass_name for pass_name in enabled if pass_name not in CRYPTO_TYPE_PASSES.values()] + policy_passes
+
+
+def plan_depth_column(viewlayers, layer_policies, columns):
+    """Planejar pass_cryptomatte_depth de cada view layer.
+
+    ``layer_policies`` tem uma política (ou None) por view layer e ``columns``
+    são as colunas use_pass_* já planejadas. Layers com algum Cryptomatte ativo
+    recebem os níveis da política; os demais mantêm o valor atual.
+    """
+    crypto_columns = [columns[pass_name] for pass_name in CRYPTO_TYPE_PASSES.values() if pass_name in columns]
+    depths = []
+    for index, (viewlayer, policy) in enumerate(zip(viewlayers, layer_policies)):
+        current = getattr(viewlayer, "pass_cryptomatte_depth", MIN_CRYPTO_LEVELS)
+        has_crypto = any(column[index] for column in crypto_columns)
+        depths.append(get_policy_levels(policy) if policy is not None and has_crypto else current)
+    return depths
+
+
+def plan_policy_columns(viewlayers, layer_policies):
+    """Planejar as colunas de Cryptomatte (passes e níveis) para ``write_columns_diffed``.
+
+    ``layer_policies`` tem uma política por view layer. Retorna ``{propriedade: valores}``.
+    """
+    if not viewlayers:
+        return {}
+    columns = {pass_name: [bool(policy[crypto_type]) for policy in layer_policies]
+               for crypto_type, pass_name in CRYPTO_TYPE_PASSES.items() if hasattr(viewlayers[0], pass_name)}
+    if hasattr(viewlayers[0], "pass_cryptomatte_depth"):
+        columns["pass_cryptomatte_depth"] = plan_depth_column(viewlayers, layer_policies, columns)
+    return columns
@@ -0,0 +1,61 @@
+# ==========================
+# Detecção de ViewLayers Duplicados
+# ==========================
+
+import hashlib
+
+from .hierarchy import walk_layer_flags
+from .render_estimator import PASS_CHANNELS, CRYPTO_CHANNEL_PASSES, is_pass_enabled
+
+# Todos os passes que entram na assinatura
+SIGNATURE_PASSES = tuple(PASS_CHANNELS) + CRYPTO_CHANNEL_PASSES
+
+
+def compute_layer_signature(scene, viewlayer):
+    """Calcular a assinatura canônica de um view layer.
+
+    A assinatura é um hash das collections incluídas, em holdout e indirect
+    only (flags herdados, pela árvore atual), dos passes ativos (com os níveis
+    de Cryptomatte), dos AOVs com seus tipos, dos light groups e das amostras e
+    do denoising do view layer: dois view layers só são iguais se renderizam
+    igual.
+    """
+    included, holdout, indirect = walk_layer_flags(viewlayer)
+    passes = sorted(pass_name for pass_name in SIGNATURE_PASSES if is_pass_enabled(viewlayer, pass_name))
+    aovs = sorted((aov.name, aov.type) for aov in getattr(viewlayer, "aovs", ()))
+    crypto_levels = getattr(viewlayer, "pass_cryptomatte_depth", 0)
+    lightgroups = sorted(lightgroup.name for lightgroup in getattr(viewlayer, "lightgroups", ()))
+    cycles_settings = getattr(viewlayer, "cycles", None)
+    render_settings = (
+        getattr(viewlayer, "samples", 0),
+        getattr(cycles_settings, "use_denoising", None),
+        getattr(cycles_settings, "denoising_store_passes", None),
+    )
+
+    payload = repr((sorted(included), sorted(holdout), sorted(indirect), passes, crypto_levels, aovs,
+                    lightgroups, render_settings))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def find_duplicate_groups(scene):
+    """Agrupar os view layers ativos por assinatura em uma única passada.
+
+    Retorna uma lista de grupos (listas de nomes) com mais de um view layer,
+    na ordem em que aparecem na cena.
+    """
+    groups = {}
+    for viewlayer in scene.view_layers:
+        if not viewlayer.use:
+            continue
+        groups.setdefault(compute_layer_signature(scene, viewlayer), []).append(viewlayer.name)
+    return [names for names in groups.values() if len(names) > 1]
+
+
+def disable_duplicates(scene, duplicate_groups):
+    """Desativar ``use`` em todos os view layers de cada grupo exceto o primeiro."""
+    disabled = []
+    for names in duplicate_groups:
+        for name in names[1:]:
+            scene.view_layers[name].use = False
+            disabled.append(name)
+    return disabled
@@ -0,0 +1,147 @@
+# ==========================
+# Metadados dos ViewLayers Gerados e Limpeza de Órfãos
+# ==========================
+
+import uuid
+
+from .collection_refs import get_collection_uid, find_collection
+
+# Propriedades customizadas gravadas em cada view layer gerado
+SOURCE_PROP = "vlg_source"  # Nome da collection de origem (na última geração)
+SOURCE_UID_PROP = "vlg_source_uid"  # vlg_uid da collection (segue renomeações sem contar como usuário)
+LEGACY_SOURCE_REF_PROP = "vlg_source_ref"  # Ponteiro das versões anteriores (contava como usuário)
+RUN_PROP = "vlg_run_id"  # Identificador da última geração que o atualizou
+PRUNED_PROP = "vlg_pruned"  # Motivo da desativação pela limpeza de órfãos
+
+# Motivos de um view layer gerado ser órfão
+ORPHAN_MISSING = "MISSING"  # A collection de origem não existe mais
+ORPHAN_UNSELECTED = "UNSELECTED"  # A collection existe mas não está selecionada
+
+
+def new_run_id():
+    """Gerar um identificador curto para uma execução da geração."""
+    return uuid.uuid4().hex[:12]
+
+
+def tag_viewlayer(viewlayer, collection, run_id):
+    """Gravar a collection de origem e o id da execução no view layer (apenas se mudou).
+
+    Um view layer desativado pela limpeza de órfãos volta a ser usado quando
+    sua collection é gerada novamente.
+    """
+    uid = get_collection_uid(collection)
+    if viewlayer.get(SOURCE_UID_PROP) != uid:
+        viewlayer[SOURCE_UID_PROP] = uid
+    if LEGACY_SOURCE_REF_PROP in viewlayer:
+        del viewlayer[LEGACY_SOURCE_REF_PROP]
+    if viewlayer.get(SOURCE_PROP) != collection.name:
+        viewlayer[SOURCE_PROP] = collection.name
+    if viewlayer.get(RUN_PROP) != run_id:
+        viewlayer[RUN_PROP] = run_id
+    if PRUNED_PROP in viewlayer:
+        del viewlayer[PRUNED_PROP]
+        viewlayer.use = True
+
+
+def migrate_viewlayer_sources(scene):
+    """Trocar o ponteiro das versões anteriores pelo vlg_uid da collection.
+
+    View layers marcados apenas com o nome continuam sendo resolvidos pelo
+    nome até a próxima geração. Retorna a quantidade de view layers migrados.
+    """
+    migrated = 0
+    for viewlayer in scene.view_layers:
+        if LEGACY_SOURCE_REF_PROP not in viewlayer:
+            continue
+        collection = viewlayer[LEGACY_SOURCE_REF_PROP]
+        del viewlayer[LEGACY_SOURCE_REF_PROP]
+        if collection is not None:
+            viewlayer[SOURCE_UID_PROP] = get_collection_uid(collection)
+        migrated += 1
+    return migrated
+
+
+def get_source_collection(viewlayer, collections):
+    """Collection de origem de um view layer gerado.
+
+    Usa o vlg_uid gravado na geração; view layers marcados por versões
+    anteriores (apenas o nome) são resolvidos pelo nome. Retorna None se a
+    collection não existe mais.
+    """
+    uid = viewlayer.get(SOURCE_UID_PROP)
+    if uid is not None:
+        return find_collection(collections, uid)
+    source = viewlayer.get(SOURCE_PROP)
+    return collections.get(source) if source is not None else None
+
+
+def get_source(viewlayer, collections):
+    """Nome atual da collection de origem (None se não foi gerado pelo addon).
+
+    Se a collection foi removida, retorna o último nome gravado.
+    """
+    if SOURCE_PROP not in viewlayer:
+        return None
+    collection = get_source_collection(viewlayer, collections)
+    return collection.name if collection is not None else viewlayer[SOURCE_PROP]
+
+
+def get_tagged_layer_names(scene):
+    """Nomes dos view layers marcados pela geração, na ordem da cena."""
+    return [viewlayer.name for viewlayer in scene.view_layers if SOURCE_PROP in viewlayer]
+
+
+def map_layers_by_source(scene):
+    """Mapear o vlg_uid de cada collection de origem para o nome do seu view layer gerado."""
+    layers = {}
+    for viewlayer in scene.view_layers:
+        uid = viewlayer.get(SOURCE_UID_PROP)
+        if uid is not None:
+            layers.setdefault(uid, viewlayer.name)
+    return layers
+
+
+def find_orphaned_layers(scene, collections, selected_names):
+    """Encontrar view layers gerados cuja origem sumiu ou não está mais selecionada.
+
+    Apenas view layers marcados pela geração são considerados. Retorna uma lista
+    de dicionários com ``name``, ``source``, ``reason`` e ``run_id``.
+    """
+    selected_names = set(selected_names)
+    orphans = []
+    for viewlayer in scene.view_layers:
+        if SOURCE_PROP not in viewlayer:
+            continue
+        collection = get_source_collection(viewlayer, collections)
+        source = collection.name if collection is not None else viewlayer[SOURCE_PROP]
+        if collection is None:
+            reason = ORPHAN_MISSING
+        elif source not in selected_names:
+            reason = ORPHAN_UNSELECTED
+        else:
+            continue
+        orphans.append({"name": viewlayer.name, "source": source, "reason": reason,
+                        "run_id": viewlayer.get(RUN_PROP, "")})
+    return orphans
+
+
+def prune_layers(scene, layer_names, remove=False):
+    """Desativar ou remover os view layers em uma passada.
+
+    A cena precisa manter ao menos um view layer: se todos fossem removidos, o
+    último é apenas desativado. Os desativados são marcados para voltar a ser
+    usados se forem gerados novamente. Retorna ``(removidos, desativados)``.
+    """
+    removed, disabled = [], []
+    for name in layer_names:
+        viewlayer = scene.view_layers.get(name)
+        if viewlayer is None:
+            continue
+        if remove and len(scene.view_layers) > 1:
+            scene.view_layers.remove(viewlayer)
+            removed.append(name)
+        elif viewlayer.use:
+            viewlayer.use = False
+            viewlayer[PRUNED_PROP] = True
+            disabled.append(name)
+    return removed, disabled
@@ -0,0 +1,124 @@
+# ==========================
+# Estimativa de Geometria por ViewLayer
+# ==========================
+
+from .hierarchy import walk_layer_visibility
+
+# Um view layer é considerado pesado quando tem mais que este fator vezes a mediana de faces
+HEAVY_LAYER_FACTOR = 2.0
+
+# Quantidade de collections dominantes reportadas por view layer
+MAX_DOMINANT_COLLECTIONS = 3
+
+
+def _geometry_counts(obj, depsgraph):
+    """Retornar (vértices, faces) do objeto avaliado, ou do original como fallback."""
+    data = obj.data
+    if depsgraph is not None:
+        evaluated = obj.evaluated_get(depsgraph)
+        data = getattr(evaluated, "data", None) or data
+    if data is None or not hasattr(data, "vertices"):
+        return 0, 0
+    return len(data.vertices), len(getattr(data, "polygons", ()))
+
+
+def object_footprint(obj, depsgraph, cache):
+    """Calcular (memoizado) vértices, faces e instâncias de um objeto.
+
+    Instâncias de collection somam a geometria de todos os objetos instanciados.
+    """
+    key = obj.name_full
+    if key in cache:
+        return cache[key]
+
+    # Marcar como em processamento para evitar recursão infinita
+    cache[key] = {"verts": 0, "faces": 0, "instances": 0}
+
+    verts, faces = _geometry_counts(obj, depsgraph)
+    instances = 0
+    instance_collection = getattr(obj, "instance_collection", None)
+    if obj.instance_type == "COLLECTION" and instance_collection is not None:
+        for child in instance_collection.all_objects:
+            child_footprint = object_footprint(child, depsgraph, cache)
+            verts += child_footprint["verts"]
+            faces += child_footprint["faces"]
+            instances += 1 + child_footprint["instances"]
+
+    cache[key] = {"verts": verts, "faces": faces, "instances": instances}
+    return cache[key]
+
+
+def collection_footprint(collection, depsgraph, object_cache):
+    """Somar a geometria dos objetos diretos de uma collection."""
+    total = {"objects": 0, "verts": 0, "faces": 0, "instances": 0}
+    for obj in collection.objects:
+        footprint = object_footprint(obj, depsgraph, object_cache)
+        total["objects"] += 1
+        total["verts"] += footprint["verts"]
+        total["faces"] += footprint["faces"]
+        total["instances"] += footprint["instances"]
+    return total
+
+
+def estimate_scene_footprint(scene, collections, depsgraph=None):
+    """Estimar a geometria de cada view layer ativo.
+
+    ``collections`` é o mapeamento nome → Collection (ex.: ``bpy.data.collections``).
+    Cada view layer é avaliado pelo seu próprio depsgraph (o do contexto só
+    avalia o view layer ativo); ``depsgraph`` é usado apenas se o view layer
+    não tiver um. Retorna uma lista de dicionários com objetos únicos, vértices, faces,
+    instâncias, indicação de view layer pesado e as collections .all/lgt. que dominam.
+    A visibilidade vem da árvore atual de cada view layer, não do cache da geração.
+    """
+    object_cache = {}
+    collection_cache = {}
+    results = []
+
+    for viewlayer in scene.view_layers:
+        if not viewlayer.use:
+            continue
+        included, _ = walk_layer_visibility(viewlayer)
+        layer_depsgraph = getattr(viewlayer, "depsgraph", None)
+        if layer_depsgraph is not None:
+            layer_depsgraph.update()  # Avaliar os objetos incluídos apenas neste view layer
+        else:
+            layer_depsgraph = depsgraph
+
+        unique_objects = {}
+        dominant = []
+        for name in included:
+            collection = collections.get(name)
+            if collection is None:
+                continue
+            for obj in collection.objects:
+                unique_objects[obj.name_full] = obj
+            if name.endswith(".all") or name.startswith("lgt."):
+                if name not in collection_cache:
+                    collection_cache[name] = collection_footprint(collection, layer_depsgraph, object_cache)
+                dominant.append((collection_cache[name]["faces"], name))
+
+        totals = {"verts": 0, "faces": 0, "instances": 0}
+        for obj in unique_objects.values():
+            footprint = object_footprint(obj, layer_depsgraph, object_cache)
+            for key in totals:
+                totals[key] += footprint[key]
+
+        dominant.sort(reverse=True)
+        results.append({
+            "name": viewlayer.name,
+            "objects": len(unique_objects),
+            "verts": totals["verts"],
+            "faces": totals["faces"],
+            "instances": totals["instances"],
+            "dominant": [
+                (name, faces / totals["faces"] if totals["faces"] else 0.0)
+                for faces, name in dominant[:MAX_DOMINANT_COLLECTIONS] if faces
+            ],
+        })
+
+    # Marcar view layers pesados em relação à mediana
+    faces_sorted = sorted(result["faces"] for result in results)
+    median = faces_sorted[len(faces_sorted) // 2] if faces_sorted else 0
+    for result in results:
+        result["heavy"] = bool(median) and result["faces"] > median * HEAVY_LAYER_FACTOR
+    return results
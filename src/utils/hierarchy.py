@@ -0,0 +1,90 @@
+# ==========================
+# Dados de Hierarquia Coletados na Geração
+# ==========================
+
+import bpy
+
+# Visibilidade efetiva registrada durante a geração:
+# {(nome_da_cena, nome_do_view_layer): (collections_incluidas, collections_em_holdout)}
+# Uma collection está incluída quando nem ela nem nenhum ancestral está excluído.
+_layer_visibility = {}
+
+
+def store_layer_visibility(scene, viewlayer_name, included, holdout):
+    """Guardar as collections efetivamente incluídas e em holdout de um view layer gerado."""
+    _layer_visibility[(scene.name, viewlayer_name)] = (frozenset(included), frozenset(holdout))
+
+
+def walk_layer_visibility(viewlayer):
+    """Percorrer a árvore de layer collections e retornar (incluídas, em holdout)."""
+    included = set()
+    holdout = set()
+    stack = list(viewlayer.layer_collection.children)
+    while stack:
+        child = stack.pop()
+        if child.exclude:
+            continue
+        included.add(child.name)
+        if child.holdout:
+            holdout.add(child.name)
+        stack.extend(child.children)
+    return frozenset(included), frozenset(holdout)
+
+
+def walk_layer_flags(viewlayer):
+    """Percorrer a árvore de layer collections com os flags herdados dos pais.
+
+    Holdout e indirect only valem para toda a subárvore, então uma collection
+    filha de uma ``.hdt`` também está em holdout. Retorna ``(incluídas,
+    em holdout, indirect only)``.
+    """
+    included = set()
+    holdout = set()
+    indirect = set()
+    stack = [(child, False, False) for child in viewlayer.layer_collection.children]
+    while stack:
+        child, parent_holdout, parent_indirect = stack.pop()
+        if child.exclude:
+            continue
+        is_holdout = parent_holdout or child.holdout
+        is_indirect = parent_indirect or child.indirect_only
+        included.add(child.name)
+        if is_holdout:
+            holdout.add(child.name)
+        if is_indirect:
+            indirect.add(child.name)
+        stack.extend((grandchild, is_holdout, is_indirect) for grandchild in child.children)
+    return frozenset(included), frozenset(holdout), frozenset(indirect)
+
+
+def get_layer_visibility(scene, viewlayer):
+    """Obter a visibilidade efetiva do cache da geração ou percorrendo a árvore."""
+    key = (scene.name, viewlayer.name)
+    if key not in _layer_visibility:
+        _layer_visibility[key] = walk_layer_visibility(viewlayer)
+    return _layer_visibility[key]
+
+
+def clear_layer_visibility(scene=None):
+    """Limpar o cache de visibilidade (de uma cena ou de todas)."""
+    if scene is None:
+        _layer_visibility.clear()
+        return
+    for key in [key for key in _layer_visibility if key[0] == scene.name]:
+        del _layer_visibility[key]
+
+
+def invalidate_from_depsgraph(depsgraph):
+    """Descartar a visibilidade que as atualizações do depsgraph podem ter mudado.
+
+    Exclude/holdout editados no outliner chegam como atualização da cena, vinda
+    do depsgraph do view layer editado; mudanças na hierarquia de collections
+    afetam todos os view layers.
+    """
+    for update in depsgraph.updates:
+        id_data = update.id
+        if isinstance(id_data, bpy.types.Collection):
+            _layer_visibility.clear()
+            return
+        if isinstance(id_data, bpy.types.Scene):
+            _layer_visibility.pop((id_data.name, depsgraph.view_layer.name), None)
@@ -0,0 +1,63 @@
+# ==========================
+# Collections Indirect Only (.ind)
+# ==========================
+#
+# Collections .ind (ex.: ambientes) contribuem apenas com luz indireta e
+# sombras: ficam incluídas nos view layers gerados com
+# LayerCollection.indirect_only (Cycles), sem aparecer para a câmera.
+
+from .layer_kinds import LAYER_KIND_REGULAR, LAYER_KIND_LGT, LAYER_KIND_GP, is_gp_collection, is_lgt_collection
+
+INDIRECT_SUFFIX = ".ind"
+
+# Modos da política por tipo de view layer
+INDIRECT_MODE_INDIRECT = "INDIRECT"  # Incluída com indirect_only
+INDIRECT_MODE_INCLUDE = "INCLUDE"  # Incluída e visível para a câmera
+INDIRECT_MODE_EXCLUDE = "EXCLUDE"  # Excluída do view layer
+
+INDIRECT_MODE_ITEMS = [
+    (INDIRECT_MODE_INDIRECT, "Indireta", "Incluir com Indirect Only (apenas luz indireta e sombras)"),
+    (INDIRECT_MODE_INCLUDE, "Visível", "Incluir visível para a câmera"),
+    (INDIRECT_MODE_EXCLUDE, "Excluir", "Excluir do view layer"),
+]
+
+# Política padrão. O tipo HOLDOUT só é conhecido após a geração, então usa a regra REGULAR.
+DEFAULT_INDIRECT_POLICIES = {
+    LAYER_KIND_REGULAR: INDIRECT_MODE_INDIRECT,
+    LAYER_KIND_LGT: INDIRECT_MODE_INDIRECT,
+    LAYER_KIND_GP: INDIRECT_MODE_EXCLUDE,
+}
+
+
+def is_indirect_collection(collection_name):
+    """Verificar se uma collection segue a convenção .ind."""
+    return collection_name.endswith(INDIRECT_SUFFIX)
+
+
+def initialize_default_indirect_policies(collection):
+    """Preencher uma CollectionProperty de IndirectPolicyItem com as políticas padrão."""
+    for kind, mode in DEFAULT_INDIRECT_POLICIES.items():
+        item = collection.add()
+        item.name = kind
+        item.kind = kind
+        item.mode = mode
+
+
+def get_policy_map(policy_items):
+    """Converter os itens de política das preferências em {tipo: modo}."""
+    policies = dict(DEFAULT_INDIRECT_POLICIES)
+    for item in policy_items:
+        policies[item.kind] = item.mode
+    return policies
+
+
+def get_indirect_mode(layer_name, policies=None):
+    """Modo das collections .ind em um view layer, pelo tipo derivado do nome."""
+    policies = policies or DEFAULT_INDIRECT_POLICIES
+    if is_gp_collection(layer_name):
+        kind = LAYER_KIND_GP
+    elif is_lgt_collection(layer_name):
+        kind = LAYER_KIND_LGT
+    else:
+        kind = LAYER_KIND_REGULAR
+    return policies.get(kind, DEFAULT_INDIRECT_POLICIES[kind])
@@ -0,0 +1,59 @@
+# ==========================
+# Tipos de ViewLayer
+# ==========================
+
+# Tipos de view layer usados pelas políticas por tipo
+LAYER_KIND_REGULAR = "REGULAR"
+LAYER_KIND_HOLDOUT = "HOLDOUT"
+LAYER_KIND_LGT = "LGT"
+LAYER_KIND_GP = "GP"
+
+# Itens para EnumProperty (identificador, nome, descrição)
+LAYER_KIND_ITEMS = [
+    (LAYER_KIND_REGULAR, "Regular", "View layers gerados a partir de collections comuns"),
+    (LAYER_KIND_HOLDOUT, "Holdout", "View layers em que a maior parte das collections incluídas é .hdt"),
+    (LAYER_KIND_LGT, "Lighting", "View layers com prefixo lgt."),
+    (LAYER_KIND_GP, "Grease Pencil", "View layers com sufixo .GP ou .GP.vl"),
+]
+
+# Fração de collections em holdout a partir da qual o view layer é considerado de holdout
+HOLDOUT_RATIO_THRESHOLD = 0.5
+
+
+def is_gp_collection(collection_name):
+    """Verificar se uma collection é para Grease Pencil."""
+    return collection_name.endswith(".GP") or collection_name.endswith(".GP.vl")
+
+
+def is_lgt_collection(collection_name):
+    """Verificar se uma collection é do tipo lgt."""
+    return collection_name.startswith("lgt.")
+
+
+def count_included_collections(layer_collection):
+    """Contar (incluídas, em holdout) na árvore de layer collections, ignorando a raiz."""
+    included = 0
+    holdout = 0
+    stack = list(layer_collection.children)
+    while stack:
+        child = stack.pop()
+        if child.exclude:
+            continue
+        included += 1
+        if child.holdout:
+            holdout += 1
+        stack.extend(child.children)
+    return included, holdout
+
+
+def get_layer_kind(viewlayer):
+    """Classificar um view layer em REGULAR, HOLDOUT, LGT ou GP."""
+    if is_gp_collection(viewlayer.name):
+        return LAYER_KIND_GP
+    if is_lgt_collection(viewlayer.name):
+        return LAYER_KIND_LGT
+
+    included, holdout = count_included_collections(viewlayer.layer_collection)
+    if included and holdout / included > HOLDOUT_RATIO_THRESHOLD:
+        return LAYER_KIND_HOLDOUT
+    return LAYER_KIND_REGULAR
@@ -0,0 +1,134 @@
+# ==========================
+# Manifesto dos ViewLayers para Composição
+# ==========================
+#
+# Um JSON compacto por shot descrevendo o que cada view layer grava (passes,
+# AOVs, Cryptomatte, arquivos de saída). Ferramentas de composição leem o
+# manifesto em vez de abrir cada EXR para descobrir os canais.
+
+import json
+import os
+import time
+
+import bpy
+
+from .compositor_analysis import get_compositor_tree
+from .generated_layers import get_source, RUN_PROP
+from .hierarchy import walk_layer_flags
+from .layer_kinds import get_layer_kind
+from .output_nodes import get_node_key
+from .render_estimator import PASS_CHANNELS, CRYPTO_CHANNEL_PASSES, is_pass_enabled, count_viewlayer_channels
+
+MANIFEST_VERSION = 2
+MANIFEST_SUFFIX = "_layers.json"
+
+
+def get_manifest_path(blend_path):
+    """Caminho do manifesto ao lado do .blend."""
+    return os.path.splitext(blend_path)[0] + MANIFEST_SUFFIX
+
+
+def get_enabled_passes(viewlayer):
+    """Nomes dos passes ativos (sem o prefixo use_pass_)."""
+    return [pass_name[len("use_pass_"):] for pass_name in PASS_CHANNELS if is_pass_enabled(viewlayer, pass_name)]
+
+
+def get_crypto_settings(viewlayer):
+    """Tipos de Cryptomatte ativos e níveis do view layer."""
+    settings = {
+        pass_name[len("use_pass_cryptomatte_"):]: is_pass_enabled(viewlayer, pass_name)
+        for pass_name in CRYPTO_CHANNEL_PASSES
+    }
+    settings["levels"] = getattr(viewlayer, "pass_cryptomatte_depth", 0)
+    return settings
+
+
+def get_output_files(scene, layer_name):
+    """Arquivos EXR gravados pelos nós File Output sincronizados do view layer.
+
+    Retorna uma lista com caminho, codec, profundidade e as camadas de cada
+    arquivo (vazia se os nós de saída não foram sincronizados).
+    """
+    tree = get_compositor_tree(scene)
+    if tree is None:
+        return []
+    files = []
+    for node in tree.nodes:
+        # View layer, codec e profundidade vêm das marcas da sincronização, não do nome do nó
+        key = get_node_key(node)
+        if key is None or key[0] != "OUTPUT_FILE" or key[1] != layer_name:
+            continue
+        _, _, codec, depth = key
+        files.append({
+            "path": bpy.path.abspath(node.base_path),
+            "codec": codec,
+            "depth": depth,
+            "layers": [slot.name for slot in node.layer_slots],
+        })
+    return files
+
+
+def map_layer_jobs(jobs):
+    """Mapear cada view layer à saída e aos nomes dos jobs que o renderizam.
+
+    ``jobs`` vem de ``render_jobs.build_jobs``: um grupo de view layers grava
+    em uma única saída (o nome do grupo substitui ``{layer}``).
+    """
+    layer_jobs = {}
+    for job in jobs:
+        for layer_name in job["layers"]:
+            entry = layer_jobs.setdefault(layer_name, {"output": job["output"], "jobs": []})
+            entry["jobs"].append(job["name"])
+    return layer_jobs
+
+
+def build_layer_entry(scene, viewlayer, layer_jobs):
+    """Descrever um view layer: tipo, saída, passes, AOVs, Cryptomatte e origens.
+
+    A saída é a do job que renderiza o view layer; fora dos jobs (ex.:
+    desativado), é a da cena. As collections vêm da árvore atual do view layer,
+    com o holdout herdado dos pais.
+    """
+    included, holdout, _ = walk_layer_flags(viewlayer)
+    job_entry = layer_jobs.get(viewlayer.name)
+    output = job_entry["output"] if job_entry is not None and job_entry["output"] else scene.render.filepath
+    return {
+        "name": viewlayer.name,
+        "kind": get_layer_kind(viewlayer),
+        "use": viewlayer.use,
+        "output": bpy.path.abspath(output),
+        "jobs": job_entry["jobs"] if job_entry is not None else [],
+        "files": get_output_files(scene, viewlayer.name),
+        "channels": count_viewlayer_channels(viewlayer),
+        "passes": get_enabled_passes(viewlayer),
+        "aovs": [{"name": aov.name, "type": aov.type} for aov in getattr(viewlayer, "aovs", ())],
+        "lightgroups": [lightgroup.name for lightgroup in getattr(viewlayer, "lightgroups", ())],
+        "cryptomatte": get_crypto_settings(viewlayer),
+        "source": get_source(viewlayer, bpy.data.collections),
+        "run_id": viewlayer.get(RUN_PROP),
+        "collections": sorted(included - holdout),
+        "holdout": sorted(holdout),
+    }
+
+
+def build_manifest(scene, layer_names, jobs):
+    """Montar o manifesto do shot com os view layers informados e os jobs de renderização."""
+    layer_jobs = map_layer_jobs(jobs)
+    return {
+        "version": MANIFEST_VERSION,
+        "blend": bpy.data.filepath,
+        "scene": scene.name,
+        "written_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "frame_start": scene.frame_start,
+        "frame_end": scene.frame_end,
+        "resolution": [scene.render.resolution_x * scene.render.resolution_percentage // 100,
+                       scene.render.resolution_y * scene.render.resolution_percentage // 100],
+        "layers": [build_layer_entry(scene, scene.view_layers[name], layer_jobs)
+                   for name in layer_names if name in scene.view_layers],
+    }
+
+
+def write_manifest(path, manifest):
+    """Gravar o manifesto em JSON compacto."""
+    with open(path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, separators=(",", ":"))
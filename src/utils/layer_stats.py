@@ -0,0 +1,196 @@
+# ==========================
+# Estatísticas por Collection e ViewLayer (cache incremental)
+# ==========================
+#
+# Os painéis apenas leem os valores daqui. O handler de depsgraph marca como
+# sujas as collections e os view layers atualizados e um timer recalcula só o
+# que mudou. As collections são identificadas pelo ponteiro (as_pointer), que
+# não muda ao renomear; undo e abertura de arquivo descartam tudo, já que os
+# ponteiros deixam de valer.
+
+import bpy
+
+from .hierarchy import walk_layer_visibility
+from .render_estimator import PASS_CHANNELS, CRYPTO_CHANNEL_PASSES, is_pass_enabled
+
+# {ponteiro_da_collection: quantidade de objetos (all_objects)}
+_collection_objects = {}
+# {nome_da_cena: {nome_do_view_layer: {"objects", "passes", "included" (ponteiros)}}}
+_layer_stats = {}
+# {nome_da_cena: {ponteiro_da_collection: quantidade de view layers que a incluem}}
+_collection_layers = {}
+# {ponteiro_da_collection: [ponteiros dos pais]} (para propagar mudanças para os ancestrais)
+_parents = {}
+
+# "layers": {nome_da_cena: set(nomes dos view layers) ou None para todos}
+_dirty = {"all": True, "collections": set(), "layers": {}}
+
+
+def mark_all_dirty():
+    """Descartar todas as estatísticas (recalculadas no próximo refresh)."""
+    _dirty["all"] = True
+
+
+def mark_layers_dirty(scene_name, layer_names=None):
+    """Marcar view layers da cena como sujos (todos se ``layer_names`` for None).
+
+    Usado pelos operadores que alteram vários view layers de uma vez: o
+    depsgraph só informa a cena, não quais view layers mudaram.
+    """
+    if layer_names is None:
+        _dirty["layers"][scene_name] = None
+        return
+    dirty = _dirty["layers"].setdefault(scene_name, set())
+    if dirty is not None:
+        dirty.update(layer_names)
+
+
+def is_dirty(scene):
+    """Verificar se há estatísticas da cena pendentes de recálculo."""
+    return _dirty["all"] or bool(_dirty["collections"]) or scene.name in _dirty["layers"] \
+        or scene.name not in _layer_stats
+
+
+def invalidate_from_depsgraph(depsgraph):
+    """Marcar como sujos as collections e o view layer atualizados no depsgraph.
+
+    Retorna True se algo foi invalidado. Atualizações de objetos (transformações,
+    geometria) não mudam as contagens e são ignoradas. Atualizações que não dá
+    para atribuir a uma collection ou view layer descartam tudo.
+    """
+    invalidated = False
+    for update in depsgraph.updates:
+        id_data = getattr(update.id, "original", None)
+        if id_data is None:
+            mark_all_dirty()
+            return True
+        if isinstance(id_data, bpy.types.Collection):
+            _dirty["collections"].add(id_data.as_pointer())
+            invalidated = True
+        elif isinstance(id_data, bpy.types.Scene):
+            # Exclude, passes e AOVs chegam como atualização da cena, vinda do
+            # depsgraph do view layer editado: só ele é recalculado
+            viewlayer = depsgraph.view_layer
+            mark_layers_dirty(id_data.name, {viewlayer.name} if viewlayer is not None else None)
+            invalidated = True
+        elif isinstance(id_data, bpy.types.Object) and not (update.is_updated_transform or update.is_updated_geometry):
+            # Objeto movido entre collections ou instanciando outra: marcar as suas
+            _dirty["collections"].update(collection.as_pointer() for collection in id_data.users_collection)
+            invalidated = True
+    return invalidated
+
+
+def _count_layer_passes(viewlayer):
+    """Contar passes ativos, AOVs e light groups de um view layer."""
+    count = sum(1 for pass_name in PASS_CHANNELS if is_pass_enabled(viewlayer, pass_name))
+    count += sum(1 for pass_name in CRYPTO_CHANNEL_PASSES if is_pass_enabled(viewlayer, pass_name))
+    count += len(getattr(viewlayer, "aovs", ()))
+    count += len(getattr(viewlayer, "lightgroups", ()))
+    return count
+
+
+def _rebuild_parents(scene, collections):
+    _parents.clear()
+    for parent in [scene.collection] + list(collections):
+        for child in parent.children:
+            _parents.setdefault(child.as_pointer(), []).append(parent.as_pointer())
+
+
+def _with_ancestors(pointers):
+    """Expandir as collections com todos os ancestrais (all_objects dos pais também muda)."""
+    result = set(pointers)
+    stack = list(pointers)
+    while stack:
+        for parent in _parents.get(stack.pop(), ()):
+            if parent not in result:
+                result.add(parent)
+                stack.append(parent)
+    return result
+
+
+def _refresh_scene_layers(scene, collections, layer_names=None):
+    """Recalcular as estatísticas dos view layers informados (ou de todos)."""
+    scene_stats = _layer_stats.setdefault(scene.name, {})
+    existing = {viewlayer.name for viewlayer in scene.view_layers}
+    for name in [name for name in scene_stats if name not in existing]:
+        del scene_stats[name]
+
+    for viewlayer in scene.view_layers:
+        if layer_names is not None and viewlayer.name not in layer_names and viewlayer.name in scene_stats:
+            continue
+        included_names, _ = walk_layer_visibility(viewlayer)
+        objects = set()
+        included = set()
+        for name in included_names:
+            collection = collections.get(name)
+            if collection is not None:
+                included.add(collection.as_pointer())
+                objects.update(obj.name_full for obj in collection.objects)
+        scene_stats[viewlayer.name] = {
+            "objects": len(objects),
+            "passes": _count_layer_passes(viewlayer),
+            "included": frozenset(included),
+        }
+
+    layer_counts = {}
+    for stats in scene_stats.values():
+        for pointer in stats["included"]:
+            layer_counts[pointer] = layer_counts.get(pointer, 0) + 1
+    _collection_layers[scene.name] = layer_counts
+
+
+def refresh(scene, collections):
+    """Recalcular apenas as estatísticas sujas. Retorna True se algo mudou."""
+    if not is_dirty(scene):
+        return False
+
+    if _dirty["all"]:
+        _rebuild_parents(scene, collections)
+        _collection_objects.clear()
+        _layer_stats.clear()
+        _collection_layers.clear()
+        for collection in collections:
+            _collection_objects[collection.as_pointer()] = len(collection.all_objects)
+        _refresh_scene_layers(scene, collections)
+    else:
+        dirty_collections = set(_dirty["collections"])
+        if dirty_collections:
+            _rebuild_parents(scene, collections)
+            by_pointer = {collection.as_pointer(): collection for collection in collections}
+            for pointer in _with_ancestors(dirty_collections):
+                collection = by_pointer.get(pointer)
+                if collection is None:
+                    _collection_objects.pop(pointer, None)
+                else:
+                    _collection_objects[pointer] = len(collection.all_objects)
+
+        dirty_layers = _dirty["layers"].get(scene.name, set())
+        if dirty_layers is None or scene.name not in _layer_stats:
+            _refresh_scene_layers(scene, collections)
+        else:
+            # View layers marcados e os que incluem alguma collection alterada
+            # (view layers novos são sempre calculados, os removidos descartados)
+            affected = set(dirty_layers)
+            if dirty_collections:
+                affected.update(layer_name for layer_name, stats in _layer_stats[scene.name].items()
+                                if stats["included"] & dirty_collections)
+            _refresh_scene_layers(scene, collections, affected)
+
+    _dirty["all"] = False
+    _dirty["collections"].clear()
+    _dirty["layers"].pop(scene.name, None)
+    return True
+
+
+def get_collection_stats(scene, collection):
+    """Ler (sem calcular) objetos e view layers que incluem a collection; None se ausente."""
+    pointer = collection.as_pointer()
+    objects = _collection_objects.get(pointer)
+    if objects is None:
+        return None
+    return {"objects": objects, "layers": _collection_layers.get(scene.name, {}).get(pointer, 0)}
+
+
+def get_layer_stats(scene, viewlayer_name):
+    """Ler (sem calcular) objetos e passes de um view layer; None se ausente."""
+    return _layer_stats.get(scene.name, {}).get(viewlayer_name)
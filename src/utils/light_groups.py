@@ -0,0 +1,126 @@
+# ==========================
+# Light Groups do Cycles a partir de Collections lgt.*
+# ==========================
+
+import re
+
+# Caracteres aceitos pelo Cycles em nomes de light group
+LIGHTGROUP_INVALID_CHARS = re.compile(r"[^A-Za-z0-9_]")
+
+# Collections lgt. que não viram light group (ativas em todos os view layers)
+SHARED_LGT_COLLECTIONS = ("lgt.all", "lgt.")
+
+
+def get_lightgroup_name(collection_name):
+    """Converter o nome de uma collection lgt.* em um nome de light group válido."""
+    return LIGHTGROUP_INVALID_CHARS.sub("_", collection_name[len("lgt."):]) or "default"
+
+
+def rig_matches_layer(rig_name, layer_name):
+    """Verificar se o rig lgt.<prefixo> se aplica ao view layer.
+
+    Mesma regra da geração (``process_layer_collection``): sem prefixo vale para todos
+    os view layers; com prefixo, apenas para os view layers ``<prefixo>.*``.
+    """
+    parts = rig_name.split(".")
+    prefix = parts[1] if len(parts) > 1 else ""
+    return not prefix or layer_name.startswith(prefix + ".")
+
+
+def get_layer_rigs(rig_names, layer_name):
+    """Filtrar os rigs lgt.* que se aplicam ao view layer."""
+    return {rig_name for rig_name in rig_names if rig_matches_layer(rig_name, layer_name)}
+
+
+def is_emissive_object(obj):
+    """Verificar se o objeto é uma luz ou tem algum material com emissão."""
+    if obj.type == "LIGHT":
+        return True
+    for slot in getattr(obj, "material_slots", ()):
+        material = slot.material
+        if material is None or not material.use_nodes or material.node_tree is None:
+            continue
+        for node in material.node_tree.nodes:
+            if node.type == "EMISSION":
+                return True
+            strength = node.inputs.get("Emission Strength") if node.type == "BSDF_PRINCIPLED" else None
+            if strength is not None and (strength.is_linked or strength.default_value > 0.0):
+                return True
+    return False
+
+
+def collect_lightgroups(collections):
+    """Mapear cada light group aos objetos emissivos das suas collections lgt.*.
+
+    Retorna ``{nome_do_light_group: [objetos]}``. Objetos em mais de uma
+    collection lgt.* ficam no primeiro light group encontrado.
+    """
+    lightgroups = {}
+    assigned = set()
+    for collection in collections:
+        if not collection.name.startswith("lgt.") or collection.name in SHARED_LGT_COLLECTIONS:
+            continue
+        group_name = get_lightgroup_name(collection.name)
+        members = lightgroups.setdefault(group_name, [])
+        for obj in collection.all_objects:
+            if obj.name_full not in assigned and is_emissive_object(obj):
+                assigned.add(obj.name_full)
+                members.append(obj)
+    return lightgroups
+
+
+def assign_lightgroups(lightgroups):
+    """Atribuir o light group de cada objeto (apenas quando muda). Retorna o total alterado."""
+    changed = 0
+    for group_name, objects in lightgroups.items():
+        for obj in objects:
+            if hasattr(obj, "lightgroup") and obj.lightgroup != group_name:
+                obj.lightgroup = group_name
+                changed += 1
+    return changed
+
+
+def ensure_viewlayer_lightgroups(viewlayer, group_names, managed_names=()):
+    """Criar no view layer os light groups que faltam (cada um gera seu passe).
+
+    Light groups de ``managed_names`` (gerados a partir de rigs) que não estão
+    em ``group_names`` são removidos; os criados manualmente são mantidos.
+    Retorna ``(criados, removidos)``.
+    """
+    if not hasattr(viewlayer, "lightgroups"):
+        return 0, 0
+    group_names = set(group_names)
+    stale = [lightgroup for lightgroup in viewlayer.lightgroups
+             if lightgroup.name in managed_names and lightgroup.name not in group_names]
+    for lightgroup in stale:
+        viewlayer.lightgroups.remove(lightgroup)
+    existing = {lightgroup.name for lightgroup in viewlayer.lightgroups}
+    created = 0
+    for group_name in sorted(group_names):
+        if group_name not in existing:
+            viewlayer.lightgroups.add(name=group_name)
+            created += 1
+    return created, len(stale)
+
+
+def find_layer_collections(root, names):
+    """Encontrar as layer collections com os nomes informados em uma única passada."""
+    found = {}
+    stack = [root]
+    while stack:
+        layer_collection = stack.pop()
+        if layer_collection.name in names:
+            found.setdefault(layer_collection.name, []).append(layer_collection)
+        stack.extend(layer_collection.children)
+    return found
+
+
+def include_rig_collections(viewlayer, rig_names):
+    """Incluir as collections dos rigs lgt.* no view layer (apenas quando excluídas)."""
+    included = 0
+    for layer_collections in find_layer_collections(viewlayer.layer_collection, rig_names).values():
+        for layer_collection in layer_collections:
+            if layer_collection.exclude:
+                layer_collection.exclude = False
+                included += 1
+    return included
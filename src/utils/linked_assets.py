@@ -0,0 +1,61 @@
+# ==========================
+# Collections Linkadas e Library Overrides
+# ==========================
+
+# Regras de nomenclatura que exigem percorrer uma collection individualmente
+NAMING_SUFFIXES = (".vl", ".hdt", ".all", ".ind", ".GP", ".GP.vl")
+NAMING_PREFIXES = ("lgt.",)
+
+
+def is_linked_or_override(collection):
+    """Verificar se a collection vem de uma biblioteca (linkada ou com override)."""
+    return collection.library is not None or getattr(collection, "override_library", None) is not None
+
+
+def matches_naming_rule(name, selected_names=()):
+    """Verificar se o nome segue alguma convenção do addon ou está selecionado."""
+    return name in selected_names or name.endswith(NAMING_SUFFIXES) or name.startswith(NAMING_PREFIXES)
+
+
+def build_opaque_asset_roots(collections, selected_names=()):
+    """Encontrar as raízes de assets linkados tratadas como uma unidade.
+
+    Uma raiz de asset é uma collection linkada/override cujo pai não é
+    linkado/override. Ela é opaca quando nenhuma collection da sua subárvore
+    segue uma regra de nomenclatura. Retorna ``{raiz: tupla_de_descendentes}``
+    em uma passada linear pela hierarquia.
+    """
+    has_asset_parent = set()
+    for collection in collections:
+        if not is_linked_or_override(collection):
+            continue
+        for child in collection.children:
+            has_asset_parent.add(child.name)
+
+    opaque_roots = {}
+    for collection in collections:
+        if not is_linked_or_override(collection) or collection.name in has_asset_parent:
+            continue
+
+        members = []
+        opaque = True
+        stack = list(collection.children)
+        while stack:
+            child = stack.pop()
+            if matches_naming_rule(child.name, selected_names):
+                opaque = False
+                break
+            members.append(child.name)
+            stack.extend(child.children)
+
+        if opaque:
+            opaque_roots[collection.name] = tuple(members)
+    return opaque_roots
+
+
+def get_hidden_asset_members(opaque_roots):
+    """Retornar o conjunto de collections dentro de raízes opacas (não listadas na UI)."""
+    hidden = set()
+    for members in opaque_roots.values():
+        hidden.update(members)
+    return hidden
@@ -0,0 +1,90 @@
+# ==========================
+# Verificação de Convenções da Cena (pré-voo)
+# ==========================
+
+from .layer_kinds import is_gp_collection
+from .scene_snapshot import snapshot_collection_tree, iter_all_objects
+
+# Severidades dos problemas encontrados
+SEVERITY_ERROR = "ERROR"
+SEVERITY_WARNING = "WARNING"
+
+# Tipos de objeto de Grease Pencil (legado e Grease Pencil v3)
+GP_OBJECT_TYPES = {"GPENCIL", "GREASEPENCIL"}
+
+
+def _issue(code, severity, collection_name, message):
+    return {"code": code, "severity": severity, "collection": collection_name, "message": message}
+
+
+def lint_scene(scene, collections, layer_names):
+    """Verificar as convenções de nomenclatura da cena (snapshot + ``lint_tree``)."""
+    return lint_tree(snapshot_collection_tree(scene, collections), layer_names)
+
+
+def lint_tree(tree, layer_names):
+    """Verificar as convenções de nomenclatura em uma passada linear pela hierarquia.
+
+    ``tree`` é o snapshot de ``scene_snapshot.snapshot_collection_tree`` (não
+    acessa bpy, pode rodar em uma thread de trabalho). ``layer_names`` são os
+    nomes dos view layers gerados (collections selecionadas e view layers
+    existentes). Retorna uma lista de problemas ordenada por severidade, cada
+    um com ``code``, ``severity``, ``collection`` e ``message``.
+    """
+    layer_names = set(layer_names)
+    parents = {}
+    lgt_prefixes = {}
+    gp_collections = []
+
+    # Passada única: mapa de pais, rigs lgt.<prefixo> e collections GP
+    for name, child_names in tree["children"].items():
+        for child_name in child_names:
+            parents.setdefault(child_name, []).append(name)
+
+        if name == tree["root"]:
+            continue
+        if name.startswith("lgt."):
+            prefix = name.split(".")[1]
+            # lgt.all e lgt. são ativadas em todos os view layers
+            if prefix and prefix != "all":
+                lgt_prefixes.setdefault(prefix, []).append(name)
+        if is_gp_collection(name) and name in layer_names:
+            gp_collections.append(name)
+
+    issues = []
+
+    # Collections linkadas em mais de um pai (get_parent_collection escolhe um arbitrariamente)
+    for name, parent_names in parents.items():
+        if len(parent_names) > 1:
+            severity = SEVERITY_ERROR if name.endswith(".hdt") else SEVERITY_WARNING
+            issues.append(_issue("MULTI_PARENT", severity, name,
+                                 f"'{name}' está em {len(parent_names)} collections: {', '.join(sorted(parent_names))}"))
+
+        # Collection .hdt cujo pai não gera um view layer
+        if name.endswith(".hdt") and not any(parent_name in layer_names for parent_name in parent_names):
+            issues.append(_issue("HDT_ORPHAN", SEVERITY_ERROR, name,
+                                 f"'{name}' está em '{parent_names[0]}', que não gera um ViewLayer"))
+
+    # Rigs lgt.<prefixo> que não correspondem a nenhum view layer
+    for prefix, rig_names in lgt_prefixes.items():
+        if not any(layer_name.startswith(prefix + ".") for layer_name in layer_names):
+            for rig_name in rig_names:
+                # Rigs que geram seu próprio view layer lgt. não precisam de correspondência
+                if rig_name in layer_names:
+                    continue
+                issues.append(_issue("LGT_UNMATCHED", SEVERITY_WARNING, rig_name,
+                                     f"'{rig_name}' não corresponde a nenhum ViewLayer '{prefix}.*'"))
+
+    # ViewLayers GP sem objetos de Grease Pencil
+    for name in gp_collections:
+        if not any(obj_type in GP_OBJECT_TYPES for _, obj_type in iter_all_objects(tree, name)):
+            issues.append(_issue("GP_EMPTY", SEVERITY_ERROR, name,
+                                 f"'{name}' gera um ViewLayer GP mas não contém objetos de Grease Pencil"))
+
+    issues.sort(key=lambda issue: (issue["severity"] != SEVERITY_ERROR, issue["code"], issue["collection"]))
+    return issues
+
+
+def count_errors(issues):
+    """Contar os problemas com severidade de erro."""
+    return sum(1 for issue in issues if issue["severity"] == SEVERITY_ERROR)
@@ -0,0 +1,267 @@
+# ==========================
+# Nós Render Layers → File Output (EXR multilayer)
+# ==========================
+
+from . import passes_data
+from .compositor_analysis import get_compositor_tree, socket_to_pass, MANAGED_NODE_PROP, MANAGED_NODE_PREFIX
+
+# Prefixos dos nós gerenciados pelo addon. Nomes de nós têm no máximo 63
+# caracteres, então a identidade dos nós fica nas propriedades customizadas
+# (view layer, codec e profundidade), não no nome.
+RENDER_LAYERS_NODE_PREFIX = MANAGED_NODE_PREFIX + "RL_"
+FILE_OUTPUT_NODE_PREFIX = MANAGED_NODE_PREFIX + "OUT_"
+CODEC_PROP = "vlg_codec"
+DEPTH_PROP = "vlg_depth"
+
+# Categorias de saída usadas nas regras de codec
+OUTPUT_CATEGORY_ITEMS = [
+    ("Beauty", "Beauty", "Passe Combined (Image/Alpha)"),
+    ("Light", "Light", "Passes de iluminação e light groups"),
+    ("Data", "Data", "Passes de dados (Depth, Normal, Position, ...)"),
+    ("Crypto Matte", "Crypto Matte", "Passes de Cryptomatte"),
+    ("AOV", "AOV", "AOVs dos materiais"),
+]
+
+EXR_CODEC_ITEMS = [
+    ("DWAA", "DWAA", "Com perdas, rápido e compacto (beauty/light)"),
+    ("DWAB", "DWAB", "Com perdas, blocos maiores"),
+    ("ZIP", "ZIP", "Sem perdas"),
+    ("ZIPS", "ZIPS", "Sem perdas, por scanline"),
+    ("PIZ", "PIZ", "Sem perdas, bom para imagens com ruído"),
+    ("PXR24", "Pxr24", "Com perdas para float 32"),
+    ("NONE", "Nenhum", "Sem compressão"),
+]
+
+EXR_DEPTH_ITEMS = [
+    ("16", "Half", "Float 16 bits"),
+    ("32", "Full", "Float 32 bits"),
+]
+
+# Regras padrão: DWAA half para beauty/light, ZIP sem perdas para dados e Cryptomatte
+DEFAULT_CODEC_RULES = {
+    "Beauty": ("DWAA", "16"),
+    "Light": ("DWAA", "16"),
+    "Data": ("ZIP", "32"),
+    "Crypto Matte": ("ZIP", "32"),
+    "AOV": ("ZIP", "16"),
+}
+
+# Espaçamento dos nós na árvore do compositor
+NODE_SPACING_X = 400
+NODE_SPACING_Y = 600
+
+
+def initialize_default_codec_rules(collection):
+    """Preencher uma CollectionProperty de OutputRuleItem com as regras padrão."""
+    for category, (codec, depth) in DEFAULT_CODEC_RULES.items():
+        item = collection.add()
+        item.name = category
+        item.category = category
+        item.codec = codec
+        item.color_depth = depth
+
+
+def get_codec_rules(rule_items):
+    """Converter os itens de regra das preferências em {categoria: (codec, profundidade)}."""
+    rules = dict(DEFAULT_CODEC_RULES)
+    for item in rule_items:
+        rules[item.category] = (item.codec, item.color_depth)
+    return rules
+
+
+def get_output_category(socket_name, lightgroup_names=()):
+    """Retornar a categoria de regra de codec de uma saída do Render Layers."""
+    if socket_name in ("Image", "Alpha"):
+        return "Beauty"
+    pass_name = socket_to_pass(socket_name)
+    if pass_name is None:
+        return "Light" if socket_name in lightgroup_names else "AOV"
+    category = passes_data.get_pass_category(pass_name)
+    return category if category in DEFAULT_CODEC_RULES else "Data"
+
+
+def ensure_compositor_tree(scene):
+    """Retornar a node tree do compositor, ativando os nós da cena se necessário."""
+    tree = get_compositor_tree(scene)
+    if tree is None and hasattr(scene, "node_tree"):
+        scene.use_nodes = True
+        tree = scene.node_tree
+    return tree
+
+
+def get_output_path(base_path, layer_name, codec, depth):
+    """Montar o caminho de saída de um grupo de passes de um view layer."""
+    return f"{base_path.rstrip('/')}/{layer_name}/{layer_name}_{codec.lower()}{depth}_"
+
+
+def _group_outputs(render_layers_node, rules, lightgroup_names):
+    """Agrupar as saídas ativas do Render Layers por (codec, profundidade)."""
+    groups = {}
+    for output in render_layers_node.outputs:
+        if not output.enabled:
+            continue
+        category = get_output_category(output.name, lightgroup_names)
+        groups.setdefault(rules[category], []).append(output.name)
+    return groups
+
+
+def _sync_slots(node, slot_names):
+    """Recriar os slots do File Output apenas se a lista de nomes mudou."""
+    current = [slot.name for slot in node.layer_slots]
+    if current == slot_names:
+        return False
+    node.layer_slots.clear()
+    for name in slot_names:
+        node.layer_slots.new(name)
+    return True
+
+
+def get_node_key(node):
+    """Identidade de um nó gerenciado: (tipo, view layer, codec, profundidade).
+
+    Retorna None para nós que não foram marcados pela sincronização.
+    """
+    layer_name = node.get(MANAGED_NODE_PROP)
+    if layer_name is None:
+        return None
+    return node.type, layer_name, node.get(CODEC_PROP, ""), node.get(DEPTH_PROP, "")
+
+
+def tag_node(node, layer_name, codec="", depth=""):
+    """Marcar um nó como gerenciado pelo addon."""
+    node[MANAGED_NODE_PROP] = layer_name
+    node[CODEC_PROP] = codec
+    node[DEPTH_PROP] = depth
+
+
+def _find_or_create_node(tree, managed, untagged, key, node_type, name):
+    """Obter o nó gerenciado de uma chave, adotando um nó antigo pelo nome ou criando um novo.
+
+    Retorna ``(nó, criado)``.
+    """
+    node = managed.get(key)
+    if node is None:
+        # Nós de versões anteriores, identificados apenas pelo nome completo
+        node = untagged.pop(name, None)
+        if node is not None:
+            tag_node(node, *key[1:])
+            managed[key] = node
+    if node is not None:
+        return node, False
+    node = tree.nodes.new(node_type)
+    node.name = name  # Pode ser truncado ou receber sufixo: a identidade está nas propriedades
+    tag_node(node, *key[1:])
+    managed[key] = node
+    return node, True
+
+
+def sync_output_nodes(scene, layer_names, base_path, rules):
+    """Criar/atualizar um Render Layers e os File Output de cada view layer gerado.
+
+    A sincronização é idempotente: nós, slots e links existentes só são
+    alterados quando diferem do esperado. Nós gerenciados só são removidos
+    quando o view layer foi sincronizado e o grupo sumiu, ou quando o view
+    layer não existe mais; os de view layers fora de ``layer_names`` ficam
+    intactos. Retorna um dicionário com a contagem de nós criados, atualizados
+    e removidos.
+    """
+    tree = ensure_compositor_tree(scene)
+    stats = {"created": 0, "updated": 0, "removed": 0}
+    if tree is None:
+        return stats
+
+    managed = {}
+    untagged = {}
+    for node in tree.nodes:
+        key = get_node_key(node)
+        if key is not None:
+            managed[key] = node
+        elif node.name.startswith((RENDER_LAYERS_NODE_PREFIX, FILE_OUTPUT_NODE_PREFIX)):
+            untagged[node.name] = node
+    # Origem do link de cada entrada: (nó destino, socket) → (nó origem, socket)
+    incoming = {
+        (link.to_node.as_pointer(), link.to_socket.identifier): (link.from_node.as_pointer(), link.from_socket.identifier)
+        for link in tree.links
+    }
+    wanted_nodes = set()
+    synced_layers = set()
+
+    for row, layer_name in enumerate(layer_names):
+        viewlayer = scene.view_layers.get(layer_name)
+        if viewlayer is None:
+            continue
+        synced_layers.add(layer_name)
+
+        # Nó Render Layers do view layer
+        rl_key = ("R_LAYERS", layer_name, "", "")
+        rl_node, created = _find_or_create_node(tree, managed, untagged, rl_key, "CompositorNodeRLayers",
+                                                RENDER_LAYERS_NODE_PREFIX + layer_name)
+        wanted_nodes.add(rl_key)
+        if created:
+            rl_node.label = layer_name
+            rl_node.location = (0, -row * NODE_SPACING_Y)
+            stats["created"] += 1
+        if rl_node.scene != scene:
+            rl_node.scene = scene
+        if rl_node.layer != layer_name:
+            rl_node.layer = layer_name
+            stats["updated"] += 1
+
+        lightgroup_names = {lightgroup.name for lightgroup in getattr(viewlayer, "lightgroups", ())}
+        groups = _group_outputs(rl_node, rules, lightgroup_names)
+
+        for column, ((codec, depth), socket_names) in enumerate(sorted(groups.items())):
+            out_key = ("OUTPUT_FILE", layer_name, codec, depth)
+            out_node, created = _find_or_create_node(tree, managed, untagged, out_key, "CompositorNodeOutputFile",
+                                                     f"{FILE_OUTPUT_NODE_PREFIX}{layer_name}_{codec}_{depth}")
+            wanted_nodes.add(out_key)
+            if created:
+                out_node.label = f"{layer_name} ({codec} {depth})"
+                out_node.location = (NODE_SPACING_X * (column + 1), -row * NODE_SPACING_Y)
+                out_node.format.file_format = "OPEN_EXR_MULTILAYER"
+                stats["created"] += 1
+
+            changed = False
+            if out_node.format.exr_codec != codec:
+                out_node.format.exr_codec = codec
+                changed = True
+            if out_node.format.color_depth != depth:
+                out_node.format.color_depth = depth
+                changed = True
+            output_path = get_output_path(base_path, layer_name, codec, depth)
+            if out_node.base_path != output_path:
+                out_node.base_path = output_path
+                changed = True
+            # Slots recriados perdem os links: as chaves anteriores não valem mais
+            slots_rebuilt = _sync_slots(out_node, socket_names)
+            changed |= slots_rebuilt
+
+            # Ligar apenas os links que faltam ou que vêm de outra saída
+            for index, socket_name in enumerate(socket_names):
+                from_socket = rl_node.outputs[socket_name]
+                to_socket = out_node.inputs[index]
+                key = (out_node.as_pointer(), to_socket.identifier)
+                source = (rl_node.as_pointer(), from_socket.identifier)
+                if slots_rebuilt or incoming.get(key) != source:
+                    tree.links.new(from_socket, to_socket)
+                    incoming[key] = source
+                    changed = True
+
+            stats["updated"] += int(changed)
+
+    # Remover nós gerenciados de view layers que não existem mais ou grupos que sumiram
+    for key, node in list(managed.items()):
+        layer_name = key[1]
+        if key in wanted_nodes or (layer_name not in synced_layers and layer_name in scene.view_layers):
+            continue
+        tree.nodes.remove(node)
+        stats["removed"] += 1
+    # Nós antigos sem marca (só o nome) que não foram adotados, apenas dos view layers sincronizados
+    rl_names = {RENDER_LAYERS_NODE_PREFIX + layer_name for layer_name in synced_layers}
+    out_prefixes = tuple(f"{FILE_OUTPUT_NODE_PREFIX}{layer_name}_" for layer_name in synced_layers)
+    for name, node in untagged.items():
+        if name in rl_names or (out_prefixes and name.startswith(out_prefixes)):
+            tree.nodes.remove(node)
+            stats["removed"] += 1
+
+    return stats
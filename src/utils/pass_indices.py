@@ -0,0 +1,124 @@
+# ==========================
+# Pass Index de Objetos e Materiais (ID mattes)
+# ==========================
+#
+# Índices determinísticos para os passes Object Index e Material Index: um
+# canal float por view layer no lugar de vários níveis de Cryptomatte.
+# As tabelas nome → índice ficam gravadas na cena: chaves novas recebem o
+# próximo índice livre e as existentes nunca são renumeradas, então os mattes
+# do compositor continuam válidos quando a seleção muda.
+
+import json
+import os
+import re
+
+from .bulk_rna import write_columns_diffed
+
+# Modos de atribuição
+PASS_INDEX_MODE_ITEMS = [
+    ("COLLECTION", "Por Collection", "Um índice de objeto por collection gerada"),
+    ("MATERIAL", "Por Família de Material", "Um índice de material por família (nome sem sufixo .001)"),
+    ("BOTH", "Ambos", "Índices de objeto por collection e de material por família"),
+]
+
+# Sufixo numérico de duplicatas do Blender (ex.: "Skin.001")
+DUPLICATE_SUFFIX = re.compile(r"\.\d{3,}$")
+
+MANIFEST_SUFFIX = "_pass_index.json"
+
+# Propriedade customizada da cena com as tabelas {"objects": {...}, "materials": {...}}
+TABLE_PROP = "vlg_pass_index_tables"
+
+
+def get_material_family(material_name):
+    """Família de um material: o nome sem o sufixo de duplicata."""
+    return DUPLICATE_SUFFIX.sub("", material_name)
+
+
+def extend_index_table(table, keys):
+    """Acrescentar as chaves novas à tabela com os próximos índices livres (1..N). 0 = sem índice.
+
+    As chaves existentes mantêm o índice, mesmo as que não estão em ``keys``
+    (uma collection desmarcada e marcada de novo volta com o mesmo índice).
+    """
+    next_index = max(table.values(), default=0) + 1
+    for key in sorted(set(keys) - set(table)):
+        table[key] = next_index
+        next_index += 1
+    return table
+
+
+def load_tables(scene):
+    """Ler as tabelas nome → índice gravadas na cena."""
+    stored = scene.get(TABLE_PROP)
+    stored = stored.to_dict() if stored is not None else {}
+    return {"objects": dict(stored.get("objects", {})), "materials": dict(stored.get("materials", {}))}
+
+
+def store_tables(scene, tables):
+    """Gravar as tabelas nome → índice na cena."""
+    scene[TABLE_PROP] = tables
+
+
+def plan_object_indices(objects, collections, collection_names, table):
+    """Planejar o pass_index de cada objeto pela primeira collection gerada que o contém.
+
+    ``table`` ({nome_da_collection: índice}) é estendida com as collections
+    novas. Objetos fora das collections geradas voltam a 0; objetos linkados
+    mantêm o valor atual. Retorna ``(valores, índices_usados)``.
+    """
+    names = [name for name in collection_names if collections.get(name) is not None]
+    extend_index_table(table, names)
+    used = {name: table[name] for name in names}
+    assigned = {}
+    for name in sorted(used, key=used.get):
+        for obj in collections[name].all_objects:
+            assigned.setdefault(obj.name_full, used[name])
+
+    values = [obj.pass_index if obj.library is not None else assigned.get(obj.name_full, 0) for obj in objects]
+    return values, used
+
+
+def plan_material_indices(materials, table):
+    """Planejar o pass_index de cada material pela sua família.
+
+    ``table`` ({família: índice}) é estendida com as famílias novas. Retorna
+    ``(valores, índices_usados)`` como ``plan_object_indices``.
+    """
+    families = {get_material_family(material.name) for material in materials if material.library is None}
+    extend_index_table(table, families)
+    used = {family: table[family] for family in families}
+    values = [material.pass_index if material.library is not None else table[get_material_family(material.name)]
+              for material in materials]
+    return values, used
+
+
+def assign_pass_indices(data, collection_names, mode, tables):
+    """Atribuir os pass indices (leitura em lote, setattr só no que mudou) e retornar o manifesto.
+
+    ``tables`` (de ``load_tables``) é atualizada no lugar. O manifesto é
+    ``{"objects": {índice: collection}, "materials": {índice: família}}``.
+    """
+    manifest = {"objects": {}, "materials": {}}
+    if mode in {"COLLECTION", "BOTH"}:
+        values, used = plan_object_indices(data.objects, data.collections, collection_names, tables["objects"])
+        if values:
+            write_columns_diffed(data.objects, {"pass_index": values})
+        manifest["objects"] = {str(index): name for name, index in used.items()}
+    if mode in {"MATERIAL", "BOTH"}:
+        values, used = plan_material_indices(data.materials, tables["materials"])
+        if values:
+            write_columns_diffed(data.materials, {"pass_index": values})
+        manifest["materials"] = {str(index): name for name, index in used.items()}
+    return manifest
+
+
+def get_manifest_path(blend_path):
+    """Caminho do manifesto índice → nome ao lado do .blend."""
+    return os.path.splitext(blend_path)[0] + MANIFEST_SUFFIX
+
+
+def write_manifest(path, manifest):
+    """Gravar o manifesto índice → nome em JSON."""
+    with open(path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
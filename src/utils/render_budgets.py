@@ -0,0 +1,68 @@
+# ==========================
+# Orçamentos de Renderização por Tipo de ViewLayer
+# ==========================
+
+from .layer_kinds import LAYER_KIND_REGULAR, LAYER_KIND_HOLDOUT, LAYER_KIND_LGT, LAYER_KIND_GP
+
+# Orçamentos padrão: fração das amostras da cena, denoise e dados de denoising.
+# Fração 1.0 mantém o view layer usando as amostras globais (samples = 0).
+DEFAULT_RENDER_BUDGETS = {
+    LAYER_KIND_REGULAR: {"sample_fraction": 1.0, "denoise": True, "denoising_data": True},
+    LAYER_KIND_HOLDOUT: {"sample_fraction": 0.25, "denoise": True, "denoising_data": False},
+    LAYER_KIND_LGT: {"sample_fraction": 0.5, "denoise": True, "denoising_data": False},
+    LAYER_KIND_GP: {"sample_fraction": 0.1, "denoise": False, "denoising_data": False},
+}
+
+# Mínimo de amostras de um view layer com orçamento reduzido
+MIN_LAYER_SAMPLES = 1
+
+
+def initialize_default_render_budgets(collection):
+    """Preencher uma CollectionProperty de RenderBudgetItem com os orçamentos padrão."""
+    for kind, budget in DEFAULT_RENDER_BUDGETS.items():
+        item = collection.add()
+        item.name = kind
+        item.kind = kind
+        item.sample_fraction = budget["sample_fraction"]
+        item.denoise = budget["denoise"]
+        item.denoising_data = budget["denoising_data"]
+
+
+def get_budget_map(budget_items):
+    """Converter os itens de orçamento das preferências em {tipo: orçamento}."""
+    budgets = dict(DEFAULT_RENDER_BUDGETS)
+    for item in budget_items:
+        budgets[item.kind] = {
+            "sample_fraction": item.sample_fraction,
+            "denoise": item.denoise,
+            "denoising_data": item.denoising_data,
+        }
+    return budgets
+
+
+def get_scene_samples(scene):
+    """Retornar as amostras globais de renderização da cena (Cycles ou Eevee)."""
+    if scene.render.engine == "CYCLES" and hasattr(scene, "cycles"):
+        return scene.cycles.samples
+    eevee = getattr(scene, "eevee", None)
+    return getattr(eevee, "taa_render_samples", 0) if eevee else 0
+
+
+def apply_render_budget(viewlayer, budget, scene_samples):
+    """Aplicar um orçamento de amostras e denoising a um view layer.
+
+    Retorna o número de amostras definido (0 = usa as amostras da cena).
+    """
+    fraction = budget["sample_fraction"]
+    samples = 0 if fraction >= 1.0 or not scene_samples else max(int(scene_samples * fraction), MIN_LAYER_SAMPLES)
+    if viewlayer.samples != samples:
+        viewlayer.samples = samples
+
+    cycles_settings = getattr(viewlayer, "cycles", None)
+    if cycles_settings is not None:
+        if hasattr(cycles_settings, "use_denoising") and cycles_settings.use_denoising != budget["denoise"]:
+            cycles_settings.use_denoising = budget["denoise"]
+        if hasattr(cycles_settings, "denoising_store_passes") and \
+                cycles_settings.denoising_store_passes != budget["denoising_data"]:
+            cycles_settings.denoising_store_passes = budget["denoising_data"]
+    return samples
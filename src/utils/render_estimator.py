@@ -0,0 +1,227 @@
+# ==========================
+# Estimativa de Saída e Memória de Renderização
+# ==========================
+
+import math
+
+# Número de canais gravados por passe (EXR multilayer)
+PASS_CHANNELS = {
+    "use_pass_combined": 4,
+    "use_pass_z": 1,
+    "use_pass_position": 3,
+    "use_pass_normal": 3,
+    "use_pass_vector": 4,
+    "use_pass_uv": 3,
+    "use_pass_mist": 1,
+    "use_pass_object_index": 1,
+    "use_pass_material_index": 1,
+    "use_pass_alpha": 1,
+    "use_pass_diffuse_direct": 3,
+    "use_pass_diffuse_indirect": 3,
+    "use_pass_diffuse_color": 3,
+    "use_pass_glossy_direct": 3,
+    "use_pass_glossy_indirect": 3,
+    "use_pass_glossy_color": 3,
+    "use_pass_transmission_direct": 3,
+    "use_pass_transmission_indirect": 3,
+    "use_pass_transmission_color": 3,
+    "use_pass_volume_direct": 3,
+    "use_pass_volume_indirect": 3,
+    "use_pass_emit": 3,
+    "use_pass_environment": 3,
+    "use_pass_shadow": 3,
+    "use_pass_ambient_occlusion": 3,
+    "use_pass_transparent": 4,
+    "use_pass_shadow_catcher": 3,
+    "use_denoising_data": 7,
+    "denoising_store_passes": 7,
+}
+
+# Passes de Cryptomatte (canais dependem de pass_cryptomatte_depth)
+CRYPTO_CHANNEL_PASSES = (
+    "use_pass_cryptomatte_object",
+    "use_pass_cryptomatte_material",
+    "use_pass_cryptomatte_asset",
+)
+
+# Canais por tipo de AOV
+AOV_CHANNELS = {"COLOR": 4, "VALUE": 1}
+
+# Canais por light group (Cycles)
+LIGHTGROUP_CHANNELS = 3
+
+# Razão de compressão aproximada por codec EXR (1.0 = sem compressão)
+EXR_CODEC_RATIO = {
+    "NONE": 1.0,
+    "RLE": 0.8,
+    "ZIPS": 0.6,
+    "ZIP": 0.55,
+    "PIZ": 0.5,
+    "PXR24": 0.45,
+    "B44": 0.5,
+    "B44A": 0.45,
+    "DWAA": 0.2,
+    "DWAB": 0.2,
+}
+
+# Razão de compressão aproximada para formatos de imagem comuns
+IMAGE_FORMAT_RATIO = {
+    "PNG": 0.5,
+    "JPEG": 0.1,
+    "JPEG2000": 0.15,
+    "TIFF": 0.7,
+    "TARGA": 0.8,
+    "TARGA_RAW": 1.0,
+    "BMP": 1.0,
+    "WEBP": 0.15,
+}
+
+# Canais gravados por modo de cor em formatos de camada única
+COLOR_MODE_CHANNELS = {"BW": 1, "RGB": 3, "RGBA": 4}
+
+# Bytes por canal no buffer de renderização (float32)
+RENDER_BUFFER_BYTES_PER_CHANNEL = 4
+
+
+def is_pass_enabled(viewlayer, pass_name):
+    """Verificar se um passe está ativo no view layer ou nas configurações do motor."""
+    for owner in (viewlayer, getattr(viewlayer, "cycles", None), getattr(viewlayer, "eevee", None)):
+        if owner is not None and getattr(owner, pass_name, False) is True:
+            return True
+    return False
+
+
+def cryptomatte_channels(levels):
+    """Canais gravados por tipo de Cryptomatte (2 níveis por camada RGBA)."""
+    return int(math.ceil(max(levels, 0) / 2.0)) * 4
+
+
+def count_viewlayer_channels(viewlayer):
+    """Contar os canais de um view layer somando passes, Cryptomatte, AOVs e light groups."""
+    channels = 0
+    for pass_name, pass_channels in PASS_CHANNELS.items():
+        if is_pass_enabled(viewlayer, pass_name):
+            channels += pass_channels
+
+    crypto_levels = getattr(viewlayer, "pass_cryptomatte_depth", 6)
+    for pass_name in CRYPTO_CHANNEL_PASSES:
+        if is_pass_enabled(viewlayer, pass_name):
+            channels += cryptomatte_channels(crypto_levels)
+
+    for aov in getattr(viewlayer, "aovs", ()):
+        channels += AOV_CHANNELS.get(aov.type, 4)
+
+    channels += len(getattr(viewlayer, "lightgroups", ())) * LIGHTGROUP_CHANNELS
+    return channels
+
+
+def get_render_pixels(scene):
+    """Retornar o número de pixels por frame considerando a porcentagem de resolução."""
+    render = scene.render
+    scale = render.resolution_percentage / 100.0
+    width = int(render.resolution_x * scale)
+    height = int(render.resolution_y * scale)
+    return width * height
+
+
+def get_frame_count(scene):
+    """Retornar o número de frames renderizados no intervalo da cena."""
+    step = max(scene.frame_step, 1)
+    if scene.frame_end < scene.frame_start:
+        return 0
+    return (scene.frame_end - scene.frame_start) // step + 1
+
+
+def get_file_bytes_per_pixel(image_settings, channels):
+    """Estimar os bytes gravados em disco por pixel para um formato de saída."""
+    file_format = image_settings.file_format
+    color_depth = getattr(image_settings, "color_depth", "8") or "8"
+
+    if file_format in ("OPEN_EXR_MULTILAYER", "OPEN_EXR"):
+        # EXR simples grava apenas o Combined
+        if file_format == "OPEN_EXR":
+            channels = COLOR_MODE_CHANNELS.get(image_settings.color_mode, 4)
+        bytes_per_channel = 2 if color_depth == "16" else 4
+        ratio = EXR_CODEC_RATIO.get(getattr(image_settings, "exr_codec", "ZIP"), 0.55)
+    else:
+        channels = COLOR_MODE_CHANNELS.get(image_settings.color_mode, 4)
+        bytes_per_channel = 2 if color_depth == "16" else 1
+        ratio = IMAGE_FORMAT_RATIO.get(file_format, 1.0)
+
+    return channels * bytes_per_channel * ratio
+
+
+def estimate_viewlayer(scene, viewlayer, pixels=None, frames=None):
+    """Estimar canais, bytes por frame, tamanho da sequência e memória de um view layer."""
+    if pixels is None:
+        pixels = get_render_pixels(scene)
+    if frames is None:
+        frames = get_frame_count(scene)
+
+    channels = count_viewlayer_channels(viewlayer)
+    bytes_per_frame = int(pixels * get_file_bytes_per_pixel(scene.render.image_settings, channels))
+
+    return {
+        "name": viewlayer.name,
+        "channels": channels,
+        "bytes_per_frame": bytes_per_frame,
+        "sequence_bytes": bytes_per_frame * frames,
+        "buffer_bytes": pixels * channels * RENDER_BUFFER_BYTES_PER_CHANNEL,
+    }
+
+
+def estimate_scene(scene):
+    """Estimar todos os view layers ativos da cena e retornar (estimativas, totais)."""
+    pixels = get_render_pixels(scene)
+    frames = get_frame_count(scene)
+
+    estimates = [
+        estimate_viewlayer(scene, viewlayer, pixels, frames)
+        for viewlayer in scene.view_layers if viewlayer.use
+    ]
+
+    totals = {
+        "name": "Total",
+        "channels": sum(est["channels"] for est in estimates),
+        "bytes_per_frame": sum(est["bytes_per_frame"] for est in estimates),
+        "sequence_bytes": sum(est["sequence_bytes"] for est in estimates),
+        # Os view layers são renderizados um após o outro, o pico é o maior buffer
+        "buffer_bytes": max((est["buffer_bytes"] for est in estimates), default=0),
+    }
+    return estimates, totals
+
+
+def check_budgets(estimates, totals, budgets):
+    """Comparar as estimativas com os limites configurados e retornar avisos.
+
+    ``budgets`` é um dicionário com as chaves ``channels``, ``frame_mb``,
+    ``sequence_gb`` e ``memory_mb``; valores 0 desativam o limite.
+    """
+    warnings = []
+    limits = (
+        ("channels", budgets.get("channels", 0), 1, "canais"),
+        ("bytes_per_frame", budgets.get("frame_mb", 0), 1024 ** 2, "por frame"),
+        ("buffer_bytes", budgets.get("memory_mb", 0), 1024 ** 2, "de memória"),
+    )
+
+    for est in estimates:
+        for key, limit, unit, label in limits:
+            if limit and est[key] > limit * unit:
+                value = est[key] if key == "channels" else format_bytes(est[key])
+                warnings.append(f"{est['name']}: {value} {label} excede o limite")
+
+    sequence_limit = budgets.get("sequence_gb", 0)
+    if sequence_limit and totals["sequence_bytes"] > sequence_limit * 1024 ** 3:
+        warnings.append(f"Sequência total de {format_bytes(totals['sequence_bytes'])} excede o limite de {sequence_limit} GB")
+
+    return warnings
+
+
+def format_bytes(num_bytes):
+    """Formatar um número de bytes para exibição na UI."""
+    value = float(num_bytes)
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024.0:
+            return f"{value:.1f} {unit}"
+        value /= 1024.0
+    return f"{value:.1f} TB"
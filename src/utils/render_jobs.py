@@ -0,0 +1,115 @@
+# ==========================
+# Divisão de Renderização em Jobs por ViewLayer
+# ==========================
+
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Expressão executada no Blender do job: ativa apenas os view layers do job
+ENABLE_LAYERS_EXPR = (
+    "import bpy\n"
+    "layers = set({layers!r})\n"
+    "scene = bpy.data.scenes[{scene!r}]\n"
+    "for view_layer in scene.view_layers:\n"
+    "    view_layer.use = view_layer.name in layers\n"
+    "scene.render.filepath = {output!r}\n"
+)
+
+
+# Código de saída do Blender se a expressão do job falhar (sem ela, todos os
+# view layers seriam renderizados e o processo terminaria com 0)
+PYTHON_EXIT_CODE = 1
+
+
+def format_output(output_pattern, layer_name):
+    """Substituir ``{layer}`` no padrão de saída (outras chaves ficam intactas)."""
+    return output_pattern.replace("{layer}", layer_name)
+
+
+def chunk_frames(frame_start, frame_end, chunk_size):
+    """Dividir o intervalo de frames em blocos (início, fim) inclusivos."""
+    if chunk_size <= 0:
+        return [(frame_start, frame_end)]
+    return [
+        (start, min(start + chunk_size - 1, frame_end))
+        for start in range(frame_start, frame_end + 1, chunk_size)
+    ]
+
+
+def group_layers(layer_names, layers_per_job):
+    """Agrupar os view layers em listas de até layers_per_job nomes."""
+    size = max(layers_per_job, 1)
+    return [layer_names[i:i + size] for i in range(0, len(layer_names), size)]
+
+
+def build_jobs(blender_path, blend_path, scene_name, layer_names, output_pattern,
+               frame_start, frame_end, layers_per_job=1, chunk_size=0):
+    """Montar um comando ``blender -b`` por grupo de view layers e bloco de frames.
+
+    ``output_pattern`` pode conter ``{layer}`` (nome do grupo de view layers).
+    Retorna uma lista de dicionários com nome, view layers, frames e comando.
+    """
+    jobs = []
+    for layers in group_layers(layer_names, layers_per_job):
+        group_name = layers[0] if len(layers) == 1 else f"{layers[0]}+{len(layers) - 1}"
+        output = format_output(output_pattern, group_name)
+        expr = ENABLE_LAYERS_EXPR.format(layers=list(layers), scene=scene_name, output=output)
+
+        for start, end in chunk_frames(frame_start, frame_end, chunk_size):
+            jobs.append({
+                "name": f"{group_name}_{start}-{end}",
+                "layers": list(layers),
+                "frame_start": start,
+                "frame_end": end,
+                "output": output,
+                # O --python-expr precisa vir antes de -s/-e/-a para valer na renderização
+                "command": [
+                    blender_path, "-b", blend_path,
+                    "-S", scene_name,
+                    "--python-exit-code", str(PYTHON_EXIT_CODE),
+                    "--python-expr", expr,
+                    "-s", str(start), "-e", str(end), "-a",
+                ],
+            })
+    return jobs
+
+
+def run_job(job, log_dir=None):
+    """Executar um job e retornar nome, código de saída e duração em segundos."""
+    start = time.perf_counter()
+    log_file = None
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+        log_file = open(os.path.join(log_dir, job["name"] + ".log"), "w", encoding="utf-8")
+    try:
+        result = subprocess.run(
+            job["command"],
+            stdout=log_file or subprocess.DEVNULL,
+            stderr=subprocess.STDOUT,
+        )
+        returncode = result.returncode
+    except OSError as e:
+        print(f"Erro ao executar job {job['name']}: {str(e)}")
+        returncode = -1
+    finally:
+        if log_file:
+            log_file.close()
+    return {"name": job["name"], "returncode": returncode, "seconds": round(time.perf_counter() - start, 3)}
+
+
+def run_jobs(jobs, max_workers, log_dir=None, on_done=None):
+    """Executar os jobs em paralelo com limite de concorrência.
+
+    ``on_done`` é chamado (na thread do worker) com o resultado de cada job.
+    Retorna a lista de resultados na ordem dos jobs.
+    """
+    def _run(job):
+        result = run_job(job, log_dir)
+        if on_done:
+            on_done(result)
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        return list(executor.map(_run, jobs))
@@ -0,0 +1,191 @@
+# ==========================
+# Telemetria de Renderização por ViewLayer
+# ==========================
+
+import json
+import os
+import re
+import tempfile
+import time
+
+import bpy
+from bpy.app.handlers import persistent
+
+# Sufixo do arquivo de log gravado ao lado do .blend
+TELEMETRY_LOG_SUFFIX = "_render_telemetry.jsonl"
+
+# Memória de pico no texto de estatísticas ("Peak 123.45M" ou "Peak: 1.2G")
+PEAK_MEMORY_PATTERN = re.compile(r"Peak:?\s*([\d.]+)\s*([KMG])", re.IGNORECASE)
+MEMORY_UNIT_TO_MB = {"K": 1.0 / 1024.0, "M": 1.0, "G": 1024.0}
+
+# Estado da renderização em andamento
+_state = {
+    "scene": "",
+    "layers": set(),
+    "log_path": "",
+    "frame": 0,
+    "frame_start": 0.0,
+    "layer": None,
+    "layer_start": 0.0,
+    "layer_peak": 0.0,
+    "records": [],
+}
+
+
+def get_log_path():
+    """Retornar o caminho do log JSON-lines ao lado do .blend (ou no diretório temporário)."""
+    if bpy.data.filepath:
+        base, _ = os.path.splitext(bpy.data.filepath)
+        return base + TELEMETRY_LOG_SUFFIX
+    return os.path.join(tempfile.gettempdir(), "untitled" + TELEMETRY_LOG_SUFFIX)
+
+
+def parse_peak_memory(stats):
+    """Extrair a memória de pico em MB do texto de estatísticas do Blender."""
+    peaks = [float(value) * MEMORY_UNIT_TO_MB[unit.upper()] for value, unit in PEAK_MEMORY_PATTERN.findall(stats)]
+    return max(peaks, default=0.0)
+
+
+def parse_viewlayer(stats, layer_names):
+    """Encontrar o nome do view layer em renderização no texto de estatísticas."""
+    for segment in stats.split("|"):
+        for part in segment.split(","):
+            name = part.strip()
+            if name in layer_names:
+                return name
+    return None
+
+
+def _close_layer(now):
+    """Encerrar a medição do view layer atual e guardar o registro."""
+    if _state["layer"] is None:
+        return
+    _state["records"].append({
+        "type": "layer",
+        "scene": _state["scene"],
+        "frame": _state["frame"],
+        "view_layer": _state["layer"],
+        "seconds": round(now - _state["layer_start"], 3),
+        "peak_mem_mb": round(_state["layer_peak"], 2),
+        "timestamp": time.time(),
+    })
+    _state["layer"] = None
+    _state["layer_peak"] = 0.0
+
+
+def _flush_records():
+    """Anexar os registros pendentes ao arquivo de log."""
+    if not _state["records"]:
+        return
+    try:
+        with open(_state["log_path"], "a", encoding="utf-8") as log_file:
+            for record in _state["records"]:
+                log_file.write(json.dumps(record) + "\n")
+    except OSError as e:
+        print(f"Erro ao gravar telemetria de renderização: {str(e)}")
+    _state["records"].clear()
+
+
+@persistent
+def on_render_init(scene, *args):
+    """Iniciar a sessão de telemetria no início da renderização."""
+    _state["scene"] = scene.name
+    _state["layers"] = {viewlayer.name for viewlayer in scene.view_layers}
+    _state["log_path"] = get_log_path()
+    _state["layer"] = None
+    _state["records"].clear()
+
+
+@persistent
+def on_render_pre(scene, *args):
+    """Marcar o início de um frame."""
+    now = time.perf_counter()
+    _state["frame"] = scene.frame_current
+    _state["frame_start"] = now
+    _state["layer"] = None
+
+
+@persistent
+def on_render_stats(stats, *args):
+    """Acompanhar o view layer em renderização e a memória de pico reportada."""
+    if not isinstance(stats, str):
+        return
+    now = time.perf_counter()
+    layer = parse_viewlayer(stats, _state["layers"])
+    if layer and layer != _state["layer"]:
+        _close_layer(now)
+        _state["layer"] = layer
+        _state["layer_start"] = now
+    _state["layer_peak"] = max(_state["layer_peak"], parse_peak_memory(stats))
+
+
+@persistent
+def on_render_post(scene, *args):
+    """Encerrar o frame e registrar o tempo total."""
+    now = time.perf_counter()
+    _close_layer(now)
+    _state["records"].append({
+        "type": "frame",
+        "scene": _state["scene"],
+        "frame": _state["frame"],
+        "view_layer": None,
+        "seconds": round(now - _state["frame_start"], 3),
+        "timestamp": time.time(),
+    })
+    _flush_records()
+
+
+@persistent
+def on_render_complete(scene, *args):
+    """Gravar qualquer registro pendente ao final (ou cancelamento) da renderização."""
+    _close_layer(time.perf_counter())
+    _flush_records()
+
+
+# (lista de handlers, função) registrados pela telemetria
+_HANDLERS = (
+    ("render_init", on_render_init),
+    ("render_pre", on_render_pre),
+    ("render_stats", on_render_stats),
+    ("render_post", on_render_post),
+    ("render_complete", on_render_complete),
+    ("render_cancel", on_render_complete),
+)
+
+
+def enable_telemetry():
+    """Registrar os handlers de telemetria (sem duplicar)."""
+    for handler_name, func in _HANDLERS:
+        handlers = getattr(bpy.app.handlers, handler_name)
+        if func not in handlers:
+            handlers.append(func)
+
+
+def disable_telemetry():
+    """Remover os handlers de telemetria."""
+    for handler_name, func in _HANDLERS:
+        handlers = getattr(bpy.app.handlers, handler_name)
+        if func in handlers:
+            handlers.remove(func)
+
+
+def summarize_log(log_path):
+    """Agregar o log por view layer: frames, tempo médio, tempo máximo e pico de memória."""
+    summary = {}
+    if not os.path.exists(log_path):
+        return summary
+
+    with open(log_path, encoding="utf-8") as log_file:
+        for line in log_file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("type") != "layer":
+                continue
+            entry = summary.setdefault(record["view_layer"], {"frames": 0, "total": 0.0, "max": 0.0, "peak": 0.0})
+            entry["frames"] += 1
+            entry["total"] += record["seconds"]
+            entry["max"] = max(entry["max"], record["seconds"])
+            entry["peak"] = max(entry["peak"], record.get("peak_mem_mb", 0.0))
+    return summary
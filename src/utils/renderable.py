@@ -0,0 +1,114 @@
+# ==========================
+# Conteúdo Renderizável por Collection
+# ==========================
+
+import bpy
+
+from .hierarchy import walk_layer_flags
+
+# Tipos de objeto que produzem pixels visíveis para a câmera
+RENDERABLE_TYPES = {
+    "MESH", "CURVE", "SURFACE", "META", "FONT", "VOLUME",
+    "GPENCIL", "GREASEPENCIL", "CURVES", "POINTCLOUD",
+}
+
+# Cache de objetos renderizáveis diretos por collection: {nome_completo: quantidade}
+# Mantido entre execuções e invalidado pelas atualizações do depsgraph.
+_renderable_counts = {}
+
+
+def clear_cache():
+    """Descartar o cache de contagens de objetos renderizáveis."""
+    _renderable_counts.clear()
+
+
+def invalidate_from_depsgraph(depsgraph):
+    """Descartar as contagens que as atualizações do depsgraph podem ter mudado.
+
+    Mover objetos ou editar a geometria não muda o que é renderizável; as
+    demais atualizações de objetos (hide_render, visibilidade para a câmera,
+    instâncias) e de collections descartam o cache inteiro, já que uma
+    collection instanciada afeta as collections dos empties que a usam.
+    """
+    if not _renderable_counts:
+        return
+    for update in depsgraph.updates:
+        id_data = update.id
+        if isinstance(id_data, bpy.types.Collection):
+            _renderable_counts.clear()
+            return
+        if isinstance(id_data, bpy.types.Object) and not (update.is_updated_transform or update.is_updated_geometry):
+            _renderable_counts.clear()
+            return
+
+
+def is_renderable_object(obj, _visiting=None):
+    """Verificar se o objeto é renderizável e visível para a câmera."""
+    if obj.hide_render or not getattr(obj, "visible_camera", True):
+        return False
+    if obj.type in RENDERABLE_TYPES:
+        return True
+
+    # Empties que instanciam collections com conteúdo renderizável
+    instance_collection = getattr(obj, "instance_collection", None)
+    if obj.instance_type == "COLLECTION" and instance_collection is not None:
+        visiting = _visiting if _visiting is not None else set()
+        if instance_collection.name_full in visiting:
+            return False
+        visiting.add(instance_collection.name_full)
+        return any(is_renderable_object(child, visiting) for child in instance_collection.all_objects)
+    return False
+
+
+def get_renderable_count(collection):
+    """Contar (com cache) os objetos renderizáveis diretos de uma collection."""
+    key = collection.name_full
+    if key not in _renderable_counts:
+        if collection.hide_render:
+            _renderable_counts[key] = 0
+        else:
+            _renderable_counts[key] = sum(1 for obj in collection.objects if is_renderable_object(obj))
+    return _renderable_counts[key]
+
+
+def get_render_hidden_collections(scene):
+    """Nomes das collections ocultas na renderização por elas mesmas ou por um pai."""
+    hidden = set()
+    stack = [(child, False) for child in scene.collection.children]
+    while stack:
+        collection, parent_hidden = stack.pop()
+        is_hidden = parent_hidden or collection.hide_render
+        if is_hidden:
+            hidden.add(collection.name)
+        stack.extend((child, is_hidden) for child in collection.children)
+    return hidden
+
+
+def find_empty_viewlayers(scene, collections):
+    """Encontrar os view layers ativos sem conteúdo renderizável visível para a câmera.
+
+    Collections em holdout (só recortam alpha) ou indirect only (só aparecem em
+    reflexos e sombras) não contam, inclusive quando herdam o flag de um pai.
+    A visibilidade vem da árvore atual do view layer. Retorna a lista de nomes.
+    """
+    # Objetos diretos da Scene Collection aparecem em todos os view layers
+    if any(is_renderable_object(obj) for obj in scene.collection.objects):
+        return []
+
+    hidden = get_render_hidden_collections(scene)
+    empty = []
+    for viewlayer in scene.view_layers:
+        if not viewlayer.use:
+            continue
+        included, holdout, indirect = walk_layer_flags(viewlayer)
+        has_content = False
+        for name in included:
+            if name in holdout or name in indirect or name in hidden:
+                continue
+            collection = collections.get(name)
+            if collection is not None and get_renderable_count(collection):
+                has_content = True
+                break
+        if not has_content:
+            empty.append(viewlayer.name)
+    return empty
@@ -0,0 +1,105 @@
+# ==========================
+# Snapshots da Cena em Estruturas Python Simples
+# ==========================
+#
+# A API do Blender só pode ser acessada na thread principal. Estas funções
+# copiam rapidamente os dados necessários para dicionários e listas comuns,
+# que as análises pesadas podem processar em uma thread de trabalho.
+
+from .aov_index import get_aov_type
+
+
+def snapshot_collection_tree(scene, collections):
+    """Copiar a árvore de collections e os objetos diretos de cada uma.
+
+    Retorna ``{"scene", "root", "children": {nome: [filhas]},
+    "objects": {nome: [(objeto, tipo)]}}``. A raiz é a Scene Collection.
+    """
+    children = {}
+    objects = {}
+    for collection in [scene.collection] + list(collections):
+        children[collection.name] = [child.name for child in collection.children]
+        objects[collection.name] = [(obj.name_full, obj.type) for obj in collection.objects]
+    return {"scene": scene.name, "root": scene.collection.name, "children": children, "objects": objects}
+
+
+def iter_all_objects(tree, collection_name):
+    """Percorrer os objetos de uma collection e das filhas no snapshot (como all_objects)."""
+    seen_collections = set()
+    seen_objects = set()
+    stack = [collection_name]
+    while stack:
+        name = stack.pop()
+        if name in seen_collections:
+            continue
+        seen_collections.add(name)
+        for obj_name, obj_type in tree["objects"].get(name, ()):
+            if obj_name not in seen_objects:
+                seen_objects.add(obj_name)
+                yield obj_name, obj_type
+        stack.extend(tree["children"].get(name, ()))
+
+
+def get_object_memberships(tree):
+    """Mapear cada objeto às collections que o contêm diretamente."""
+    memberships = {}
+    for collection_name, objects in tree["objects"].items():
+        for obj_name, _ in objects:
+            memberships.setdefault(obj_name, []).append(collection_name)
+    return memberships
+
+
+def _snapshot_node_tree(node_tree, trees):
+    """Copiar os nós Output AOV e as referências a node groups de uma node tree."""
+    key = node_tree.name_full
+    if key in trees:
+        return key
+    entry = {"aovs": [], "groups": []}
+    trees[key] = entry
+    for node in node_tree.nodes:
+        if node.type == "OUTPUT_AOV" and len(node.inputs) > 0:
+            entry["aovs"].append((node.name, get_aov_type(node)))
+        elif node.type == "GROUP" and node.node_tree is not None:
+            entry["groups"].append(_snapshot_node_tree(node.node_tree, trees))
+    return key
+
+
+def snapshot_material_graphs(materials, skip=None):
+    """Copiar os grafos de nós dos materiais (apenas AOVs e node groups).
+
+    ``skip(material)`` permite pular materiais já resolvidos (ex.: pelo índice
+    de bibliotecas). Retorna ``{"materials": [(material, árvore)], "trees": {...}}``.
+    """
+    trees = {}
+    material_trees = []
+    for material in materials:
+        if not material.use_nodes or material.node_tree is None:
+            continue
+        if skip is not None and skip(material):
+            continue
+        material_trees.append((material.name_full, _snapshot_node_tree(material.node_tree, trees)))
+    return {"materials": material_trees, "trees": trees}
+
+
+def resolve_tree_aovs(graphs, tree_key, cache=None):
+    """Resolver {nome: tipo} dos AOVs de uma árvore do snapshot, incluindo grupos aninhados."""
+    cache = {} if cache is None else cache
+    if tree_key in cache:
+        return cache[tree_key]
+    cache[tree_key] = {}  # Proteção contra ciclos
+    aovs = {}
+    entry = graphs["trees"][tree_key]
+    for name, aov_type in entry["aovs"]:
+        aovs.setdefault(name, aov_type)
+    for group_key in entry["groups"]:
+        for name, aov_type in resolve_tree_aovs(graphs, group_key, cache).items():
+            aovs.setdefault(name, aov_type)
+    cache[tree_key] = aovs
+    return aovs
+
+
+def resolve_material_aovs(graphs):
+    """Resolver {material: {nome: tipo}} para todos os materiais do snapshot."""
+    cache = {}
+    return {material_name: resolve_tree_aovs(graphs, tree_key, cache)
+            for material_name, tree_key in graphs["materials"]}
@@ -0,0 +1,167 @@
+# ==========================
+# Planejamento Vetorizado de Visibilidade (exclude/holdout/indirect only)
+# ==========================
+
+try:
+    import numpy as np
+except ImportError:  # numpy acompanha o Blender, mas o addon funciona sem ele
+    np = None
+
+from .layer_kinds import is_gp_collection
+from .indirect_only import INDIRECT_MODE_INCLUDE, INDIRECT_MODE_EXCLUDE, is_indirect_collection, get_indirect_mode
+
+# Estados dos planos de holdout e indirect only
+FLAG_KEEP = -1  # Não alterar (collection ativa sem .hdt/.ind)
+FLAG_OFF = 0
+FLAG_ON = 1
+
+
+def has_numpy():
+    """Verificar se o backend NumPy está disponível."""
+    return np is not None
+
+
+def flatten_layer_tree(root, opaque_roots=None):
+    """Achatar a árvore de layer collections em pré-ordem.
+
+    Retorna ``(refs, names, parents, depths)``: as layer collections, seus nomes,
+    o índice do pai (-1 para a raiz) e a profundidade de cada nó. A ordem é a
+    mesma da recursão de ``process_layer_collection`` e as subárvores de raízes
+    opacas de assets linkados não são incluídas.
+    """
+    refs, names, parents, depths = [], [], [], []
+    stack = [(root, -1, 0)]
+    while stack:
+        layer_collection, parent, depth = stack.pop()
+        index = len(refs)
+        refs.append(layer_collection)
+        names.append(layer_collection.name)
+        parents.append(parent)
+        depths.append(depth)
+        if opaque_roots and layer_collection.name in opaque_roots:
+            continue
+        # Empilhar em ordem reversa para visitar as filhas na ordem original
+        for child in reversed(layer_collection.children[:]):
+            stack.append((child, index, depth + 1))
+    return refs, names, parents, depths
+
+
+def get_occurrence_keys(names):
+    """Chaves estáveis dos nós achatados: (nome, ocorrência).
+
+    Uma collection linkada em mais de um pai aparece várias vezes na árvore;
+    a ocorrência (em pré-ordem) distingue as layer collections de mesmo nome.
+    """
+    seen = {}
+    keys = []
+    for name in names:
+        occurrence = seen.get(name, 0)
+        seen[name] = occurrence + 1
+        keys.append((name, occurrence))
+    return keys
+
+
+def build_plan_numpy(names, parents, depths, layer_names, holdout_parents, indirect_policies=None):
+    """Plano vetorizado com NumPy: (exclude[L, N], holdout[L, N], indirect[L, N]) como arrays."""
+    num_nodes = len(names)
+    num_layers = len(layer_names)
+    parents = np.asarray(parents, dtype=np.int64)
+    depths = np.asarray(depths, dtype=np.int64)
+
+    # Flags por collection
+    is_all = np.fromiter((name.endswith(".all") for name in names), dtype=bool, count=num_nodes)
+    is_lgt = np.fromiter((name.startswith("lgt.") for name in names), dtype=bool, count=num_nodes)
+    is_hdt = np.fromiter((name.endswith(".hdt") for name in names), dtype=bool, count=num_nodes)
+    is_ind = np.fromiter((is_indirect_collection(name) for name in names), dtype=bool, count=num_nodes)
+
+    # Prefixos lgt.<prefixo> (id -1 = sem prefixo, ativa em todos os view layers)
+    prefix_table = {}
+    prefix_ids = np.full(num_nodes, -1, dtype=np.int64)
+    for index in np.flatnonzero(is_lgt):
+        prefix = names[index].split(".")[1]
+        if prefix:
+            prefix_ids[index] = prefix_table.setdefault(prefix, len(prefix_table))
+
+    # Dono de cada .hdt (índice do view layer, -1 se não é gerado)
+    layer_index = {name: index for index, name in enumerate(layer_names)}
+    hdt_owner = np.full(num_nodes, -1, dtype=np.int64)
+    for index in np.flatnonzero(is_hdt):
+        hdt_owner[index] = layer_index.get(holdout_parents.get(names[index]), -1)
+
+    # Flags por view layer
+    is_gp = np.fromiter((is_gp_collection(name) for name in layer_names), dtype=bool, count=num_layers)
+    indirect_modes = [get_indirect_mode(name, indirect_policies) for name in layer_names]
+    ind_enabled = np.fromiter((mode != INDIRECT_MODE_EXCLUDE for mode in indirect_modes), dtype=bool, count=num_layers)
+    ind_visible = np.fromiter((mode == INDIRECT_MODE_INCLUDE for mode in indirect_modes), dtype=bool, count=num_layers)
+    prefix_match = np.zeros((num_layers, len(prefix_table) + 1), dtype=bool)
+    prefix_match[:, -1] = True  # Coluna extra para collections lgt. sem prefixo
+    for prefix, prefix_id in prefix_table.items():
+        prefix_match[:, prefix_id] = [name.startswith(prefix + ".") for name in layer_names]
+
+    # Collection com o mesmo nome do view layer
+    node_index = {}
+    for index, name in enumerate(names):
+        node_index.setdefault(name, []).append(index)
+    name_match = np.zeros((num_layers, num_nodes), dtype=bool)
+    for row, name in enumerate(layer_names):
+        name_match[row, node_index.get(name, [])] = True
+
+    # Ativação própria (sem herança), respeitando a ordem da cadeia de decisões
+    lgt_active = is_lgt[None, :] & ~is_gp[:, None] & prefix_match[:, prefix_ids]
+    hdt_active = (is_hdt & ~is_lgt)[None, :] & (hdt_owner[None, :] == np.arange(num_layers)[:, None])
+    ind_active = (is_ind & ~is_lgt)[None, :] & ind_enabled[:, None]
+    active = name_match | is_all[None, :] | lgt_active | hdt_active | ind_active
+
+    # Herança: propagar a ativação do pai nível a nível (ordem topológica)
+    for depth in range(1, int(depths.max(initial=0)) + 1):
+        level = np.flatnonzero(depths == depth)
+        active[:, level] |= active[:, parents[level]]
+
+    exclude_plan = ~active
+    holdout_plan = np.where(active, np.where(is_hdt, FLAG_ON, FLAG_KEEP), FLAG_OFF).astype(np.int8)
+    ind_state = np.where(ind_visible[:, None], FLAG_OFF, FLAG_ON)
+    indirect_plan = np.where(active, np.where(is_ind[None, :], ind_state, FLAG_KEEP), FLAG_OFF).astype(np.int8)
+    return exclude_plan, holdout_plan, indirect_plan
+
+
+def plans_match(plan_a, plan_b):
+    """Comparar dois planos (listas ou arrays) elemento a elemento."""
+    parts_a = [np.asarray(part).tolist() if np is not None else part for part in plan_a]
+    parts_b = [np.asarray(part).tolist() if np is not None else part for part in plan_b]
+    return parts_a == parts_b
+
+
+def apply_plan_row(refs, parents, exclude_row, holdout_row, visibility=None, opaque_roots=None, indirect_row=None):
+    """Aplicar uma linha do plano às layer collections de um view layer (apenas o que muda).
+
+    ``refs`` e ``parents`` vêm de ``flatten_layer_tree``. ``visibility`` recebe
+    apenas as collections efetivamente incluídas (nenhum ancestral excluído).
+    """
+    if indirect_row is None:
+        indirect_row = [FLAG_KEEP] * len(refs)
+    included = [False] * len(refs)
+    for index, (layer_collection, exclude, holdout, indirect) in enumerate(
+            zip(refs, exclude_row, holdout_row, indirect_row)):
+        exclude = bool(exclude)
+        if layer_collection.exclude != exclude:
+            layer_collection.exclude = exclude
+        if holdout == FLAG_ON and not layer_collection.holdout:
+            layer_collection.holdout = True
+        elif holdout == FLAG_OFF and layer_collection.holdout:
+            layer_collection.holdout = False
+        if indirect == FLAG_ON and not layer_collection.indirect_only:
+            layer_collection.indirect_only = True
+        elif indirect == FLAG_OFF and layer_collection.indirect_only:
+            layer_collection.indirect_only = False
+
+        parent = parents[index]
+        if parent < 0:
+            included[index] = True  # Raiz do view layer (Scene Collection)
+            continue
+        included[index] = included[parent] and not exclude
+        if visibility is not None and included[index]:
+            visibility["included"].add(layer_collection.name)
+            if layer_collection.holdout:
+                visibility["holdout"].add(layer_collection.name)
+            if opaque_roots and layer_collection.name in opaque_roots:
+                visibility["included"].update(opaque_roots[layer_collection.name])